@@ -0,0 +1,98 @@
+import logging
+from typing import List, Tuple
+
+from playwright.async_api import expect, Locator
+
+from actions.BasePageActions import BasePageActions
+from utils.readiness import READINESS
+from utils.selector_registry import SELECTORS, MODAL_WINDOW
+from utils.step_timing import instrument_actions
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBaseModalActions:
+    """Class contains common actions for modal cards on playwright async API, see BaseModalActions"""
+
+    def __init__(self, base_page, card_locator: Locator = None):
+        self.base_page = base_page
+
+        if card_locator is None:
+            # Constructor can't query the page, so modal window locator isn't probed
+            card_locator = SELECTORS.unprobed_locator(self.base_page, MODAL_WINDOW)
+
+        self.modal_window = card_locator
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every public action of the modal is timed
+        instrument_actions(cls)
+
+    async def click_close_modal(self) -> None:
+        await self.modal_window.get_by_test_id("ModalCloseButton").click()
+        await self.wait_modal_closed()
+
+    async def is_opened(self) -> bool:
+        """Method verifies whether modal card is opened or not"""
+        return await self.modal_window.count() > 0
+
+    async def wait_modal_opened(self) -> None:
+        """Method waits while modal card appears"""
+        await expect(self.modal_window, "Modal wasn't opened").to_be_visible()
+
+    async def wait_modal_closed(self) -> None:
+        """Method waits while modal card disappears"""
+        await expect(self.modal_window, "Modal wasn't closed").not_to_be_visible()
+
+
+class AsyncBasePageActions:
+    """Class contains common actions for all pages on playwright async API, see BasePageActions"""
+
+    FILL_FORMS_SCRIPT = BasePageActions.FILL_FORMS_SCRIPT
+
+    def __init__(self, page):
+        self.page = page
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every public action of the page is timed
+        instrument_actions(cls)
+
+    async def close_modal(self):
+        """Method provides closing current opened modal on the page if it is opened"""
+        logger.info("Close modal")
+        modal = AsyncBaseModalActions(self.page)
+        if await modal.is_opened():
+            await modal.click_close_modal()
+
+    async def wait_page_loaded(self, step_name: str = "page") -> None:
+        """
+        Method provides waiting while page become loaded: loader line disappears, search requests are finished and
+        results stop changing
+        :param step_name: name of the step page is loaded after, timeout is learned from previous runs of the step
+        """
+        await READINESS.async_wait_settled(self.page, step_name)
+
+    async def fill_forms(self, forms_locator: Locator, forms_fields: List[List[dict]]) -> List[Tuple[int, str]]:
+        """
+        Method provides filling all independent fields of several forms in a single round trip, see
+        BasePageActions.fill_forms
+        :param forms_locator: locator matching all forms to fill
+        :param forms_fields: fields to fill for every form matched by forms_locator
+        :return: list of (form index, field name) which were not found on the page and weren't filled
+        """
+        missing = await forms_locator.evaluate_all(self.FILL_FORMS_SCRIPT, forms_fields)
+        return list(dict.fromkeys((form_index, field_name) for form_index, field_name in missing))
+
+    @staticmethod
+    async def set_date_input(date_container: Locator, day: str, month: str, year: str) -> None:
+        """
+        Method provides setting date info input on the page
+        """
+        await date_container.get_by_test_id("day").fill(day)
+        await date_container.get_by_test_id("month").select_option(label=month)
+        await date_container.get_by_test_id("year").fill(year)
+
+
+instrument_actions(AsyncBaseModalActions)
+instrument_actions(AsyncBasePageActions)
@@ -0,0 +1,185 @@
+import logging
+import re
+from typing import Dict
+
+from playwright.async_api import Locator, expect
+
+from actions.AsyncBasePageActions import AsyncBasePageActions
+from actions.MainPageLayer import MainPageLayer
+from utils.selector_registry import (SELECTORS, SUGGESTION_ITEM_ADDRESS, DATE_INPUT, CALENDAR_MONTH_PICKER,
+                                     FLIGHT_MODIFICATIONS, BOOKING_COM_CONTAINER)
+from utils.step_retry import retryable
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMainPageActions(AsyncBasePageActions, MainPageLayer):
+    """Class contains actions that relates to main home page on playwright async API, see MainPageActions"""
+
+    async def set_address(self, field_locator: Locator, address: str) -> None:
+        """
+        Method provides adding address to the specific field in search flight widget
+        :param field_locator: locator object with target filed to set address for
+        :param address: string with address. Should be in the following format "city_name, country_name"
+        """
+        city_name, country_name = address.split(", ")
+        existing_items = field_locator.get_by_test_id("PlacePickerInputPlace")
+
+        # Check whether existing address is already selected in the field and remove it
+        for item in await existing_items.all():
+            if await item.is_visible():
+                # remove item
+                await item.get_by_test_id("PlacePickerInputPlace-close").click()
+                await expect(item, "Address wasn't removed").not_to_be_visible(timeout=10000)
+
+        await field_locator.get_by_test_id("SearchField-input").fill(city_name)
+        suggestion = await SELECTORS.async_locator(self.page.get_by_test_id("PlacePickerRow-city"),
+                                                   SUGGESTION_ITEM_ADDRESS, address)
+        await suggestion.click(timeout=10000)
+        await expect(existing_items, f"Address {address} wasn't became set").to_contain_text(city_name, timeout=10000)
+
+    @retryable
+    async def set_from_address(self, from_address: str) -> None:
+        """
+        Method provides setting from address in search flight field
+        :param from_address: string with address. Should be in the following format "city_name, country_name"
+        """
+        logger.info("Set from: %s in search flight form", from_address)
+        from_field = self.page.get_by_test_id("SearchFieldItem-origin")
+        await self.set_address(from_field, from_address)
+
+    @retryable
+    async def set_to_address(self, to_address: str) -> None:
+        """
+        Method provides setting from address in search flight field
+        :param to_address: string with address. Should be in the following format "city_name, country_name"
+        """
+        logger.info("Set to: %s in search flight form", to_address)
+        to_field = self.page.get_by_test_id("SearchFieldItem-destination")
+        await self.set_address(to_field, to_address)
+
+    async def move_calendar_to_month(self, month: str, year: str) -> None:
+        """
+        Method provides moving opened date picker to the month, see MainPageActions.move_calendar_to_month
+        :param month: full month name
+        :param year: year
+        """
+        target_month = f'{month} {year}'
+        displayed_months = await self.page.get_by_test_id("DatepickerMonthButton").all_text_contents()
+        move = self.get_calendar_move(displayed_months, target_month)
+        if move is None:
+            return
+
+        move_button_test_id, clicks = move
+        await self.page.get_by_test_id(move_button_test_id).evaluate(self.CALENDAR_MOVE_SCRIPT,
+                                                                       [move_button_test_id, clicks])
+        await expect(self.page.get_by_test_id("DatepickerMonthButton").filter(has_text=target_month),
+                     f"Date picker wasn't moved to {target_month}").to_be_visible()
+
+    async def select_calendar_date(self, date: str) -> Locator:
+        """
+        Method provides clicking date in opened date picker
+        :param date: string with date. Should be in the following format "day month year"
+        :return: locator of calendar month container with selected date
+        """
+        day, month, year = date.split()
+        await self.move_calendar_to_month(month, year)
+        calendar_month_container = await SELECTORS.async_locator(self.page, CALENDAR_MONTH_PICKER, month)
+        await calendar_month_container.get_by_test_id("DayDateTypography").filter(
+            has_text=re.compile(f"^{day}$")).click()
+        return calendar_month_container
+
+    async def set_dates(self, departure_date: str, return_date: str = None) -> None:
+        """
+        Method provides setting dates in search flight field
+        :param departure_date: string with departure date. Should be in the following format "day month year"
+        :param return_date: string with return date. Should be in the following format "day month year".
+                            If it is None - only departure date is selected (one-way or open-ended search)
+        """
+        logger.info("Set departure: %s and return: %s dates in search flight form", departure_date, return_date)
+        await (await SELECTORS.async_locator(self.page, DATE_INPUT, 'Departure')).click()
+        await expect(self.page.get_by_test_id("NewDatePickerOpen"), "Date picker windget wasn't opened").to_be_visible()
+
+        calendar_month_container = await self.select_calendar_date(departure_date)
+        if return_date is not None:
+            calendar_month_container = await self.select_calendar_date(return_date)
+
+        # Confirm dates
+        await self.page.get_by_test_id("SearchFormDoneButton").click()
+        await expect(calendar_month_container, "Date picker windget wasn't closed").not_to_be_visible()
+
+    async def set_departure_and_return_dates(self, departure_date: str, return_date: str) -> None:
+        """
+        Method provides setting departure and return dates in search flight field
+        :param departure_date: string with departure date. Should be in the following format "day month year"
+        :param return_date: string with return date. Should be in the following format "day month year"
+        """
+        await self.set_dates(departure_date, return_date)
+
+    async def set_passengers(self, adults: int = None, children: int = None, infants: int = None,
+                             cabin_bags: int = None, checked_bags: int = None) -> Dict[str, int]:
+        """
+        Method provides setting passengers composition in search flight field, see MainPageActions.set_passengers
+        :return: dict with final number for every row, e.g. {"adults": 2, "children": 0, ...}
+        """
+        targets = self.get_passengers_targets(adults, children, infants, cabin_bags, checked_bags)
+        logger.info("Set passengers: %s", targets)
+
+        # Open passengers selector
+        passengers_field = await SELECTORS.async_locator(self.page.get_by_test_id("PassengersField"),
+                                                         FLIGHT_MODIFICATIONS)
+        await passengers_field.get_by_test_id("PassengersField-note-1").click()
+        passengers_container = self.page.get_by_test_id("PassengersPopover")
+        await expect(passengers_container, "Passengers management widget wasn't opened").to_be_visible()
+
+        current = await passengers_container.evaluate(self.READ_PASSENGERS_SCRIPT, self.PASSENGERS_ROWS)
+        self.verify_passengers_rows(targets, current)
+
+        rows_changed = False
+        for row_names in self.PASSENGERS_ROW_GROUPS:
+            group_targets = self.get_group_targets(targets, row_names)
+            if rows_changed and group_targets:
+                # Counts of the group could be changed by the app after previous group was set
+                current = await passengers_container.evaluate(self.READ_PASSENGERS_SCRIPT, self.PASSENGERS_ROWS)
+            clicks = self.get_rows_clicks(group_targets, current)
+            for row_name, button, number in clicks:
+                row_button = passengers_container.get_by_test_id(self.PASSENGERS_ROWS[row_name]).locator(button)
+                for _ in range(number):
+                    await row_button.click()
+            if clicks:
+                await self.page.wait_for_function(self.PASSENGERS_SET_SCRIPT,
+                                                  arg=[self.PASSENGERS_ROWS, group_targets])
+                rows_changed = True
+
+        # App can change rows which weren't set, e.g. drop bags of removed passengers, so all rows are read again
+        if rows_changed:
+            current = await passengers_container.evaluate(self.READ_PASSENGERS_SCRIPT, self.PASSENGERS_ROWS)
+        await passengers_container.get_by_test_id("PassengersFieldFooter-done").click()
+        await expect(passengers_container, "Passengers management widget wasn't closed").not_to_be_visible()
+
+        return current
+
+    async def set_number_of_passengers(self, n_adults: int) -> None:
+        """
+        Method provides setting number of passengers in search flight field
+        :param n_adults: int with expected number of adult passengers
+        """
+        logger.info("Set number of passengers: %s", n_adults)
+        await self.set_passengers(adults=n_adults)
+
+    async def uncheck_booking_com_checkbox(self) -> None:
+        """
+        Method unchecks "Check accommodation with booking.com" checkbox
+        """
+        logger.info("Uncheck booking.com checkbox")
+        booking_com_container = await SELECTORS.async_locator(self.page, BOOKING_COM_CONTAINER)
+        await booking_com_container.get_by_role("checkbox").uncheck(force=True)
+
+    async def click_search_button(self) -> None:
+        """
+        Method clicks "Search" button in search flight field
+        """
+        logger.info("Click search button")
+        await self.page.get_by_test_id("LandingSearchButton").click()
+        await expect(self.page.get_by_test_id("ResultList-results"), "Results wasn't loaded").to_be_visible()
+        await self.wait_page_loaded("search")
@@ -0,0 +1,200 @@
+import logging
+from typing import List
+
+from playwright.async_api import Locator, expect
+
+from utils.code_tables import COUNTRIES, GENDERS
+from actions.AsyncBasePageActions import AsyncBasePageActions
+from actions.PassengerDetailsLayer import PassengerDetailsLayer
+from utils.selector_registry import (SELECTORS, GENDER_FORM_INPUT, DATE_OF_BIRTH_FORM_INPUT, PASSPORT_OR_ID_FORM_INPUT,
+                                     ERROR_TOOLTIP)
+from utils.step_retry import retryable
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPassengerDetailsActions(AsyncBasePageActions, PassengerDetailsLayer):
+    """Class contains actions for passengers details page on playwright async API, see PassengerDetailsActions"""
+
+    @property
+    def primary_passenger_form(self) -> Locator:
+        """Primary passenger form locator"""
+        return self.page.get_by_test_id("ReservationPassenger").first
+
+    async def wait_passenger_forms_opened(self) -> None:
+        """
+        Method waits while passengers details page is opened and primary passenger form is displayed
+        """
+        await expect(self.primary_passenger_form, "Passengers details page wasn't opened").to_be_visible()
+
+    @retryable
+    async def set_email(self, email: str) -> None:
+        """
+        Method provides setting email for passenger in contact info form
+        :param email: email to set in form
+        """
+        contact_form = self.page.get_by_test_id("contact-account-promotion")
+        await contact_form.get_by_test_id("contact-email").fill(email)
+
+    @retryable
+    async def set_phone_number(self, phone: str) -> None:
+        """
+        Method provides setting phone number for passenger in contact info form
+        :param phone: phone number to set in form, expected in following format: "+country_code phone_number"
+        """
+        contact_form = self.page.get_by_test_id("contact-account-promotion")
+        phone_country_code, phone_number = phone.split()
+        phone_country_value = COUNTRIES.get_code_by_dial_code(phone_country_code)
+
+        await contact_form.get_by_test_id("contact-phone-country").select_option(phone_country_value)
+        await contact_form.get_by_test_id("contact-phone").fill(phone_number)
+
+    async def set_passenger_contact_info(self, email: str, phone_number: str, batched: bool = True) -> None:
+        """
+        Method provides setting information in passenger contacts form
+        :param email: email to set in form
+        :param phone_number: phone number to set in form, expected in following format: "+country_code phone_number"
+        :param batched: True - fill all fields in a single round trip, False - fill fields one by one
+        """
+        logger.info("Set passengers contacts info: email: %s, phone number: %s", email, phone_number)
+        await self.wait_page_loaded("contact_info")
+        if not batched:
+            await self.set_email(email)
+            await self.set_phone_number(phone_number)
+            return
+
+        missing_fields = await self.fill_forms(self.page.get_by_test_id("contact-account-promotion"),
+                                               [self.get_contact_form_fields(email, phone_number)])
+
+        # Fields which weren't found or can't be set at once are filled one by one
+        for _, field_name in missing_fields:
+            logger.info("Set contact info field one by one: %s", field_name)
+            if field_name == "email":
+                await self.set_email(email)
+            else:
+                await self.set_phone_number(phone_number)
+
+    @retryable
+    async def set_passenger_info(self, passenger_from_locator: Locator, first_name: str = None,
+                                 last_name: str = None, nationality: str = None, gender: str = None,
+                                 date_of_birth: str = None, passport_or_id: int = None,
+                                 passport_or_id_exp_date: str = None):
+        """
+        Method provides setting passenger's personal information field by field, see
+        PassengerDetailsActions.set_passenger_info. If any of these arguments is None - field is left empty
+        """
+        # Set first name and last name
+        if first_name is not None:
+            await passenger_from_locator.get_by_test_id("ReservationPassenger-FirstName"
+                                                        ).get_by_placeholder("e.g. Harry James").fill(first_name)
+        if last_name is not None:
+            await passenger_from_locator.get_by_test_id("ReservationPassenger-LastName"
+                                                        ).get_by_placeholder("e.g. Brown").fill(last_name)
+        # Select nationality
+        if nationality is not None:
+            nationality_code = COUNTRIES.get_code(nationality)
+            await passenger_from_locator.get_by_test_id("ReservationPassenger-nationality"
+                                                        ).select_option(nationality_code)
+
+        # Select gender
+        if gender is not None:
+            gender_code = GENDERS.get_code(gender)
+            gender_input = await SELECTORS.async_locator(passenger_from_locator, GENDER_FORM_INPUT)
+            await gender_input.select_option(gender_code)
+
+        # Select date of birth
+        if date_of_birth is not None:
+            date_of_birth_input = await SELECTORS.async_locator(passenger_from_locator, DATE_OF_BIRTH_FORM_INPUT)
+            await self.set_date_input(date_of_birth_input, *date_of_birth.split())
+
+        # Enter passport number
+        passenger_document = passenger_from_locator.get_by_test_id("ReservationPassengerDocument")
+        if passport_or_id is not None:
+            passport_or_id_input = await SELECTORS.async_locator(passenger_document, PASSPORT_OR_ID_FORM_INPUT)
+            await passport_or_id_input.fill(str(passport_or_id))
+
+        # Enter passport expiration date
+        if passport_or_id_exp_date is not None:
+            date_picker = passenger_document.get_by_test_id("DatePickerField-switcher-text")
+            await self.set_date_input(date_picker, *passport_or_id_exp_date.split())
+
+    async def set_primary_passenger_info(self, **kwargs) -> None:
+        """
+        Method provides setting primary passenger's personal information, see
+        PassengerDetailsActions.set_primary_passenger_info
+        """
+        # Values are personal data, so only names of set fields are logged
+        logger.info("Set primary passenger info: %s", ", ".join(kwargs))
+        await self.set_passengers_info([kwargs])
+
+    @retryable
+    async def set_passengers_info(self, passengers: List[dict], batched: bool = True) -> None:
+        """
+        Method provides setting personal information of several passengers at once, see
+        PassengerDetailsActions.set_passengers_info
+        :param passengers: list of passengers personal information, i-th item is set to i-th passenger form
+        :param batched: False - to fill all fields one by one
+        """
+        logger.info("Set personal info of %s passengers", len(passengers))
+        passenger_forms = self.page.get_by_test_id("ReservationPassenger")
+        if not batched:
+            for index, passenger in enumerate(passengers):
+                await self.set_passenger_info(passenger_forms.nth(index), **passenger)
+            return
+
+        missing_fields = await self.fill_forms(
+            passenger_forms, [self.get_passenger_form_fields(**passenger) for passenger in passengers])
+        for index, field_name in missing_fields:
+            logger.info("Set passenger %s info field one by one: %s", index + 1, field_name)
+            await self.set_passenger_info(passenger_forms.nth(index), **{field_name: passengers[index][field_name]})
+
+    async def remove_passenger(self, passenger_number: int) -> None:
+        """
+        Method provides removing passenger from flight (remove passenger details card from the page)
+        :param passenger_number: passenger ordinal number to remove
+        """
+        logger.info("Remove %s passenger", passenger_number)
+        # From ordinal number to index
+        index = passenger_number - 1
+
+        passenger_form = (await self.page.get_by_test_id("ReservationPassenger").all())[index]
+        await passenger_form.get_by_test_id("removePassengerButton").click()
+        await expect(self.page.get_by_test_id("ReservationPassenger"), "Passenger wasn't removed").to_have_count(index)
+
+    async def continue_next_page(self) -> None:
+        """
+        Method clicks continue button to process to the next page of checkout form
+        """
+        logger.info("Click 'Continue'")
+        await self.page.get_by_test_id("StepControls-passengers-next").click()
+        await self.wait_page_loaded("continue_next_page")
+
+    async def reset_passengers_forms(self) -> None:
+        """
+        Method provides clearing contact and all passengers forms in a single round trip, so the same page can be filled
+        again
+        """
+        logger.info("Reset contact and passengers forms")
+        await self.page.locator("[data-test='contact-account-promotion'], [data-test='ReservationPassenger']"
+                                ).evaluate_all(self.RESET_FORMS_SCRIPT)
+
+    async def check_error_message_in_primary_passenger_passport_or_id_exp_date(self, expected_error: str) -> None:
+        """
+        Method verifies that expected error message appeared near passport expiration date form for the
+        primary passenger
+        """
+        logger.info("Check expected error message at primary passenger passport or id expiration date: %s",
+                    expected_error)
+        date_picker = self.primary_passenger_form.get_by_test_id("DatePickerField-switcher-text")
+        await expect(await SELECTORS.async_locator(date_picker, ERROR_TOOLTIP),
+                     "Unexpected primary passenger passport or id expiration date").to_contain_text(expected_error)
+
+    async def check_no_error_message_in_primary_passenger_passport_or_id_exp_date(self) -> None:
+        """
+        Method verifies that there is no error message near passport expiration date form for the primary passenger
+        """
+        logger.info("Check there is no error message at primary passenger passport or id expiration date")
+        date_picker = self.primary_passenger_form.get_by_test_id("DatePickerField-switcher-text")
+        # Tooltip is expected to be absent, so it isn't probed
+        await expect(SELECTORS.unprobed_locator(date_picker, ERROR_TOOLTIP),
+                     "Unexpected primary passenger passport or id expiration date error").to_have_count(0)
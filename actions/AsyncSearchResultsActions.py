@@ -0,0 +1,160 @@
+import logging
+from typing import Iterable, List
+
+from playwright.async_api import Locator, expect
+
+from utils.constants import StopsFilterValues, ExcludeCountriesFilterValues
+from actions.AsyncBasePageActions import AsyncBasePageActions, AsyncBaseModalActions
+from actions.SearchResultsActions import SearchResultsActions
+from utils.search_results import EXTRACT_RESULTS_SCRIPT, MORE_RESULTS_SCRIPT, SearchResult, to_search_results
+from utils.search_url import build_search_results_url
+from utils.selector_registry import SELECTORS, LAYOVER_DETAILS_CONTAINER, FILTER_TITLE
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncLogInModalActions(AsyncBaseModalActions):
+    """Class contains actions for log in modal card on playwright async API"""
+
+    async def continue_as_guest(self):
+        """
+        Method provides clicking "Continue as guest" button at log in modal
+        """
+        logger.info("Click 'Continue as guest'")
+        await self.modal_window.get_by_test_id("MagicLogin-GuestTextLink").click()
+        await self.wait_modal_closed()
+
+
+class AsyncFlightDetailsModalActions(AsyncBaseModalActions):
+    """Class contains actions for flight details modal card on playwright async API"""
+
+    async def check_number_of_transfers(self, expected_number: int) -> None:
+        """
+        Method verifies actual number of transfers for each part of the trip matches with expected one
+        :param expected_number: expected number of transfers
+        """
+        logger.info("Check number of transfers is %s", expected_number)
+        full_trip_parts = await self.modal_window.get_by_test_id("TripPopupWrapper").all()
+        for trip_part_name, trip_part_data in zip(["Trip from", "Trip to"], full_trip_parts):
+            await expect(await SELECTORS.async_locator(trip_part_data, LAYOVER_DETAILS_CONTAINER),
+                         f'Unexpected number of layovers for {trip_part_name}').to_have_count(expected_number)
+
+    async def click_select_button(self) -> AsyncLogInModalActions:
+        """
+        Method provides clicking "Select" button on flight details modal card
+        """
+        logger.info("Click select button")
+        await self.modal_window.get_by_test_id("DetailBookingButton").click()
+        await expect(self.modal_window, "Flight details modal window wasn't closed").not_to_be_visible()
+        login_modal_locator = self.base_page.get_by_test_id("MagicLogin")
+        log_in_modal = AsyncLogInModalActions(login_modal_locator)
+        await log_in_modal.wait_modal_opened()
+        return log_in_modal
+
+
+class AsyncSearchResultsActions(AsyncBasePageActions):
+    """Class contains actions for search flight results page on playwright async API, see SearchResultsActions"""
+
+    async def open_search_results(self, base_url: str, from_address: str, to_address: str, departure_date: str,
+                                  return_date: str = None, adults: int = 1, children: int = 0, infants: int = 0,
+                                  cabin_bags: int = 0, checked_bags: int = 0, stops: StopsFilterValues = None,
+                                  exclude_countries: Iterable[ExcludeCountriesFilterValues] = ()) -> None:
+        """
+        Method provides opening search results page directly by url, without filling search flight form. Parameters are
+        the same as values set in the form and filters, see build_search_results_url
+        :param base_url: url of application home page
+        """
+        url = build_search_results_url(base_url, from_address, to_address, departure_date, return_date, adults,
+                                       children, infants, cabin_bags, checked_bags, stops, exclude_countries)
+        logger.info("Open search results: %s", url)
+        await self.page.goto(url)
+        await self.close_modal()
+        await expect(self.page.get_by_test_id("ResultList-results"), "Results wasn't loaded").to_be_visible()
+        await self.wait_page_loaded("open_search_results")
+
+    async def open_filter(self, filter_locator: Locator) -> None:
+        """
+        Method provides opening filter on the search result page if it is closed
+        :param filter_locator: locator object with expected filter to be opened
+        """
+        filter_title = await SELECTORS.async_locator(filter_locator, FILTER_TITLE)
+        if await filter_title.is_hidden():
+            # If filter is closed it is needed to be opened
+            await filter_locator.get_by_role('button').first.click()
+            await expect(filter_title, "Filter wasn't opened").not_to_be_hidden()
+
+    async def set_stops_filter(self, filter_value: StopsFilterValues) -> None:
+        """
+        Method provides setting stops filter values on search results page
+        :param filter_value: expected value to set
+        """
+        logger.info("Set stops filter value: %s", filter_value)
+        stops_filter = self.page.get_by_test_id("FilterHeader-stops")
+        await self.open_filter(stops_filter)
+        await stops_filter.locator(f"xpath=//span[text()='{filter_value.value}']").click()
+        await self.wait_page_loaded("stops_filter")
+
+    async def set_exclude_country_filter(self, filter_value: ExcludeCountriesFilterValues,
+                                         with_search: bool = True) -> None:
+        """
+        Method provides setting exclude countries for transition filter values on search results page
+        :param filter_value: expected value to set
+        :param with_search: True - to search filter value before selecting
+        """
+        logger.info("Set exclude country filter value: %s", filter_value)
+        exclude_countries_filter = self.page.get_by_test_id("FilterHeader-countries")
+        await self.open_filter(exclude_countries_filter)
+        if with_search:
+            # click search country
+            await exclude_countries_filter.get_by_test_id("Multiselect-SelectSearchButton").click()
+            await exclude_countries_filter.get_by_placeholder("Search countries").fill(filter_value.value)
+            await exclude_countries_filter.get_by_test_id("CountriesFilterChoiceGroup-inResults"
+                                                          ).get_by_role("checkbox").check(force=True)
+        else:
+            await exclude_countries_filter.locator("xpath=//label").filter(has_text=filter_value.value).click()
+
+        await self.wait_page_loaded("exclude_country_filter")
+
+    async def load_more_results(self) -> None:
+        """
+        Method provides clicking "Load more" button under search results and waiting for the next results page
+        """
+        logger.info("Load more results")
+        await self.page.get_by_test_id("ResultsMoreButton").click()
+        await self.wait_page_loaded("load_more_results")
+
+    async def get_results(self, max_results: int = None) -> List[SearchResult]:
+        """
+        Method provides records of search result cards, see SearchResultsActions.get_results
+        :param max_results: max number of results to read, None - read all results
+        :return: results in the order they are displayed
+        """
+        results_container = self.page.get_by_test_id("ResultList-results")
+        results = []
+        while max_results is None or len(results) < max_results:
+            extracted = await results_container.evaluate(EXTRACT_RESULTS_SCRIPT, len(results))
+            results.extend(to_search_results(extracted["rows"]))
+            if not extracted["hasMore"]:
+                break
+            await self.load_more_results()
+            # Next page may be rendered after the page is loaded, paging is finished only when the button disappears
+            await self.page.wait_for_function(MORE_RESULTS_SCRIPT, arg=len(results))
+
+        logger.info("Read %s search results", len(results))
+        return results[:max_results]
+
+    # Checks don't query the page, so they are shared with sync actions
+    check_results_max_stops = SearchResultsActions.check_results_max_stops
+    check_results_exclude_layover_countries = SearchResultsActions.check_results_exclude_layover_countries
+
+    async def select_first_flight(self) -> AsyncFlightDetailsModalActions:
+        """
+        Method provides selecting first flight (open flight details modal) on search results page
+        :return: opened modal available actions
+        """
+        logger.info("Select first flight")
+        await self.page.get_by_test_id("ResultCardWrapper").first.click()
+        flight_details_modal = self.page.get_by_test_id("ResultCardModal")
+        opened_modal = AsyncFlightDetailsModalActions(self.page, flight_details_modal)
+        await opened_modal.wait_modal_opened()
+        return opened_modal
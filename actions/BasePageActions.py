@@ -1,8 +1,11 @@
 import logging
+from typing import List, Tuple
 
 from playwright.sync_api import expect, Locator
 
-from utils.constants import SEARCH_RESULTS_TIMEOUT
+from utils.readiness import READINESS
+from utils.selector_registry import SELECTORS, MODAL_WINDOW
+from utils.step_timing import instrument_actions
 
 logger = logging.getLogger(__name__)
 
@@ -12,10 +15,15 @@ class BaseModalActions:
         self.base_page = base_page
 
         if card_locator is None:
-            card_locator = self.base_page.locator("xpath=//div[contains(@class, 'Modal__ModalWrapperContent')]")
+            card_locator = SELECTORS.locator(self.base_page, MODAL_WINDOW)
 
         self.modal_window = card_locator
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every public action of the modal is timed
+        instrument_actions(cls)
+
     def click_close_modal(self) -> None:
         self.modal_window.get_by_test_id("ModalCloseButton").click()
         self.wait_modal_closed()
@@ -36,9 +44,56 @@ class BaseModalActions:
 class BasePageActions:
     """Class contains common actions for all pages"""
 
+    # Sets values of several forms fields the way user input does: focus, native value setter, input, change and blur
+    # events, so React state and validation see the new values. Returns fields that were not found
+    FILL_FORMS_SCRIPT = """(forms, formsFields) => {
+        const valueSetters = {
+            INPUT: Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set,
+            SELECT: Object.getOwnPropertyDescriptor(HTMLSelectElement.prototype, "value").set,
+            TEXTAREA: Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, "value").set,
+        };
+        const missing = [];
+        formsFields.forEach((fields, formIndex) => {
+            const form = forms[formIndex];
+            fields.forEach(field => {
+                let scope = form || null;
+                if (scope && field.scope) {
+                    scope = Array.from(scope.querySelectorAll(field.scope)).find(element => !field.scopeText ||
+                        Array.from(element.querySelectorAll("span")).some(
+                            span => span.textContent.trim() === field.scopeText)) || null;
+                }
+                let element = scope && field.selector ? scope.querySelector(field.selector) : scope;
+                if (element && !(element.tagName in valueSetters)) {
+                    element = element.querySelector("input, select, textarea");
+                }
+                let value = field.value;
+                if (element && element.tagName === "SELECT") {
+                    const option = Array.from(element.options).find(option => field.byLabel ?
+                        option.textContent.trim() === value : option.value === value);
+                    value = option ? option.value : null;
+                }
+                if (!element || value === null) {
+                    missing.push([formIndex, field.name]);
+                    return;
+                }
+                element.focus();
+                valueSetters[element.tagName].call(element, value);
+                element.dispatchEvent(new Event("input", {bubbles: true}));
+                element.dispatchEvent(new Event("change", {bubbles: true}));
+                element.blur();
+            });
+        });
+        return missing;
+    }"""
+
     def __init__(self, page):
         self.page = page
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every public action of the page is timed
+        instrument_actions(cls)
+
     def close_modal(self):
         """Method provides closing current opened modal on the page if it is opened"""
         logger.info("Close modal")
@@ -46,10 +101,29 @@ class BasePageActions:
         if modal.is_opened():
             modal.click_close_modal()
 
-    def wait_page_loaded(self):
-        """Method provides waiting while page become loaded (loader line disappears)"""
-        expect(self.page.get_by_test_id("LoadingLine"), "Page wasn't loaded"
-               ).not_to_be_visible(timeout=SEARCH_RESULTS_TIMEOUT)
+    def wait_page_loaded(self, step_name: str = "page") -> None:
+        """
+        Method provides waiting while page become loaded: loader line disappears, search requests are finished and
+        results stop changing
+        :param step_name: name of the step page is loaded after, timeout is learned from previous runs of the step
+        """
+        READINESS.wait_settled(self.page, step_name)
+
+    def fill_forms(self, forms_locator: Locator, forms_fields: List[List[dict]]) -> List[Tuple[int, str]]:
+        """
+        Method provides filling all independent fields of several forms in a single round trip
+        :param forms_locator: locator matching all forms to fill
+        :param forms_fields: fields to fill for every form matched by forms_locator, every field is a dict:
+            name: field name, reported back if field wasn't filled
+            value: string value to set, for select - option value or option label if byLabel is True
+            selector: optional css selector of the field inside the form (or inside the scope)
+            scope: optional css selector of the field container inside the form
+            scopeText: optional exact text of span inside scope container to choose one of matched containers
+            byLabel: True - to select option of select field by its label
+        :return: list of (form index, field name) which were not found on the page and weren't filled
+        """
+        missing = forms_locator.evaluate_all(self.FILL_FORMS_SCRIPT, forms_fields)
+        return list(dict.fromkeys((form_index, field_name) for form_index, field_name in missing))
 
     @staticmethod
     def set_date_input(date_container: Locator, day: str, month: str, year: str) -> None:
@@ -59,3 +133,7 @@ class BasePageActions:
         date_container.get_by_test_id("day").fill(day)
         date_container.get_by_test_id("month").select_option(label=month)
         date_container.get_by_test_id("year").fill(year)
+
+
+instrument_actions(BaseModalActions)
+instrument_actions(BasePageActions)
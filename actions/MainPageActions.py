@@ -1,23 +1,20 @@
 import logging
+import re
+from typing import Dict
 
 from playwright.sync_api import Locator, expect
 
 from actions.BasePageActions import BasePageActions
+from actions.MainPageLayer import MainPageLayer
+from utils.selector_registry import (SELECTORS, SUGGESTION_ITEM_ADDRESS, DATE_INPUT, CALENDAR_MONTH_PICKER,
+                                     FLIGHT_MODIFICATIONS, BOOKING_COM_CONTAINER)
+from utils.step_retry import retryable
 
 logger = logging.getLogger(__name__)
 
 
-class MainPageActions(BasePageActions):
-    """Class contains actions that relates to main home page"""
-    SUGGESTION_ITEM_ADDRESS = ("xpath=//div[contains(@class, 'PlacePickerstyled__PlacePickerItemName') and "
-                               "contains(text(), '{}')]")
-    DATE_INPUT = ("xpath=//div[@data-test='SearchDateInput']//div[contains(@class, "
-                  "'SearchFieldstyled__SearchFieldLabel') and text()='{}']")
-    CALENDAR_MONTH_PICKER = ("xpath=//div[contains(@class, 'Calendarstyled__Container') and .//div[contains(@class,"
-                             "'ButtonPrimitiveContentChildren') and contains(text(),'{}')]]")
-    FLIGHT_MODIFICATIONS = "xpath=//div[contains(@class, 'ButtonWrapsstyled__ButtonTabletWrap')]"
-    INCREMENT_BUTTON = "xpath=//button[@aria-label='increment']"
-    BOOKING_COM_CONTAINER = "xpath=//div[contains(@class, 'BookingcomSwitchstyled__StyledBookingcomSwitch')]"
+class MainPageActions(BasePageActions, MainPageLayer):
+    """Class contains actions that relates to main home page, selectors and scripts are shared in MainPageLayer"""
 
     def set_address(self, field_locator: Locator, address: str) -> None:
         """
@@ -36,83 +33,151 @@ class MainPageActions(BasePageActions):
                 expect(item, "Address wasn't removed").not_to_be_visible(timeout=10000)
 
         field_locator.get_by_test_id("SearchField-input").fill(city_name)
-        self.page.get_by_test_id("PlacePickerRow-city").locator(self.SUGGESTION_ITEM_ADDRESS.format(address),).click(
+        SELECTORS.locator(self.page.get_by_test_id("PlacePickerRow-city"), SUGGESTION_ITEM_ADDRESS, address).click(
             timeout=10000)
         expect(existing_items, f"Address {address} wasn't became set").to_contain_text(city_name, timeout=10000)
 
+    @retryable
     def set_from_address(self, from_address: str) -> None:
         """
         Method provides setting from address in search flight field
         :param from_address: string with address. Should be in the following format "city_name, country_name"
         """
-        logger.info(f"Set from: {from_address} in search flight form")
+        logger.info("Set from: %s in search flight form", from_address)
         from_field = self.page.get_by_test_id("SearchFieldItem-origin")
         self.set_address(from_field, from_address)
 
+    @retryable
     def set_to_address(self, to_address: str) -> None:
         """
         Method provides setting from address in search flight field
         :param to_address: string with address. Should be in the following format "city_name, country_name"
         """
-        logger.info(f"Set to: {to_address} in search flight form")
+        logger.info("Set to: %s in search flight form", to_address)
         to_field = self.page.get_by_test_id("SearchFieldItem-destination")
         self.set_address(to_field, to_address)
 
-    def set_departure_and_return_dates(self, departure_date: str, return_date: str) -> None:
+    def move_calendar_to_month(self, month: str, year: str) -> None:
         """
-        Method provides setting departure and return dates in search flight field
+        Method provides moving opened date picker to the month. Offset to the month is calculated from displayed
+        months read at once, and calendar is moved forward or backward by all needed steps in a single evaluation
+        :param month: full month name
+        :param year: year
+        """
+        target_month = f'{month} {year}'
+        displayed_months = self.page.get_by_test_id("DatepickerMonthButton").all_text_contents()
+        move = self.get_calendar_move(displayed_months, target_month)
+        if move is None:
+            return
+
+        move_button_test_id, clicks = move
+        self.page.get_by_test_id(move_button_test_id).evaluate(self.CALENDAR_MOVE_SCRIPT, [move_button_test_id, clicks])
+        expect(self.page.get_by_test_id("DatepickerMonthButton").filter(has_text=target_month),
+               f"Date picker wasn't moved to {target_month}").to_be_visible()
+
+    def select_calendar_date(self, date: str) -> Locator:
+        """
+        Method provides clicking date in opened date picker
+        :param date: string with date. Should be in the following format "day month year"
+        :return: locator of calendar month container with selected date
+        """
+        day, month, year = date.split()
+        self.move_calendar_to_month(month, year)
+        calendar_month_container = SELECTORS.locator(self.page, CALENDAR_MONTH_PICKER, month)
+        calendar_month_container.get_by_test_id("DayDateTypography").filter(
+            has_text=re.compile(f"^{day}$")).click()
+        return calendar_month_container
+
+    def set_dates(self, departure_date: str, return_date: str = None) -> None:
+        """
+        Method provides setting dates in search flight field
         :param departure_date: string with departure date. Should be in the following format "day month year"
-        :param return_date: string with return date. Should be in the following format "day month year"
+        :param return_date: string with return date. Should be in the following format "day month year".
+                            If it is None - only departure date is selected (one-way or open-ended search)
         """
-        logger.info(f"Set departure: {departure_date} and return: {return_date} dates in search flight form")
-        self.page.locator(self.DATE_INPUT.format('Departure')).click()
+        logger.info("Set departure: %s and return: %s dates in search flight form", departure_date, return_date)
+        SELECTORS.locator(self.page, DATE_INPUT, 'Departure').click()
         expect(self.page.get_by_test_id("NewDatePickerOpen"), "Date picker windget wasn't opened").to_be_visible()
 
-        for date in [departure_date, return_date]:
-            day, month, year = date.split()
-            displayed_months = self.page.get_by_test_id("DatepickerMonthButton").all_text_contents()
-            # Search expected month calendar
-            while f'{month} {year}' not in displayed_months:
-                self.page.get_by_test_id("CalendarMoveNextButton").click()
-                displayed_months = self.page.get_by_test_id("DatepickerMonthButton").all_text_contents()
-
-            calendar_month_container = self.page.locator(self.CALENDAR_MONTH_PICKER.format(month))
-            calendar_dates = calendar_month_container.get_by_test_id("DayDateTypography").all()
-            # Click day
-            [date_button for date_button in calendar_dates if date_button.text_content() == day][0].click()
+        calendar_month_container = self.select_calendar_date(departure_date)
+        if return_date is not None:
+            calendar_month_container = self.select_calendar_date(return_date)
 
         # Confirm dates
         self.page.get_by_test_id("SearchFormDoneButton").click()
         expect(calendar_month_container, "Date picker windget wasn't closed").not_to_be_visible()
 
-    def set_number_of_passengers(self, n_adults: int) -> None:
+    def set_departure_and_return_dates(self, departure_date: str, return_date: str) -> None:
         """
-        Method provides setting number of passengers in search flight field
-        :param n_adults: int with expected number of adult passengers
+        Method provides setting departure and return dates in search flight field
+        :param departure_date: string with departure date. Should be in the following format "day month year"
+        :param return_date: string with return date. Should be in the following format "day month year"
+        """
+        self.set_dates(departure_date, return_date)
+
+    def set_passengers(self, adults: int = None, children: int = None, infants: int = None, cabin_bags: int = None,
+                       checked_bags: int = None) -> Dict[str, int]:
+        """
+        Method provides setting passengers composition in search flight field. Current counts of all rows are read at
+        once and every row is clicked up or down exactly as many times as needed. Bags are set after passengers, their
+        counts are read again if passengers were changed. If any of these arguments is None - row is left as is
+        :param adults: expected number of adult passengers
+        :param children: expected number of children
+        :param infants: expected number of infants
+        :param cabin_bags: expected number of cabin bags
+        :param checked_bags: expected number of checked bags
+        :return: dict with number for every row read after all rows were set, e.g. {"adults": 2, "children": 0, ...},
+                 None - for rows that are not displayed
         """
-        logger.info(f"Set number of passengers: {n_adults}")
+        targets = self.get_passengers_targets(adults, children, infants, cabin_bags, checked_bags)
+        logger.info("Set passengers: %s", targets)
+
         # Open passengers selector
-        self.page.get_by_test_id("PassengersField").locator(
-            self.FLIGHT_MODIFICATIONS).get_by_test_id("PassengersField-note-1").click()
+        SELECTORS.locator(self.page.get_by_test_id("PassengersField"), FLIGHT_MODIFICATIONS).get_by_test_id(
+            "PassengersField-note-1").click()
         passengers_container = self.page.get_by_test_id("PassengersPopover")
         expect(passengers_container, "Passengers management widget wasn't opened").to_be_visible()
 
-        # Set up number of adult passengers
-        adults_container = passengers_container.get_by_test_id("PassengersRow-adults")
-        current_number_of_adults = int(adults_container.locator("css=input").input_value())
-        while current_number_of_adults < n_adults:
-            adults_container.locator(self.INCREMENT_BUTTON).click()
-            current_number_of_adults = int(adults_container.locator("css=input").input_value())
-
+        current = passengers_container.evaluate(self.READ_PASSENGERS_SCRIPT, self.PASSENGERS_ROWS)
+        self.verify_passengers_rows(targets, current)
+
+        rows_changed = False
+        for row_names in self.PASSENGERS_ROW_GROUPS:
+            group_targets = self.get_group_targets(targets, row_names)
+            if rows_changed and group_targets:
+                # Counts of the group could be changed by the app after previous group was set
+                current = passengers_container.evaluate(self.READ_PASSENGERS_SCRIPT, self.PASSENGERS_ROWS)
+            clicks = self.get_rows_clicks(group_targets, current)
+            for row_name, button, number in clicks:
+                row_button = passengers_container.get_by_test_id(self.PASSENGERS_ROWS[row_name]).locator(button)
+                for _ in range(number):
+                    row_button.click()
+            if clicks:
+                self.page.wait_for_function(self.PASSENGERS_SET_SCRIPT, arg=[self.PASSENGERS_ROWS, group_targets])
+                rows_changed = True
+
+        # App can change rows which weren't set, e.g. drop bags of removed passengers, so all rows are read again
+        if rows_changed:
+            current = passengers_container.evaluate(self.READ_PASSENGERS_SCRIPT, self.PASSENGERS_ROWS)
         passengers_container.get_by_test_id("PassengersFieldFooter-done").click()
-        expect(adults_container, "Passengers management widget wasn't closed").not_to_be_visible()
+        expect(passengers_container, "Passengers management widget wasn't closed").not_to_be_visible()
+
+        return current
+
+    def set_number_of_passengers(self, n_adults: int) -> None:
+        """
+        Method provides setting number of passengers in search flight field
+        :param n_adults: int with expected number of adult passengers
+        """
+        logger.info("Set number of passengers: %s", n_adults)
+        self.set_passengers(adults=n_adults)
 
     def uncheck_booking_com_checkbox(self) -> None:
         """
         Method unchecks "Check accommodation with booking.com" checkbox
         """
         logger.info("Uncheck booking.com checkbox")
-        booking_com_container = self.page.locator(self.BOOKING_COM_CONTAINER)
+        booking_com_container = SELECTORS.locator(self.page, BOOKING_COM_CONTAINER)
         booking_com_container.get_by_role("checkbox").uncheck(force=True)
 
     def click_search_button(self) -> None:
@@ -122,4 +187,4 @@ class MainPageActions(BasePageActions):
         logger.info("Click search button")
         self.page.get_by_test_id("LandingSearchButton").click()
         expect(self.page.get_by_test_id("ResultList-results"), "Results wasn't loaded").to_be_visible()
-        self.wait_page_loaded()
+        self.wait_page_loaded("search")
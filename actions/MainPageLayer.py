@@ -0,0 +1,103 @@
+from typing import Dict, List, Optional, Tuple
+
+from utils.utils import months_between
+
+
+class MainPageLayer:
+    """
+    Class contains selectors, scripts and calculations of main home page actions which don't query the page, so sync
+    and async actions share them and differ only in awaiting playwright calls
+    """
+    INCREMENT_BUTTON = "xpath=//button[@aria-label='increment']"
+    DECREMENT_BUTTON = "xpath=//button[@aria-label='decrement']"
+
+    # Passengers management widget rows: row name -> row test id
+    PASSENGERS_ROWS = {
+        "adults": "PassengersRow-adults",
+        "children": "PassengersRow-children",
+        "infants": "PassengersRow-infants",
+        "cabin_bags": "BagsPopup-cabin",
+        "checked_bags": "BagsPopup-checked",
+    }
+    # Rows are set group by group: app drops bags over allowance of removed passengers, so bags are set after passengers
+    PASSENGERS_ROW_GROUPS = (("adults", "children", "infants"), ("cabin_bags", "checked_bags"))
+
+    # Reads numbers of all passengers management widget rows, null - for rows that are not displayed
+    READ_PASSENGERS_SCRIPT = """(container, rows) => Object.fromEntries(Object.entries(rows).map(([name, testId]) => {
+        const input = container.querySelector(`[data-test="${testId}"] input`);
+        return [name, input ? Number(input.value) : null];
+    }))"""
+
+    # Checks that all passengers management widget rows reached expected numbers
+    PASSENGERS_SET_SCRIPT = """([rows, targets]) => Object.entries(targets).every(([name, number]) => {
+        const input = document.querySelector(`[data-test="PassengersPopover"] [data-test="${rows[name]}"] input`);
+        return input !== null && Number(input.value) === number;
+    })"""
+
+    # Clicks calendar move button several times, waiting for calendar re-render between clicks
+    CALENDAR_MOVE_SCRIPT = """async (button, [testId, clicks]) => {
+        for (let click = 0; click < clicks; click++) {
+            (document.querySelector(`[data-test="${testId}"]`) || button).click();
+            await new Promise(resolve => requestAnimationFrame(() => resolve()));
+        }
+    }"""
+
+    @staticmethod
+    def get_calendar_move(displayed_months: List[str], target_month: str) -> Optional[Tuple[str, int]]:
+        """
+        Method provides moving of date picker to the target month
+        :param displayed_months: texts of months displayed in date picker, e.g. ["July 2023", "August 2023"]
+        :param target_month: month to move to, e.g. "October 2023"
+        :return: test id of move button and number of its clicks, None - if target month is already displayed
+        """
+        if target_month in [displayed_month.strip() for displayed_month in displayed_months]:
+            return None
+
+        offset = months_between(displayed_months[0], target_month)
+        if offset > 0:
+            # Target month will be displayed as the last one
+            return "CalendarMoveNextButton", months_between(displayed_months[-1], target_month)
+        return "CalendarMovePrevButton", abs(offset)
+
+    @staticmethod
+    def get_passengers_targets(adults: int = None, children: int = None, infants: int = None, cabin_bags: int = None,
+                               checked_bags: int = None) -> Dict[str, int]:
+        """
+        Method provides expected numbers of passengers management widget rows, rows with None number are skipped.
+        Arguments are the same as in MainPageActions.set_passengers
+        """
+        targets = {"adults": adults, "children": children, "infants": infants, "cabin_bags": cabin_bags,
+                   "checked_bags": checked_bags}
+        return {row_name: number for row_name, number in targets.items() if number is not None}
+
+    @staticmethod
+    def verify_passengers_rows(targets: Dict[str, int], current: Dict[str, Optional[int]]) -> None:
+        """
+        Method verifies that every row to set is displayed in passengers management widget
+        :param targets: expected number for every row to set
+        :param current: current number for every row, None - for rows that are not displayed
+        """
+        for row_name in targets:
+            if current[row_name] is None:
+                raise ValueError(f"There is no {row_name} row in passengers management widget")
+
+    @staticmethod
+    def get_group_targets(targets: Dict[str, int], row_names: Tuple[str, ...]) -> Dict[str, int]:
+        """Method provides expected numbers of the rows of one group, see PASSENGERS_ROW_GROUPS"""
+        return {row_name: targets[row_name] for row_name in row_names if row_name in targets}
+
+    @classmethod
+    def get_rows_clicks(cls, targets: Dict[str, int], current: Dict[str, int]) -> List[Tuple[str, str, int]]:
+        """
+        Method provides clicks setting passengers management widget rows to expected numbers. Rows are decreased before
+        increased and infants after adults, so number of infants never exceeds adults
+        :param targets: expected number for every row to set
+        :param current: current number for every row
+        :return: list of (row name, button, number of clicks)
+        """
+        rows = [row_name for row_name in cls.PASSENGERS_ROWS if row_name in targets]
+        decrements = [(row_name, cls.DECREMENT_BUTTON, current[row_name] - targets[row_name])
+                      for row_name in reversed(rows) if targets[row_name] < current[row_name]]
+        increments = [(row_name, cls.INCREMENT_BUTTON, targets[row_name] - current[row_name])
+                      for row_name in rows if targets[row_name] > current[row_name]]
+        return decrements + increments
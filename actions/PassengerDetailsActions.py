@@ -1,26 +1,33 @@
 import logging
+from typing import List
 
 from playwright.sync_api import Locator, expect
 
-from utils.constants import PHONE_COUNTRY_CODE_VALUE_MATCH, NATIONALITY_CODE_VALUE_MATCH, GENDER_CODE_VALUE_MATCH
+from utils.code_tables import COUNTRIES, GENDERS
 from actions.BasePageActions import BasePageActions
+from actions.PassengerDetailsLayer import PassengerDetailsLayer
+from utils.selector_registry import (SELECTORS, GENDER_FORM_INPUT, DATE_OF_BIRTH_FORM_INPUT, PASSPORT_OR_ID_FORM_INPUT,
+                                     ERROR_TOOLTIP)
+from utils.step_retry import retryable
 
 logger = logging.getLogger(__name__)
 
 
-class PassengerDetailsActions(BasePageActions):
-    """Class contains actions for passengers details page"""
-    GENDER_FORM_INPUT = "xpath=//div[contains(@class, 'PassengerForm__GenderWrapper')]//select"
-    DATE_OF_BIRTH_FORM_INPUT = "xpath=//div[contains(@class,'InputGroup') and .//span[text()='Date of birth']]"
-    PASSPORT_OR_ID_FORM_INPUT = "xpath=//div[contains(@class, 'Document__FieldWrapper')]//input[@name='idNumber']"
-
-    ERROR_TOOLTIP = "xpath=//div[contains(@class, 'Tooltip__StyledFormFeedbackTooltip')]"
+class PassengerDetailsActions(BasePageActions, PassengerDetailsLayer):
+    """Class contains actions for passengers details page, selectors and scripts are shared in PassengerDetailsLayer"""
 
     @property
     def primary_passenger_form(self) -> Locator:
         """Primary passenger form locator"""
         return self.page.get_by_test_id("ReservationPassenger").first
 
+    def wait_passenger_forms_opened(self) -> None:
+        """
+        Method waits while passengers details page is opened and primary passenger form is displayed
+        """
+        expect(self.primary_passenger_form, "Passengers details page wasn't opened").to_be_visible()
+
+    @retryable
     def set_email(self, email: str) -> None:
         """
         Method provides setting email for passenger in contact info form
@@ -29,6 +36,7 @@ class PassengerDetailsActions(BasePageActions):
         contact_form = self.page.get_by_test_id("contact-account-promotion")
         contact_form.get_by_test_id("contact-email").fill(email)
 
+    @retryable
     def set_phone_number(self, phone: str) -> None:
         """
         Method provides setting phone number for passenger in contact info form
@@ -36,22 +44,37 @@ class PassengerDetailsActions(BasePageActions):
         """
         contact_form = self.page.get_by_test_id("contact-account-promotion")
         phone_country_code, phone_number = phone.split()
-        phone_country_value = PHONE_COUNTRY_CODE_VALUE_MATCH.get(phone_country_code)
+        phone_country_value = COUNTRIES.get_code_by_dial_code(phone_country_code)
 
         contact_form.get_by_test_id("contact-phone-country").select_option(phone_country_value)
         contact_form.get_by_test_id("contact-phone").fill(phone_number)
 
-    def set_passenger_contact_info(self, email: str, phone_number: str) -> None:
+    def set_passenger_contact_info(self, email: str, phone_number: str, batched: bool = True) -> None:
         """
         Method provides setting information in passenger contacts form
         :param email: email to set in form
         :param phone_number: phone number to set in form, expected in following format: "+country_code phone_number"
-        """
-        logger.info(f"Set passengers contacts info: email: {email}, phone number: {phone_number}")
-        self.wait_page_loaded()
-        self.set_email(email)
-        self.set_phone_number(phone_number)
-
+        :param batched: True - fill all fields in a single round trip, False - fill fields one by one
+        """
+        logger.info("Set passengers contacts info: email: %s, phone number: %s", email, phone_number)
+        self.wait_page_loaded("contact_info")
+        if not batched:
+            self.set_email(email)
+            self.set_phone_number(phone_number)
+            return
+
+        missing_fields = self.fill_forms(self.page.get_by_test_id("contact-account-promotion"),
+                                         [self.get_contact_form_fields(email, phone_number)])
+
+        # Fields which weren't found or can't be set at once are filled one by one
+        for _, field_name in missing_fields:
+            logger.info("Set contact info field one by one: %s", field_name)
+            if field_name == "email":
+                self.set_email(email)
+            else:
+                self.set_phone_number(phone_number)
+
+    @retryable
     def set_passenger_info(self, passenger_from_locator: Locator, first_name: str = None, last_name: str = None,
                            nationality: str = None, gender: str = None, date_of_birth: str = None,
                            passport_or_id: int = None, passport_or_id_exp_date: str = None):
@@ -77,23 +100,23 @@ class PassengerDetailsActions(BasePageActions):
                                                   ).get_by_placeholder("e.g. Brown").fill(last_name)
         # Select nationality
         if nationality is not None:
-            nationality_code = NATIONALITY_CODE_VALUE_MATCH.get(nationality)
+            nationality_code = COUNTRIES.get_code(nationality)
             passenger_from_locator.get_by_test_id("ReservationPassenger-nationality").select_option(nationality_code)
 
         # Select gender
         if gender is not None:
-            gender_code = GENDER_CODE_VALUE_MATCH.get(gender)
-            passenger_from_locator.locator(self.GENDER_FORM_INPUT).select_option(gender_code)
+            gender_code = GENDERS.get_code(gender)
+            SELECTORS.locator(passenger_from_locator, GENDER_FORM_INPUT).select_option(gender_code)
 
         # Select date of birth
         if date_of_birth is not None:
-            date_of_birth_input = passenger_from_locator.locator(self.DATE_OF_BIRTH_FORM_INPUT)
+            date_of_birth_input = SELECTORS.locator(passenger_from_locator, DATE_OF_BIRTH_FORM_INPUT)
             self.set_date_input(date_of_birth_input, *date_of_birth.split())
 
         # Enter passport number
         passenger_document = passenger_from_locator.get_by_test_id("ReservationPassengerDocument")
         if passport_or_id is not None:
-            passenger_document.locator(self.PASSPORT_OR_ID_FORM_INPUT).fill(str(passport_or_id))
+            SELECTORS.locator(passenger_document, PASSPORT_OR_ID_FORM_INPUT).fill(str(passport_or_id))
 
         # Enter passport expiration date
         if passport_or_id_exp_date is not None:
@@ -114,15 +137,39 @@ class PassengerDetailsActions(BasePageActions):
             passport_or_id_exp_date: passenger's passport or id expiration date,
                                      expected in following format: "day month_name year"
         """
-        logger.info(f"Set primary passenger info: {kwargs}")
-        self.set_passenger_info(self.primary_passenger_form, **kwargs)
+        # Values are personal data, so only names of set fields are logged
+        logger.info("Set primary passenger info: %s", ", ".join(kwargs))
+        self.set_passengers_info([kwargs])
+
+    @retryable
+    def set_passengers_info(self, passengers: List[dict], batched: bool = True) -> None:
+        """
+        Method provides setting personal information of several passengers at once. All independent fields of all
+        passenger forms are filled in a single round trip, fields which can't be filled this way (e.g. not rendered
+        yet) are filled one by one
+        :param passengers: list of passengers personal information, i-th item is set to i-th passenger form. Every item
+                           has the same keys as set_passenger_info arguments
+        :param batched: False - to fill all fields one by one
+        """
+        logger.info("Set personal info of %s passengers", len(passengers))
+        passenger_forms = self.page.get_by_test_id("ReservationPassenger")
+        if not batched:
+            for index, passenger in enumerate(passengers):
+                self.set_passenger_info(passenger_forms.nth(index), **passenger)
+            return
+
+        missing_fields = self.fill_forms(passenger_forms,
+                                         [self.get_passenger_form_fields(**passenger) for passenger in passengers])
+        for index, field_name in missing_fields:
+            logger.info("Set passenger %s info field one by one: %s", index + 1, field_name)
+            self.set_passenger_info(passenger_forms.nth(index), **{field_name: passengers[index][field_name]})
 
     def remove_passenger(self, passenger_number: int) -> None:
         """
         Method provides removing passenger from flight (remove passenger details card from the page)
         :param passenger_number: passenger ordinal number to remove
         """
-        logger.info(f"Remove {passenger_number} passenger")
+        logger.info("Remove %s passenger", passenger_number)
         # From ordinal number to index
         index = passenger_number - 1
 
@@ -136,15 +183,34 @@ class PassengerDetailsActions(BasePageActions):
         """
         logger.info("Click 'Continue'")
         self.page.get_by_test_id("StepControls-passengers-next").click()
-        self.wait_page_loaded()
+        self.wait_page_loaded("continue_next_page")
+
+    def reset_passengers_forms(self) -> None:
+        """
+        Method provides clearing contact and all passengers forms in a single round trip, so the same page can be filled
+        again
+        """
+        logger.info("Reset contact and passengers forms")
+        self.page.locator("[data-test='contact-account-promotion'], [data-test='ReservationPassenger']").evaluate_all(
+            self.RESET_FORMS_SCRIPT)
 
     def check_error_message_in_primary_passenger_passport_or_id_exp_date(self, expected_error: str) -> None:
         """
         Method verifies that expected error message appeared near passport expiration date form for the
         primary passenger
         """
-        logger.info(f"Check expected error message at primary passenger passport or id expiration date: "
-                    f"{expected_error}")
-        expect(self.primary_passenger_form.get_by_test_id("DatePickerField-switcher-text").locator(
-            self.ERROR_TOOLTIP), "Unexpected primary passenger passport or id expiration date"
-        ).to_contain_text(expected_error)
+        logger.info("Check expected error message at primary passenger passport or id expiration date: %s",
+                    expected_error)
+        date_picker = self.primary_passenger_form.get_by_test_id("DatePickerField-switcher-text")
+        expect(SELECTORS.locator(date_picker, ERROR_TOOLTIP),
+               "Unexpected primary passenger passport or id expiration date").to_contain_text(expected_error)
+
+    def check_no_error_message_in_primary_passenger_passport_or_id_exp_date(self) -> None:
+        """
+        Method verifies that there is no error message near passport expiration date form for the primary passenger
+        """
+        logger.info("Check there is no error message at primary passenger passport or id expiration date")
+        date_picker = self.primary_passenger_form.get_by_test_id("DatePickerField-switcher-text")
+        # Tooltip is expected to be absent, so it isn't probed
+        expect(SELECTORS.unprobed_locator(date_picker, ERROR_TOOLTIP),
+               "Unexpected primary passenger passport or id expiration date error").to_have_count(0)
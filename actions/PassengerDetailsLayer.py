@@ -0,0 +1,96 @@
+from typing import List
+
+from utils.code_tables import COUNTRIES, GENDERS
+from utils.selector_registry import SELECTORS, GENDER_FORM_INPUT, PASSPORT_OR_ID_FORM_INPUT, DATE_INPUT_GROUP
+
+
+class PassengerDetailsLayer:
+    """
+    Class contains selectors, scripts and batched form fields of passengers details page actions which don't query the
+    page, so sync and async actions share them and differ only in awaiting playwright calls
+    """
+    # Clears all fields of contact and passengers forms the same way user does, so app validation state is reset too
+    RESET_FORMS_SCRIPT = """forms => {
+        const valueSetters = {
+            INPUT: Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set,
+            SELECT: Object.getOwnPropertyDescriptor(HTMLSelectElement.prototype, "value").set,
+        };
+        forms.forEach(form => form.querySelectorAll("input:not([type=checkbox]):not([type=radio]), select")
+            .forEach(element => {
+                const value = element.tagName === "SELECT" && element.options.length ? element.options[0].value : "";
+                if (element.value === value) {
+                    return;
+                }
+                valueSetters[element.tagName].call(element, value);
+                element.dispatchEvent(new Event("input", {bubbles: true}));
+                element.dispatchEvent(new Event("change", {bubbles: true}));
+                element.dispatchEvent(new Event("blur"));
+            }));
+    }"""
+
+    @staticmethod
+    def get_contact_form_fields(email: str, phone_number: str) -> List[dict]:
+        """
+        Method provides batched form fields of contact info form
+        :param email: email to set in form
+        :param phone_number: phone number, expected in following format: "+country_code phone_number"
+        """
+        phone_country_code, phone = phone_number.split()
+        return [
+            {"name": "email", "selector": "[data-test='contact-email']", "value": email},
+            {"name": "phone_number", "selector": "[data-test='contact-phone-country']",
+             "value": COUNTRIES.get_code_by_dial_code(phone_country_code)},
+            {"name": "phone_number", "selector": "[data-test='contact-phone']", "value": phone},
+        ]
+
+    @staticmethod
+    def get_date_form_fields(name: str, date: str, scope: str, scope_text: str = None) -> List[dict]:
+        """
+        Method provides batched form fields of date input
+        :param name: field name
+        :param date: date, expected in following format: "day month_name year"
+        :param scope: css selector of date input container
+        :param scope_text: exact text of span inside date input container
+        """
+        day, month, year = date.split()
+        return [
+            {"name": name, "scope": scope, "scopeText": scope_text, "selector": "[data-test='day']", "value": day},
+            {"name": name, "scope": scope, "scopeText": scope_text, "selector": "[data-test='month']", "value": month,
+             "byLabel": True},
+            {"name": name, "scope": scope, "scopeText": scope_text, "selector": "[data-test='year']", "value": year},
+        ]
+
+    @classmethod
+    def get_passenger_form_fields(cls, first_name: str = None, last_name: str = None, nationality: str = None,
+                                  gender: str = None, date_of_birth: str = None, passport_or_id: int = None,
+                                  passport_or_id_exp_date: str = None) -> List[dict]:
+        """
+        Method provides batched form fields of passenger's personal information form. Fields with None value are
+        skipped. Arguments are the same as in PassengerDetailsActions.set_passenger_info
+        """
+        fields = []
+        if first_name is not None:
+            fields.append({"name": "first_name", "scope": "[data-test='ReservationPassenger-FirstName']",
+                           "selector": "input[placeholder='e.g. Harry James']", "value": first_name})
+        if last_name is not None:
+            fields.append({"name": "last_name", "scope": "[data-test='ReservationPassenger-LastName']",
+                           "selector": "input[placeholder='e.g. Brown']", "value": last_name})
+        if nationality is not None:
+            fields.append({"name": "nationality", "selector": "[data-test='ReservationPassenger-nationality']",
+                           "value": COUNTRIES.get_code(nationality)})
+        if gender is not None:
+            fields.append({"name": "gender", "selector": SELECTORS.css(GENDER_FORM_INPUT),
+                           "value": GENDERS.get_code(gender)})
+        if date_of_birth is not None:
+            fields.extend(cls.get_date_form_fields("date_of_birth", date_of_birth, SELECTORS.css(DATE_INPUT_GROUP),
+                                                   "Date of birth"))
+        if passport_or_id is not None:
+            passport_or_id_selector = SELECTORS.css(PASSPORT_OR_ID_FORM_INPUT)
+            fields.append({"name": "passport_or_id",
+                           "selector": f"[data-test='ReservationPassengerDocument'] {passport_or_id_selector}",
+                           "value": str(passport_or_id)})
+        if passport_or_id_exp_date is not None:
+            fields.extend(cls.get_date_form_fields(
+                "passport_or_id_exp_date", passport_or_id_exp_date,
+                "[data-test='ReservationPassengerDocument'] [data-test='DatePickerField-switcher-text']"))
+        return fields
@@ -1,9 +1,14 @@
 import logging
+from typing import Iterable, List
+from urllib.parse import parse_qs, urlsplit
 
 from playwright.sync_api import Locator, expect
 
 from utils.constants import StopsFilterValues, ExcludeCountriesFilterValues
 from actions.BasePageActions import BasePageActions, BaseModalActions
+from utils.search_results import EXTRACT_RESULTS_SCRIPT, MORE_RESULTS_SCRIPT, SearchResult, to_search_results
+from utils.search_url import build_search_results_url
+from utils.selector_registry import SELECTORS, LAYOVER_DETAILS_CONTAINER, FILTER_TITLE
 
 logger = logging.getLogger(__name__)
 
@@ -22,17 +27,16 @@ class LogInModalActions(BaseModalActions):
 
 class FlightDetailsModalActions(BaseModalActions):
     """Class contains actions for flight details modal card"""
-    LAYOVER_DETAILS_CONTAINER = "xpath=//div[contains(@class, 'SectorStopstyled__SectorFlightLayover')]"
 
     def check_number_of_transfers(self, expected_number: int) -> None:
         """
         Method verifies actual number of transfers for each part of the trip matches with expected one
         :param expected_number: expected number of transfers
         """
-        logger.info(f"Check number of transfers is {expected_number}")
+        logger.info("Check number of transfers is %s", expected_number)
         full_trip_parts = self.modal_window.get_by_test_id("TripPopupWrapper").all()
         for trip_part_name, trip_part_data in zip(["Trip from", "Trip to"], full_trip_parts):
-            expect(trip_part_data.locator(self.LAYOVER_DETAILS_CONTAINER),
+            expect(SELECTORS.locator(trip_part_data, LAYOVER_DETAILS_CONTAINER),
                    f'Unexpected number of layovers for {trip_part_name}').to_have_count(expected_number)
 
     def click_select_button(self) -> LogInModalActions:
@@ -50,29 +54,60 @@ class FlightDetailsModalActions(BaseModalActions):
 
 class SearchResultsActions(BasePageActions):
     """Class contains actions for search flight results page"""
-    FILTER_TITLE = "xpath=//div[contains(@class, 'Slide__StyledSlide')]"
+
+    def open_search_results(self, base_url: str, from_address: str, to_address: str, departure_date: str,
+                            return_date: str = None, adults: int = 1, children: int = 0, infants: int = 0,
+                            cabin_bags: int = 0, checked_bags: int = 0, stops: StopsFilterValues = None,
+                            exclude_countries: Iterable[ExcludeCountriesFilterValues] = ()) -> None:
+        """
+        Method provides opening search results page directly by url, without filling search flight form. Parameters are
+        the same as values set in the form and filters, see build_search_results_url
+        :param base_url: url of application home page
+        """
+        url = build_search_results_url(base_url, from_address, to_address, departure_date, return_date, adults,
+                                       children, infants, cabin_bags, checked_bags, stops, exclude_countries)
+        logger.info("Open search results: %s", url)
+        self.page.goto(url)
+        self.close_modal()
+        expect(self.page.get_by_test_id("ResultList-results"), "Results wasn't loaded").to_be_visible()
+        self.wait_page_loaded("open_search_results")
+
+    def check_search_results_url(self, expected_url: str) -> None:
+        """
+        Method verifies that search results page shows the same search as the url: path and all query parameters of
+        expected url are the same in page url, page url can have additional parameters
+        :param expected_url: url of search results, see build_search_results_url
+        """
+        logger.info("Check search results url matches: %s", expected_url)
+        actual = urlsplit(self.page.url)
+        expected = urlsplit(expected_url)
+        assert actual.path == expected.path, f"Search results path is {actual.path}, expected: {expected.path}"
+        actual_query = parse_qs(actual.query)
+        mismatched = {name: (actual_query.get(name), value) for name, value in parse_qs(expected.query).items()
+                      if actual_query.get(name) != value}
+        assert not mismatched, f"Search results query parameters differ (actual, expected): {mismatched}"
 
     def open_filter(self, filter_locator: Locator) -> None:
         """
         Method provides opening filter on the search result page if it is closed
         :param filter_locator: locator object with expected filter to be opened
         """
-        is_hidden = filter_locator.locator(self.FILTER_TITLE).is_hidden()
-        if is_hidden:
+        filter_title = SELECTORS.locator(filter_locator, FILTER_TITLE)
+        if filter_title.is_hidden():
             # If filter is closed it is needed to be opened
             filter_locator.get_by_role('button').first.click()
-            expect(filter_locator.locator(self.FILTER_TITLE), "Filter wasn't opened").not_to_be_hidden()
+            expect(filter_title, "Filter wasn't opened").not_to_be_hidden()
 
     def set_stops_filter(self, filter_value: StopsFilterValues) -> None:
         """
         Method provides setting stops filter values on search results page
         :param filter_value: expected value to set
         """
-        logger.info(f"Set stops filter value: {filter_value}")
+        logger.info("Set stops filter value: %s", filter_value)
         stops_filter = self.page.get_by_test_id("FilterHeader-stops")
         self.open_filter(stops_filter)
         stops_filter.locator(f"xpath=//span[text()='{filter_value.value}']").click()
-        self.wait_page_loaded()
+        self.wait_page_loaded("stops_filter")
 
     def set_exclude_country_filter(self, filter_value: ExcludeCountriesFilterValues, with_search: bool = True) -> None:
         """
@@ -80,7 +115,7 @@ class SearchResultsActions(BasePageActions):
         :param filter_value: expected value to set
         :param with_search: True - to search filter value before selecting
         """
-        logger.info(f"Set exclude country filter value: {filter_value}")
+        logger.info("Set exclude country filter value: %s", filter_value)
         exclude_countries_filter = self.page.get_by_test_id("FilterHeader-countries")
         self.open_filter(exclude_countries_filter)
         if with_search:
@@ -92,7 +127,63 @@ class SearchResultsActions(BasePageActions):
         else:
             exclude_countries_filter.locator("xpath=//label").filter(has_text=filter_value.value).click()
 
-        self.wait_page_loaded()
+        self.wait_page_loaded("exclude_country_filter")
+
+    def load_more_results(self) -> None:
+        """
+        Method provides clicking "Load more" button under search results and waiting for the next results page
+        """
+        logger.info("Load more results")
+        self.page.get_by_test_id("ResultsMoreButton").click()
+        self.wait_page_loaded("load_more_results")
+
+    def get_results(self, max_results: int = None) -> List[SearchResult]:
+        """
+        Method provides records of search result cards: price, duration, stops, carriers and layover countries. All
+        cards of loaded results page are read in a single evaluation, then "Load more" is clicked and new cards are
+        awaited while there are more results
+        :param max_results: max number of results to read, None - read all results
+        :return: results in the order they are displayed
+        """
+        results_container = self.page.get_by_test_id("ResultList-results")
+        results = []
+        while max_results is None or len(results) < max_results:
+            extracted = results_container.evaluate(EXTRACT_RESULTS_SCRIPT, len(results))
+            results.extend(to_search_results(extracted["rows"]))
+            if not extracted["hasMore"]:
+                break
+            self.load_more_results()
+            # Next page may be rendered after the page is loaded, paging is finished only when the button disappears
+            self.page.wait_for_function(MORE_RESULTS_SCRIPT, arg=len(results))
+
+        logger.info("Read %s search results", len(results))
+        return results[:max_results]
+
+    def check_results_max_stops(self, results: List[SearchResult], max_stops: int) -> None:
+        """
+        Method verifies that none of search results has more than max number of stops
+        :param results: search results, see get_results
+        :param max_stops: max expected number of stops
+        """
+        logger.info("Check %s results have at most %s stops", len(results), max_stops)
+        unexpected = [result.flight_id for result in results if result.stops is None or result.stops > max_stops]
+        assert not unexpected, f"Results with more than {max_stops} stops: {unexpected}"
+
+    def check_results_exclude_layover_countries(self, results: List[SearchResult],
+                                                countries: Iterable[ExcludeCountriesFilterValues]) -> None:
+        """
+        Method verifies that none of search results has layover in excluded countries
+        :param results: search results, see get_results
+        :param countries: excluded countries
+        """
+        excluded = {country.value for country in countries}
+        logger.info("Check %s results have no layovers in %s", len(results), excluded)
+        # Result without stops or with fewer layover countries than stops can't be checked, it isn't passed silently
+        unread = [result.flight_id for result in results
+                  if result.stops is None or len(result.layover_countries) < result.stops]
+        assert not unread, f"Layover countries of results aren't read: {unread}"
+        unexpected = [result.flight_id for result in results if excluded.intersection(result.layover_countries)]
+        assert not unexpected, f"Results with layovers in {excluded}: {unexpected}"
 
     def select_first_flight(self) -> FlightDetailsModalActions:
         """
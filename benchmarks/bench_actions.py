@@ -0,0 +1,268 @@
+import datetime
+import json
+import logging
+import os
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from playwright.sync_api import sync_playwright, Page
+
+from actions.MainPageActions import MainPageActions
+from actions.PassengerDetailsActions import PassengerDetailsActions
+from actions.SearchResultsActions import SearchResultsActions
+from definitions import PASSENGER_PERSONAL_INFO_FILE
+from utils.constants import StopsFilterValues, ExcludeCountriesFilterValues
+from utils.readiness import READINESS
+from utils.resource_guard import get_browser_rss
+from utils.step_timing import STEP_TIMER, percentile
+from utils.utils import get_json_file_content
+
+logger = logging.getLogger(__name__)
+
+# Records baselines of all actions seeded with null in baselines file, run it on CI machine and commit the file
+BOOTSTRAP_COMMAND = "python -m benchmarks.bench_actions --iterations 20 --update-baseline"
+
+SEARCH = {"from_address": "New York, United States", "to_address": "Barcelona, Spain"}
+PASSENGER_INFO = get_json_file_content(PASSENGER_PERSONAL_INFO_FILE)
+
+
+class ActionBenchmark(NamedTuple):
+    name: str
+    # Brings page to the state the action starts from, isn't timed: (page, home page url)
+    setup: Callable[[Page, str], None]
+    # Timed action
+    action: Callable[[Page], None]
+
+
+def get_month_date(months_ahead: int, day: int) -> str:
+    """
+    Function provides date of the month counted from current one in "day month year" format, so date picker is moved
+    by the same number of months whenever benchmark is run
+    """
+    today = datetime.date.today()
+    month_index = today.month - 1 + months_ahead
+    date = datetime.date(today.year + month_index // 12, month_index % 12 + 1, day)
+    return f"{date.day} {date.strftime('%B %Y')}"
+
+
+def open_home(page: Page, url: str) -> None:
+    page.goto(url)
+    MainPageActions(page).close_modal()
+
+
+def open_results(page: Page, url: str) -> None:
+    SearchResultsActions(page).open_search_results(url, departure_date=get_month_date(1, 1),
+                                                   return_date=get_month_date(1, 15), **SEARCH)
+
+
+def open_booking(page: Page, url: str) -> None:
+    page.goto(f"{url}en/booking?adults=1")
+    PassengerDetailsActions(page).wait_passenger_forms_opened()
+
+
+def open_and_close_flight_details(page: Page) -> None:
+    SearchResultsActions(page).select_first_flight().click_close_modal()
+
+
+def set_passenger_info(page: Page, batched: bool) -> None:
+    PassengerDetailsActions(page).set_passengers_info([PASSENGER_INFO], batched=batched)
+
+
+BENCHMARKS = [
+    ActionBenchmark("set_address", open_home,
+                    lambda page: MainPageActions(page).set_to_address(SEARCH["to_address"])),
+    ActionBenchmark("set_dates", open_home,
+                    lambda page: MainPageActions(page).set_dates(get_month_date(2, 1), get_month_date(2, 15))),
+    ActionBenchmark("set_number_of_passengers", open_home,
+                    lambda page: MainPageActions(page).set_number_of_passengers(3)),
+    ActionBenchmark("set_stops_filter", open_results,
+                    lambda page: SearchResultsActions(page).set_stops_filter(StopsFilterValues.ONE_STOP)),
+    ActionBenchmark("set_exclude_country_filter", open_results,
+                    lambda page: SearchResultsActions(page).set_exclude_country_filter(
+                        ExcludeCountriesFilterValues.UK)),
+    ActionBenchmark("flight_details_modal", open_results, open_and_close_flight_details),
+    ActionBenchmark("set_passenger_info", open_booking, lambda page: set_passenger_info(page, batched=False)),
+    ActionBenchmark("set_passenger_info_batched", open_booking, lambda page: set_passenger_info(page, batched=True)),
+]
+
+
+def run_action_benchmark(page: Page, url: str, benchmark: ActionBenchmark, iterations: int) -> dict:
+    """
+    Function provides latency, round trips and memory of the action: Python allocations peak and growth of resident
+    memory of browser processes. Every iteration starts from fresh setup, memory is measured in one extra iteration
+    only, so tracing doesn't slow down timed iterations
+    :param page: page to run the action in
+    :param url: home page url of mock site
+    :param benchmark: action to measure
+    :param iterations: number of timed iterations, one more warm up iteration isn't counted
+    """
+    wall = []
+    round_trips = []
+    for iteration in range(iterations + 1):
+        benchmark.setup(page, url)
+        start_round_trips = STEP_TIMER.round_trips
+        start = time.perf_counter()
+        benchmark.action(page)
+        if iteration:
+            wall.append((time.perf_counter() - start) * 1000)
+            round_trips.append(STEP_TIMER.round_trips - start_round_trips)
+
+    benchmark.setup(page, url)
+    browser_rss_before = get_browser_rss()
+    tracemalloc.start()
+    try:
+        benchmark.action(page)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    browser_rss_after = get_browser_rss()
+
+    return {
+        "wall_p50_ms": round(percentile(wall, 50), 2),
+        "wall_p95_ms": round(percentile(wall, 95), 2),
+        "wall_min_ms": round(min(wall), 2),
+        "wall_max_ms": round(max(wall), 2),
+        "round_trips_p50": percentile(round_trips, 50),
+        "python_peak_kb": round(peak / 1024, 1),
+        "browser_rss_growth_kb": round((browser_rss_after - browser_rss_before) / 1024, 1),
+        "browser_rss_mb": round(browser_rss_after / 1024 / 1024, 1),
+    }
+
+
+def run_benchmarks(url: str, benchmarks: List[ActionBenchmark], iterations: int,
+                   launch_options: dict) -> Dict[str, dict]:
+    """
+    Function provides measurements of every action in a fresh context of one browser
+    :param url: home page url of mock site
+    :param benchmarks: actions to measure
+    :param iterations: number of timed iterations of every action
+    :param launch_options: arguments of browser launch, see ExecutionProfile.launch_options
+    """
+    results = {}
+    with sync_playwright() as playwright:
+        playwright.selectors.set_test_id_attribute("data-test")
+        browser = playwright.chromium.launch(**launch_options)
+        try:
+            for benchmark in benchmarks:
+                context = browser.new_context()
+                READINESS.install(context)
+                try:
+                    results[benchmark.name] = run_action_benchmark(context.new_page(), url, benchmark, iterations)
+                finally:
+                    context.close()
+                logger.info("%s: %s", benchmark.name, results[benchmark.name])
+        finally:
+            browser.close()
+    return results
+
+
+def load_baselines(file_path: str) -> Dict[str, Optional[dict]]:
+    """
+    Function provides stored baselines of actions, empty if there are no baselines yet. Action seeded with null
+    baseline is covered by the gate, but its baseline isn't recorded yet
+    """
+    if not os.path.exists(file_path):
+        return {}
+
+    with open(file_path) as file:
+        return json.load(file)
+
+
+def find_regressions(results: Dict[str, dict], baselines: Dict[str, Optional[dict]], threshold: float,
+                     noise_floor_ms: float, allow_missing_baseline: bool = False) -> List[str]:
+    """
+    Function provides descriptions of actions which became slower than baseline: p50 latency grew by more than
+    threshold share and by more than noise floor, or p50 number of round trips grew. Action missing in baselines file
+    is reported too, so a new action can't pass the gate unnoticed. Action seeded with null baseline is only warned
+    about until its baseline is recorded
+    :param results: current measurements {action name: stats}
+    :param baselines: stored measurements {action name: stats}
+    :param threshold: allowed relative growth of p50 latency, e.g. 0.2
+    :param noise_floor_ms: latency growth in milliseconds which is never reported
+    :param allow_missing_baseline: True - actions without baseline are skipped
+    """
+    regressions = []
+    for name, stats in results.items():
+        if name not in baselines:
+            if allow_missing_baseline:
+                logger.info("There is no baseline of %s", name)
+            else:
+                regressions.append(f"{name}: there is no baseline, run with --update-baseline and commit it")
+            continue
+
+        baseline = baselines[name]
+        if baseline is None:
+            logger.warning("Baseline of %s isn't recorded yet: %s", name, BOOTSTRAP_COMMAND)
+            continue
+
+        growth = stats["wall_p50_ms"] - baseline["wall_p50_ms"]
+        if growth > noise_floor_ms and stats["wall_p50_ms"] > baseline["wall_p50_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p50 {stats['wall_p50_ms']:.1f} ms, baseline {baseline['wall_p50_ms']:.1f} ms")
+        if stats["round_trips_p50"] > baseline["round_trips_p50"]:
+            regressions.append(f"{name}: {stats['round_trips_p50']} round trips, baseline "
+                               f"{baseline['round_trips_p50']}")
+    return regressions
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from definitions import MOCK_SITE_DIR, BENCHMARK_BASELINES_FILE
+    from utils.constants import BENCHMARK_ITERATIONS, BENCHMARK_THRESHOLD, BENCHMARK_NOISE_FLOOR_MS
+    from utils.execution_profiles import EXECUTION_PROFILES, get_execution_profile
+    from utils.mock_server import MockServer
+    from utils.step_retry import STEP_RETRY
+    from utils.step_timing import install_playwright_probes
+
+    parser = argparse.ArgumentParser(description="Measure framework overhead of every action on local mock site and "
+                                                 "compare it with stored baselines")
+    parser.add_argument("--actions", nargs="+", choices=[benchmark.name for benchmark in BENCHMARKS],
+                        help="Actions to measure, all by default")
+    parser.add_argument("--iterations", type=int, default=BENCHMARK_ITERATIONS)
+    parser.add_argument("--threshold", type=float, default=BENCHMARK_THRESHOLD,
+                        help="Allowed relative growth of p50 latency")
+    parser.add_argument("--noise-floor", type=float, default=BENCHMARK_NOISE_FLOOR_MS,
+                        help="Growth of p50 latency in milliseconds which is never reported")
+    parser.add_argument("--profile", default="ci", choices=list(EXECUTION_PROFILES))
+    parser.add_argument("--update-baseline", action="store_true",
+                        help=f"Store measurements of measured actions to {BENCHMARK_BASELINES_FILE}")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="Don't fail on actions without baseline, e.g. while a new action is developed")
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    install_playwright_probes()
+    # Failed action should fail the benchmark, not be measured with retries
+    STEP_RETRY.max_retries = 0
+
+    selected = [benchmark for benchmark in BENCHMARKS if not arguments.actions or benchmark.name in arguments.actions]
+    mock_server = MockServer(MOCK_SITE_DIR)
+    mock_server.start()
+    try:
+        measurements = run_benchmarks(mock_server.url, selected, arguments.iterations,
+                                      get_execution_profile(arguments.profile).launch_options())
+    finally:
+        mock_server.stop()
+
+    baselines = load_baselines(BENCHMARK_BASELINES_FILE)
+    print(f"{'action':<30}{'p50, ms':>10}{'p95, ms':>10}{'baseline p50':>14}{'round trips':>13}{'python peak, KB':>17}"
+          f"{'browser RSS growth, KB':>24}")
+    for action_name, action_stats in measurements.items():
+        baseline_p50 = (baselines.get(action_name) or {}).get("wall_p50_ms")
+        print(f"{action_name:<30}{action_stats['wall_p50_ms']:>10.1f}{action_stats['wall_p95_ms']:>10.1f}"
+              f"{baseline_p50 if baseline_p50 is not None else '-':>14}{action_stats['round_trips_p50']:>13}"
+              f"{action_stats['python_peak_kb']:>17.1f}{action_stats['browser_rss_growth_kb']:>24.1f}")
+
+    if arguments.update_baseline:
+        with open(BENCHMARK_BASELINES_FILE, 'w') as baselines_file:
+            json.dump(dict(sorted({**baselines, **measurements}.items())), baselines_file, indent=4)
+        print(f"Baselines are stored to {BENCHMARK_BASELINES_FILE}")
+        sys.exit(0)
+
+    found_regressions = find_regressions(measurements, baselines, arguments.threshold, arguments.noise_floor,
+                                         arguments.allow_missing_baseline)
+    for regression in found_regressions:
+        print(f"Regression: {regression}")
+    sys.exit(1 if found_regressions else 0)
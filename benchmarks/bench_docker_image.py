@@ -0,0 +1,97 @@
+import logging
+import re
+import statistics
+import subprocess
+import time
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Verbose pytest output line with outcome of a test
+TEST_OUTCOME_PATTERN = re.compile(r" (PASSED|FAILED|ERROR|SKIPPED)\b")
+
+
+def build_image(dockerfile: str, tag: str, context_dir: str = ".") -> float:
+    """
+    Function provides building docker image without build cache
+    :param dockerfile: path to Dockerfile
+    :param tag: tag of built image
+    :param context_dir: build context directory
+    :return: seconds of the build
+    """
+    start = time.perf_counter()
+    subprocess.run(["docker", "build", "--no-cache", "-f", dockerfile, "-t", tag, context_dir], check=True,
+                   stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def get_image_size(tag: str) -> int:
+    """Function provides size of docker image in bytes"""
+    output = subprocess.run(["docker", "image", "inspect", "-f", "{{.Size}}", tag], check=True, capture_output=True,
+                            text=True).stdout
+    return int(output.strip())
+
+
+def measure_first_test(tag: str, test: str) -> float:
+    """
+    Function provides seconds from container start until outcome of the first test is printed. Every image is run
+    headless with ci profile, so images without display or with other defaults are compared on equal terms
+    :param tag: tag of image to run
+    :param test: pytest node id of the test, it is run against local mock server
+    """
+    command = ["docker", "run", "--rm", "-e", "HEADLESS=1", "-e", "EXECUTION_PROFILE=ci", tag,
+               "pytest", "-v", "-p", "no:cacheprovider", "--mock-server", test]
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+        for line in process.stdout:
+            if TEST_OUTCOME_PATTERN.search(line):
+                return time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+    raise RuntimeError(f"Test {test} wasn't run in {tag} container")
+
+
+def run_benchmark(dockerfiles: Dict[str, str], test: str, runs: int) -> Dict[str, Dict[str, float]]:
+    """
+    Function provides size, build time and median container start to first test time of every image
+    :param dockerfiles: paths to Dockerfiles by image names
+    :param test: pytest node id of the test to run
+    :param runs: number of container starts of every image
+    :return: {image name: {"size_mb": ..., "build_seconds": ..., "first_test_seconds": ...}}
+    """
+    results = {}
+    for name, dockerfile in dockerfiles.items():
+        tag = f"kiwi-autotests-bench:{name}"
+        build_seconds = build_image(dockerfile, tag)
+        first_test: List[float] = []
+        for run in range(runs):
+            first_test.append(measure_first_test(tag, test))
+            logger.info("Image %s, run %s/%s: first test in %.2f s", name, run + 1, runs, first_test[-1])
+
+        results[name] = {"size_mb": get_image_size(tag) / 1024 / 1024, "build_seconds": build_seconds,
+                         "first_test_seconds": statistics.median(first_test)}
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare size and container start to first test time of docker "
+                                                 "images built from several Dockerfiles")
+    parser.add_argument("dockerfiles", nargs="+", metavar="NAME=DOCKERFILE",
+                        help="Dockerfiles to compare, e.g. before=/tmp/Dockerfile.before after=Dockerfile")
+    parser.add_argument("--test", default="tests/test_SearchResults.py",
+                        help="Test run against local mock server to measure time to the first test")
+    parser.add_argument("--runs", type=int, default=3, help="Number of container starts of every image")
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    images = dict(argument.split("=", 1) for argument in arguments.dockerfiles)
+    results = run_benchmark(images, arguments.test, arguments.runs)
+
+    print(f"{'image':<12}{'size, MB':>10}{'build, s':>10}{'start to first test, s':>25}")
+    for image_name, result in results.items():
+        print(f"{image_name:<12}{result['size_mb']:>10.0f}{result['build_seconds']:>10.0f}"
+              f"{result['first_test_seconds']:>25.2f}")
@@ -0,0 +1,83 @@
+import logging
+import statistics
+import time
+from typing import Dict, List
+
+from playwright.sync_api import sync_playwright, Playwright
+
+from utils.execution_profiles import ExecutionProfile
+from utils.resource_guard import get_browser_rss
+
+logger = logging.getLogger(__name__)
+
+
+def measure_profile(playwright: Playwright, profile: ExecutionProfile, url: str) -> Dict[str, float]:
+    """
+    Function provides one measurement of the profile: seconds from browser launch until the first page is loaded
+    and resident memory of browser processes with this page opened
+    :param playwright: started sync playwright
+    :param profile: execution profile to launch browser with
+    :param url: url of the first page
+    """
+    start = time.perf_counter()
+    browser = playwright.chromium.launch(**profile.launch_options())
+    try:
+        context = browser.new_context(**profile.context_options())
+        page = context.new_page()
+        page.goto(url, wait_until="load")
+        seconds = time.perf_counter() - start
+        rss = get_browser_rss()
+    finally:
+        browser.close()
+
+    return {"seconds": seconds, "rss_mb": rss / 1024 / 1024}
+
+
+def run_benchmark(profiles: List[ExecutionProfile], url: str, runs: int) -> Dict[str, Dict[str, float]]:
+    """
+    Function provides median launch to first page time and memory of every profile
+    :param profiles: profiles to compare
+    :param url: url of the first page
+    :param runs: number of measurements of every profile, profiles are measured in turns
+    :return: {profile name: {"seconds": median seconds, "rss_mb": median megabytes}}
+    """
+    measurements = {profile.name: [] for profile in profiles}
+    with sync_playwright() as playwright:
+        for run in range(runs):
+            for profile in profiles:
+                measurement = measure_profile(playwright, profile, url)
+                logger.info("Run %s/%s, profile %s: %.3f s, %.0f MB", run + 1, runs, profile.name,
+                            measurement["seconds"], measurement["rss_mb"])
+                measurements[profile.name].append(measurement)
+
+    return {name: {metric: statistics.median(measurement[metric] for measurement in profile_measurements)
+                   for metric in ("seconds", "rss_mb")}
+            for name, profile_measurements in measurements.items()}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from definitions import MOCK_SITE_DIR
+    from utils.execution_profiles import EXECUTION_PROFILES, get_execution_profile
+    from utils.mock_server import MockServer
+
+    parser = argparse.ArgumentParser(description="Compare launch to first page time and browser memory of execution "
+                                                 "profiles on local mock site")
+    parser.add_argument("--profiles", nargs="+", default=list(EXECUTION_PROFILES), choices=list(EXECUTION_PROFILES))
+    parser.add_argument("--runs", type=int, default=5, help="Number of measurements of every profile")
+    parser.add_argument("--headless", action="store_true", help="Run every profile headless, e.g. without display")
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    mock_server = MockServer(MOCK_SITE_DIR)
+    mock_server.start()
+    try:
+        results = run_benchmark([get_execution_profile(name, headless=True if arguments.headless else None)
+                                 for name in arguments.profiles], mock_server.url, arguments.runs)
+    finally:
+        mock_server.stop()
+
+    print(f"{'profile':<10}{'launch to first page, s':>26}{'browser RSS, MB':>18}")
+    for name, result in results.items():
+        print(f"{name:<10}{result['seconds']:>26.3f}{result['rss_mb']:>18.0f}")
@@ -1,15 +1,462 @@
+import contextlib
+import logging
 import os
 
 import pytest
 from playwright.sync_api import sync_playwright
 
+from definitions import HAR_STORE_DIR, ARTIFACTS_DIR, TEST_DURATIONS_FILE, MOCK_SITE_DIR
+from utils.browser_pool import BrowserPool
+from utils.checkpoints import CheckpointStore
+from utils.constants import (BASE_URL, BROWSER_POOL_SIZE, BROWSER_RECYCLE_AFTER_TESTS, HAR_STORE_VERSION, NetworkMode,
+                             BLOCKED_RESOURCE_TYPES, BLOCKED_DOMAINS, ALLOWED_DOMAINS, TRACKER_DOMAINS,
+                             CHECKPOINT_MAX_AGE, FAILURE_ARTIFACTS_MAX_COUNT, FAILURE_ARTIFACTS_MAX_SIZE_MB,
+                             FLOW_CONCURRENCY, EXECUTION_PROFILE, STEP_RETRIES, STEP_RETRY_BACKOFF, LOG_MAX_SIZE_MB,
+                             LOG_BACKUP_COUNT, LEAK_GUARD_RSS_THRESHOLD_MB, LEAK_GUARD_SETTLE_TIMEOUT)
+from utils.execution_profiles import EXECUTION_PROFILES, get_execution_profile
+from utils.failure_artifacts import FailureArtifacts
+from utils.flow_runner import FlowBrowser, FlowRunner
+from utils.har_store import HarStore
+from utils.mock_server import MockServer
+from utils.network_policy import NetworkPolicy, NetworkStats
+from utils.readiness import READINESS
+from utils.resource_guard import RESOURCE_GUARD
+from utils.selector_registry import SELECTORS
+from utils.step_retry import STEP_RETRY
+from utils.step_timing import STEP_TIMER, install_playwright_probes
+from utils.structured_logging import StructuredLogRecord, JsonLinesLog, correlation_scope
+from utils.scheduling import load_durations, store_durations, get_weights, order_by_duration, split_to_shards
 
-@pytest.fixture
-def browser():
+logger = logging.getLogger(__name__)
+
+# Durations of tests executed in this session: {node_id: seconds of setup, call and teardown}
+TEST_DURATIONS = {}
+# Node ids of tests failed in this session
+FAILED_TESTS = set()
+
+
+def get_worker_id() -> str:
+    """Function provides xdist worker id of current process, "main" - if tests are not run in parallel"""
+    return os.getenv("PYTEST_XDIST_WORKER", "main")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("kiwi", "kiwi.com autotests")
+    group.addoption("--execution-profile", default=os.getenv("EXECUTION_PROFILE", EXECUTION_PROFILE),
+                    choices=list(EXECUTION_PROFILES),
+                    help="debug - headed slowed down browser, ci - headless browser, perf - headless browser with "
+                         "startup and memory optimized flags and reduced viewport")
+    group.addoption("--browser-pool-size", type=int, default=int(os.getenv("BROWSER_POOL_SIZE", BROWSER_POOL_SIZE)),
+                    help="Number of browsers kept running for the whole session (per xdist worker)")
+    group.addoption("--browser-recycle-after", type=int,
+                    default=int(os.getenv("BROWSER_RECYCLE_AFTER_TESTS", BROWSER_RECYCLE_AFTER_TESTS)),
+                    help="Relaunch pooled browser after this number of tests, 0 - never relaunch")
+    group.addoption("--network-mode", default=os.getenv("NETWORK_MODE", NetworkMode.LIVE.value),
+                    choices=[mode.value for mode in NetworkMode],
+                    help="live - use real network, record - save traffic to HAR store, replay - serve traffic from "
+                         "HAR store without network")
+    group.addoption("--har-version", default=os.getenv("HAR_STORE_VERSION", HAR_STORE_VERSION),
+                    help="Version of HAR store recordings to record or replay")
+    group.addoption("--network-policy", default=os.getenv("NETWORK_POLICY", "on"), choices=["on", "off"],
+                    help="on - block heavy resources and stub trackers, off - only collect network statistics")
+    group.addoption("--mock-server", action="store_true", default=bool(int(os.getenv("MOCK_SERVER", 0))),
+                    help="Run tests against local stand-in of kiwi.com instead of the real site")
+    group.addoption("--mock-latency", type=int, default=int(os.getenv("MOCK_LATENCY", 0)),
+                    help="Milliseconds every mock server response is delayed")
+    group.addoption("--mock-api-latency", type=int, default=int(os.getenv("MOCK_API_LATENCY", 0)),
+                    help="Additional milliseconds mock server search API responses are delayed")
+    group.addoption("--checkpoints", default=os.getenv("CHECKPOINTS", "on"), choices=["on", "off"],
+                    help="on - start tests from saved navigation checkpoints, off - always pass whole flow")
+    group.addoption("--checkpoint-max-age", type=float,
+                    default=float(os.getenv("CHECKPOINT_MAX_AGE", CHECKPOINT_MAX_AGE)),
+                    help="Seconds after which saved checkpoint is stale")
+    group.addoption("--failure-artifacts", default=os.getenv("FAILURE_ARTIFACTS", "on"), choices=["on", "off"],
+                    help="on - trace every context and keep trace, screenshots and DOM of failed tests")
+    group.addoption("--failure-artifacts-max-count", type=int,
+                    default=int(os.getenv("FAILURE_ARTIFACTS_MAX_COUNT", FAILURE_ARTIFACTS_MAX_COUNT)),
+                    help="Max number of failed tests artifacts kept by every pytest process")
+    group.addoption("--failure-artifacts-max-size", type=int,
+                    default=int(os.getenv("FAILURE_ARTIFACTS_MAX_SIZE_MB", FAILURE_ARTIFACTS_MAX_SIZE_MB)),
+                    help="Max total size in megabytes of failed tests artifacts kept by every pytest process")
+    group.addoption("--step-retries", type=int, default=int(os.getenv("STEP_RETRIES", STEP_RETRIES)),
+                    help="Max number of retries of failed action step, 0 - steps are not retried")
+    group.addoption("--step-retry-backoff", type=float,
+                    default=float(os.getenv("STEP_RETRY_BACKOFF", STEP_RETRY_BACKOFF)),
+                    help="Seconds to wait before the first retry of failed step, doubled before every next retry")
+    group.addoption("--flow-concurrency", type=int, default=int(os.getenv("FLOW_CONCURRENCY", FLOW_CONCURRENCY)),
+                    help="Max number of async flows run at the same time by flow runner")
+    group.addoption("--leak-guard", default=os.getenv("LEAK_GUARD", "on"), choices=["on", "off"],
+                    help="on - sample browser memory and renderer processes around every test and flag leaking tests")
+    group.addoption("--leak-threshold", type=float,
+                    default=float(os.getenv("LEAK_GUARD_RSS_THRESHOLD_MB", LEAK_GUARD_RSS_THRESHOLD_MB)),
+                    help="Growth of browser memory in megabytes during one test it is flagged as leaking after")
+    group.addoption("--log-mode", default=os.getenv("LOG_MODE", "text"), choices=["text", "json"],
+                    help="text - INFO records to live console and pytest.log, json - only warnings to live console, "
+                         "all records to JSON-lines log written by background thread")
+    group.addoption("--log-max-size", type=int, default=int(os.getenv("LOG_MAX_SIZE_MB", LOG_MAX_SIZE_MB)),
+                    help="Size in megabytes JSON-lines log is rotated after, 0 - never rotate")
+    group.addoption("--log-backup-count", type=int, default=int(os.getenv("LOG_BACKUP_COUNT", LOG_BACKUP_COUNT)),
+                    help="Number of rotated JSON-lines log files kept")
+    group.addoption("--shard-count", type=int, default=int(os.getenv("SHARD_COUNT", 1)),
+                    help="Number of CI machines the suite is split between")
+    group.addoption("--shard-index", type=int, default=int(os.getenv("SHARD_INDEX", 0)),
+                    help="Index of the shard to run on this machine, from 0 to shard count - 1")
+    group.addoption("--store-durations", action="store_true", default=False,
+                    help=f"Store durations of executed tests to {TEST_DURATIONS_FILE} for sharding and scheduling")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "mock_only: test reads hooks rendered by local mock site only, it is skipped "
+                                       "unless --mock-server is set")
+    config.addinivalue_line("markers", "starts_from_checkpoint: test page isn't opened at home page, the test brings "
+                                       "it to navigation checkpoint")
+    install_playwright_probes()
+    STEP_RETRY.max_retries = config.getoption("step_retries")
+    STEP_RETRY.backoff = config.getoption("step_retry_backoff")
+    RESOURCE_GUARD.enabled = config.getoption("leak_guard") == "on"
+    RESOURCE_GUARD.rss_threshold_mb = config.getoption("leak_threshold")
+    RESOURCE_GUARD.settle_timeout = LEAK_GUARD_SETTLE_TIMEOUT
+
+    worker_id = get_worker_id()
+    config.worker_artifacts_dir = os.path.join(ARTIFACTS_DIR, worker_id)
+
+    config.json_lines_log = None
+    if config.getoption("log_mode") == "json":
+        # Every record gets correlation id of the test and personal data masked in its message
+        logging.setLogRecordFactory(StructuredLogRecord)
+        # Console, pytest text log and captured log of test reports are left for warnings only. Report capture handler
+        # formats every record it gets, so its level is raised too unless --log-level is set explicitly
+        config.option.log_cli_level = "WARNING"
+        config.option.log_file = os.devnull
+        config.option.log_file_level = "WARNING"
+        if config.getoption("log_level") is None:
+            config.option.log_level = "WARNING"
+        config.json_lines_log = JsonLinesLog(os.path.join(config.worker_artifacts_dir, "log.jsonl"), worker_id,
+                                             max_size_mb=config.getoption("log_max_size"),
+                                             backup_count=config.getoption("log_backup_count"))
+        config.json_lines_log.start()
+        return
+
+    # Every xdist worker writes its own log file: pytest-gw0.log, pytest-gw1.log, ...
+    log_file = config.getoption("log_file") or config.getini("log_file")
+    if worker_id != "main" and log_file:
+        log_file_root, log_file_extension = os.path.splitext(log_file)
+        config.option.log_file = f"{log_file_root}-{worker_id}{log_file_extension}"
+
+
+def pytest_unconfigure(config):
+    if getattr(config, "json_lines_log", None) is not None:
+        config.json_lines_log.stop()
+        logging.setLogRecordFactory(logging.LogRecord)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    # Setup, call and teardown records of the test share one correlation id
+    with correlation_scope(item.nodeid):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    RESOURCE_GUARD.start_test(item.nodeid)
+    yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    # Artifacts of test sharing class context are captured before fixtures of the test change its pages
+    funcargs = getattr(item, "funcargs", {})
+    if "class_context" in funcargs:
+        failure_dir = funcargs["failure_artifacts"].finish_chunk(funcargs["class_context"], item.nodeid,
+                                                                 item.nodeid in FAILED_TESTS)
+        if failure_dir is not None:
+            item.user_properties.append(("failure_artifacts", failure_dir))
+
+    yield
+    # Fixtures of the test are torn down here, leaks are added to properties of teardown report
+    leaks = RESOURCE_GUARD.finish_test(item.nodeid)
+    if leaks:
+        item.user_properties.append(("resource_leaks", leaks))
+
+
+def pytest_collection_modifyitems(config, items):
+    if not config.getoption("mock_server"):
+        skip_mock_only = pytest.mark.skip(reason="Test reads hooks of local mock site only, run it with --mock-server")
+        for item in items:
+            if item.get_closest_marker("mock_only"):
+                item.add_marker(skip_mock_only)
+
+    weights = get_weights(items, load_durations(TEST_DURATIONS_FILE))
+    shard_count = config.getoption("shard_count")
+    shard_index = config.getoption("shard_index")
+    if not 0 <= shard_index < shard_count:
+        raise pytest.UsageError(f"--shard-index should be from 0 to {shard_count - 1}, got: {shard_index}")
+
+    if shard_count == 1:
+        items[:] = order_by_duration(items, weights)
+        return
+
+    shards, loads = split_to_shards(items, weights, shard_count)
+    selected = shards[shard_index]
+    selected_ids = {item.nodeid for item in selected}
+    deselected = [item for item in items if item.nodeid not in selected_ids]
+    logger.info("Shard %s/%s: %s tests, expected duration %.1fs", shard_index + 1, shard_count, len(selected),
+                loads[shard_index])
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+def pytest_runtest_logreport(report):
+    TEST_DURATIONS[report.nodeid] = TEST_DURATIONS.get(report.nodeid, 0.0) + report.duration
+    if report.failed:
+        FAILED_TESTS.add(report.nodeid)
+
+
+def pytest_sessionfinish(session):
+    if STEP_TIMER.samples:
+        history = session.config.cache.get("step_timing/history", {})
+        report_path = STEP_TIMER.write_report(session.config.worker_artifacts_dir, history)
+        session.config.cache.set("step_timing/history", STEP_TIMER.merge_history(history))
+        logger.info("Step timings report: %s", report_path)
+
+    if STEP_RETRY.report():
+        report_path = STEP_RETRY.write_report(session.config.worker_artifacts_dir)
+        logger.info("Step retries report: %s", report_path)
+
+    if RESOURCE_GUARD.rss_history or RESOURCE_GUARD.leaks:
+        report_path = RESOURCE_GUARD.write_report(session.config.worker_artifacts_dir)
+        logger.info("Resource guard report: %s, leaking tests: %s", report_path, len(RESOURCE_GUARD.leaks))
+
+    if SELECTORS.report():
+        report_path = SELECTORS.write_report(session.config.worker_artifacts_dir)
+        logger.info("Selectors report: %s", report_path)
+
+    # Durations are stored once by main process, xdist workers report their tests to it
+    if session.config.getoption("store_durations") and not hasattr(session.config, "workerinput"):
+        store_durations(TEST_DURATIONS_FILE, TEST_DURATIONS)
+
+
+@pytest.fixture(scope="session")
+def playwright():
     with sync_playwright() as playwright:
         playwright.selectors.set_test_id_attribute("data-test")
-        # By default run in headed mode
-        is_headless = bool(int(os.getenv('HEADLESS', 0)))
-        browser = playwright.chromium.launch(headless=is_headless)
+        yield playwright
+
+
+@pytest.fixture(scope="session")
+def execution_profile(pytestconfig):
+    # HEADLESS env variable overrides headless mode of the profile
+    headless = os.getenv("HEADLESS")
+    profile = get_execution_profile(pytestconfig.getoption("execution_profile"),
+                                    headless=bool(int(headless)) if headless else None)
+    logger.info("Execution profile: %s", profile)
+    return profile
+
+
+@pytest.fixture(scope="session")
+def browser_pool(playwright, pytestconfig, execution_profile):
+    pool = BrowserPool(lambda: playwright.chromium.launch(**execution_profile.launch_options()),
+                       size=pytestconfig.getoption("browser_pool_size"),
+                       recycle_after=pytestconfig.getoption("browser_recycle_after"),
+                       context_args=execution_profile.context_options())
+    yield pool
+
+    logger.info(pool.summary())
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def artifacts_dir(pytestconfig):
+    """Artifacts directory of current xdist worker"""
+    os.makedirs(pytestconfig.worker_artifacts_dir, exist_ok=True)
+    return pytestconfig.worker_artifacts_dir
+
+
+@pytest.fixture(scope="session")
+def har_store(pytestconfig):
+    return HarStore(HAR_STORE_DIR, pytestconfig.getoption("har_version"),
+                    NetworkMode(pytestconfig.getoption("network_mode")))
+
+
+@pytest.fixture(scope="session")
+def app_url(pytestconfig):
+    """Home page url of application under test"""
+    if not pytestconfig.getoption("mock_server"):
+        yield BASE_URL
+        return
+
+    mock_server = MockServer(MOCK_SITE_DIR, latency=pytestconfig.getoption("mock_latency") / 1000,
+                             api_latency=pytestconfig.getoption("mock_api_latency") / 1000)
+    mock_server.start()
+    yield mock_server.url
+    mock_server.stop()
+
+
+@pytest.fixture(scope="session")
+def checkpoint_store(pytestconfig, app_url):
+    # HAR of a test has to contain its whole flow, whether the prefix was passed depends on order of tests otherwise
+    network_mode = NetworkMode(pytestconfig.getoption("network_mode"))
+    enabled = pytestconfig.getoption("checkpoints") == "on" and network_mode == NetworkMode.LIVE
+    if pytestconfig.getoption("checkpoints") == "on" and not enabled:
+        logger.info("Checkpoints are off in %s network mode", network_mode.value)
+    store = CheckpointStore(app_url, pytestconfig.getoption("checkpoint_max_age"), enabled=enabled)
+    yield store
+    logger.info(store.summary())
+
+
+@pytest.fixture(scope="session")
+def network_policy(pytestconfig):
+    policy = NetworkPolicy(BLOCKED_RESOURCE_TYPES, BLOCKED_DOMAINS, ALLOWED_DOMAINS, TRACKER_DOMAINS,
+                           enabled=pytestconfig.getoption("network_policy") == "on",
+                           size_estimates=pytestconfig.cache.get("network/resource_sizes", {}))
+    yield policy
+    pytestconfig.cache.set("network/resource_sizes", policy.size_estimates)
+
+
+def get_readiness_environment(config) -> str:
+    """
+    Function provides name of environment settle durations are learned in: mock site durations and live or replayed
+    site durations differ in orders of magnitude, so they never share timeouts
+    """
+    if config.getoption("mock_server"):
+        return "mock"
+    return f"{BASE_URL} {config.getoption('network_mode')}"
+
+
+@pytest.fixture(scope="session")
+def readiness(pytestconfig):
+    # Settle durations history: {environment: {step name: [milliseconds]}}
+    history = pytestconfig.cache.get("readiness/environments", {})
+    environment = get_readiness_environment(pytestconfig)
+    READINESS.history = history.get(environment, {})
+    yield READINESS
+    history[environment] = READINESS.merge_history()
+    pytestconfig.cache.set("readiness/environments", history)
+
+
+@pytest.fixture(scope="session")
+def failure_artifacts(pytestconfig):
+    artifacts = FailureArtifacts(os.path.join(pytestconfig.worker_artifacts_dir, "failures"),
+                                 enabled=pytestconfig.getoption("failure_artifacts") == "on",
+                                 max_count=pytestconfig.getoption("failure_artifacts_max_count"),
+                                 max_size_mb=pytestconfig.getoption("failure_artifacts_max_size"))
+    yield artifacts
+
+    artifacts.close()
+    if artifacts.captured:
+        logger.info("Artifacts of %s failed tests: %s", artifacts.captured, artifacts.root_dir)
+
+
+@pytest.fixture(scope="session")
+def flow_browser(execution_profile):
+    """Browser of playwright async API shared by all concurrent flows of the session"""
+    browser = FlowBrowser(execution_profile.launch_options())
+    browser.start()
+    yield browser
+    browser.close()
+
+
+@pytest.fixture
+def flow_runner(pytestconfig, flow_browser, execution_profile, har_store, network_policy, readiness,
+                failure_artifacts, app_url, request):
+    """Runner of concurrent flows of the test, flow contexts are set up the same way as test contexts"""
+    def open_context(browser, flow_name):
+        return open_flow_context(browser, execution_profile.context_options(), har_store, network_policy, readiness,
+                                 failure_artifacts, app_url, request.node.nodeid, flow_name)
+
+    return FlowRunner(flow_browser, app_url, open_context, concurrency=pytestconfig.getoption("flow_concurrency"))
+
+
+@contextlib.contextmanager
+def open_test_context(browser_pool, har_store, network_policy, readiness, app_url, node_id):
+    """
+    Function provides browser context from the pool with HAR recording or replay, network policy and readiness
+    tracking installed
+    :param node_id: pytest node id of the test or the class context is opened for
+    :return: context manager yielding context and its network stats
+    """
+    context = browser_pool.open_context()
+    try:
+        har_store.attach(context, node_id, app_url)
+    except Exception:
+        browser_pool.close_context(context)
+        raise
+
+    network_stats = NetworkStats()
+    network_policy.install(context, network_stats)
+    readiness.install(context)
+    RESOURCE_GUARD.track(context, node_id)
+
+    try:
+        yield context, network_stats
+    finally:
+        # Pages are closed after failure artifacts are captured from them, then the context
+        RESOURCE_GUARD.close_pages(context)
+        browser_pool.close_context(context)
+        logger.info(network_stats.summary())
+
+
+@contextlib.asynccontextmanager
+async def open_flow_context(browser, context_options, har_store, network_policy, readiness, failure_artifacts, app_url,
+                            node_id, flow_name):
+    """
+    Function provides async API context of the flow with the same setup as test context: HAR recording or replay,
+    network policy, readiness tracking, resource guard and failure artifacts
+    :param node_id: pytest node id of the test the flow is run by
+    :param flow_name: name of the flow, HAR and failure artifacts of every flow are kept apart
+    :return: async context manager yielding context
+    """
+    flow_id = f"{node_id}[{flow_name}]"
+    context = await browser.new_context(**context_options)
+    try:
+        await har_store.async_attach(context, flow_id, app_url)
+    except Exception:
+        await context.close()
+        raise
+
+    network_stats = NetworkStats()
+    await network_policy.async_install(context, network_stats)
+    await readiness.async_install(context)
+    # Flow context is closed before the test ends, so it is owned by the test
+    RESOURCE_GUARD.track(context, node_id)
+    await failure_artifacts.async_start(context)
+
+    failed = False
+    try:
+        yield context
+    except Exception:
+        failed = True
+        raise
+    finally:
+        await failure_artifacts.async_finish(context, flow_id, failed)
+        await RESOURCE_GUARD.async_close_pages(context)
+        await context.close()
+        logger.info("Flow %s. %s", flow_name, network_stats.summary())
+
+
+@pytest.fixture
+def context(browser_pool, har_store, network_policy, readiness, failure_artifacts, app_url, request):
+    with open_test_context(browser_pool, har_store, network_policy, readiness, app_url,
+                           request.node.nodeid) as (context, network_stats):
+        failure_artifacts.start(context)
+        yield context
+
+        failure_dir = failure_artifacts.finish(context, request.node.nodeid, request.node.nodeid in FAILED_TESTS)
+        if failure_dir is not None:
+            request.node.user_properties.append(("failure_artifacts", failure_dir))
+
+    request.node.user_properties.append(("network", network_stats.as_dict()))
+
+
+@pytest.fixture(scope="class")
+def class_context(browser_pool, har_store, network_policy, readiness, failure_artifacts, app_url, request):
+    """Context shared by all tests of the class, e.g. by cases of data-driven matrix reusing one page"""
+    with open_test_context(browser_pool, har_store, network_policy, readiness, app_url,
+                           request.node.nodeid) as (context, _):
+        failure_artifacts.start(context)
+        yield context
 
-        yield browser
+        # Trace chunk of every test is captured in its teardown, see pytest_runtest_teardown
+        failure_artifacts.finish(context, request.node.nodeid, failed=False)
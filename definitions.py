@@ -2,7 +2,23 @@ import os
 
 RESOURCES_DIR_NAME = 'resources'
 PASSENGER_PERSONAL_INFO_FILE_NAME = 'passenger_personal_info.json'
+PASSENGER_MATRIX_FILE_NAME = 'passenger_matrix.jsonl'
+COUNTRIES_FILE_NAME = 'countries.csv'
+GENDERS_FILE_NAME = 'genders.csv'
+HAR_STORE_DIR_NAME = 'har'
+TEST_DURATIONS_FILE_NAME = 'test_durations.json'
+BENCHMARK_BASELINES_FILE_NAME = 'benchmark_baselines.json'
+ARTIFACTS_DIR_NAME = 'artifacts'
+MOCK_SITE_DIR_NAME = 'mock_site'
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 RESOURCES_DIR = os.path.join(ROOT_DIR, RESOURCES_DIR_NAME)
 PASSENGER_PERSONAL_INFO_FILE = os.path.join(RESOURCES_DIR, PASSENGER_PERSONAL_INFO_FILE_NAME)
+PASSENGER_MATRIX_FILE = os.path.join(RESOURCES_DIR, PASSENGER_MATRIX_FILE_NAME)
+COUNTRIES_FILE = os.path.join(RESOURCES_DIR, COUNTRIES_FILE_NAME)
+GENDERS_FILE = os.path.join(RESOURCES_DIR, GENDERS_FILE_NAME)
+HAR_STORE_DIR = os.path.join(RESOURCES_DIR, HAR_STORE_DIR_NAME)
+TEST_DURATIONS_FILE = os.path.join(RESOURCES_DIR, TEST_DURATIONS_FILE_NAME)
+BENCHMARK_BASELINES_FILE = os.path.join(RESOURCES_DIR, BENCHMARK_BASELINES_FILE_NAME)
+ARTIFACTS_DIR = os.path.join(ROOT_DIR, ARTIFACTS_DIR_NAME)
+MOCK_SITE_DIR = os.path.join(RESOURCES_DIR, MOCK_SITE_DIR_NAME)
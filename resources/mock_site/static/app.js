@@ -0,0 +1,463 @@
+"use strict";
+
+// Local stand-in of kiwi.com pages. Only data-test hooks and class names used by actions are reproduced
+
+const CITIES = [
+    "Prague, Czechia", "New York, United States", "Newark, United States", "Barcelona, Spain", "Madrid, Spain",
+    "London, United Kingdom", "Paris, France", "Berlin, Germany", "Vienna, Austria", "Rome, Italy",
+    "Lisbon, Portugal", "Amsterdam, Netherlands",
+];
+const MONTHS = [
+    "January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November",
+    "December",
+];
+const LAYOVER_COUNTRIES = [
+    "France", "Germany", "Iceland", "Ireland", "Netherlands", "Portugal", "Switzerland", "United Kingdom",
+];
+const STOPS_FILTER_VALUES = [["Any", 2], ["Direct", 0], ["Up to 1 stop", 1], ["Up to 2 stops", 2]];
+// COUNTRIES: [[code, name, dial code]] are generated by mock server from resources/countries.csv (/static/countries.js)
+const countryName = code => (COUNTRIES.find(([countryCode]) => countryCode === code.toLowerCase()) || [code, code])[1];
+const countryCode = name => (COUNTRIES.find(([, countryName]) => countryName === name) || [name])[0];
+const RESULTS_PAGE_SIZE = 10;
+
+const el = (tag, attributes = {}, ...children) => {
+    const element = document.createElement(tag);
+    for (const [name, value] of Object.entries(attributes)) {
+        if (name === "text") {
+            element.textContent = value;
+        } else if (name.startsWith("on")) {
+            element.addEventListener(name.slice(2), value);
+        } else if (value === true) {
+            element.setAttribute(name, "");
+        } else if (value !== false && value !== null && value !== undefined) {
+            element.setAttribute(name, value);
+        }
+    }
+    children.forEach(child => element.append(child));
+    return element;
+};
+
+const slugify = text => text.toLowerCase().replace(/[^a-z0-9]+/g, "-").replace(/^-|-$/g, "");
+const pad = number => String(number).padStart(2, "0");
+const isoDate = date => `${date.year}-${pad(date.month + 1)}-${pad(date.day)}`;
+const parseIsoDate = text => {
+    const [year, month, day] = text.split("-").map(Number);
+    return {year, month: month - 1, day};
+};
+const formatDuration = minutes => `${Math.floor(minutes / 60)}h ${pad(minutes % 60)}m`;
+
+function modal(testId, ...children) {
+    const content = el("div", {class: "Modal__ModalWrapperContent-sc-mock1"}, ...children);
+    return testId ? el("div", {"data-test": testId}, content) : content;
+}
+
+function monthOptions(selectedLabel) {
+    return [el("option", {value: "", text: "Month"}),
+        ...MONTHS.map((month, index) => el("option", {value: pad(index + 1), text: month, selected: month === selectedLabel}))];
+}
+
+// Home page: search form
+
+function renderHome(app) {
+    const state = {
+        origin: ["Prague, Czechia"],
+        destination: [],
+        dates: [],
+        passengers: {adults: 1, children: 0, infants: 0, cabin_bags: 0, checked_bags: 0},
+    };
+
+    const cookiesModal = modal(null, el("p", {text: "We use cookies to improve your experience"}),
+        el("button", {"data-test": "ModalCloseButton", text: "Accept", onclick: () => cookiesModal.remove()}));
+
+    const bookingComCheckbox = el("input", {type: "checkbox", checked: true});
+    const searchButton = el("a", {"data-test": "LandingSearchButton", href: "#", text: "Search"});
+    searchButton.addEventListener("click", event => {
+        event.preventDefault();
+        if (!state.origin.length || !state.destination.length || !state.dates.length) {
+            return;
+        }
+        const [departure, returnDate] = state.dates;
+        const query = new URLSearchParams({
+            adults: state.passengers.adults,
+            children: state.passengers.children,
+            infants: state.passengers.infants,
+            bags: `${state.passengers.cabin_bags}.${state.passengers.checked_bags}`,
+            bookingcom: bookingComCheckbox.checked,
+        });
+        location.href = ["/en/search/results", slugify(state.origin[0]), slugify(state.destination[0]),
+            isoDate(departure), returnDate ? isoDate(returnDate) : "no-return"].join("/") + `?${query}`;
+    });
+
+    app.append(
+        cookiesModal,
+        placeField("origin", state),
+        placeField("destination", state),
+        dateField(state),
+        passengersField(state),
+        el("div", {class: "BookingcomSwitchstyled__StyledBookingcomSwitch-sc-mock1"},
+            el("label", {}, bookingComCheckbox, " Check accommodation with booking.com")),
+        searchButton,
+    );
+}
+
+function placeField(name, state) {
+    const places = el("div", {});
+    const suggestions = el("div", {hidden: true});
+    const input = el("input", {"data-test": "SearchField-input", placeholder: name === "origin" ? "From" : "To"});
+
+    const renderPlaces = () => {
+        places.replaceChildren(...state[name].map(address => {
+            const place = el("div", {"data-test": "PlacePickerInputPlace"}, address.split(", ")[0]);
+            place.append(el("button", {"data-test": "PlacePickerInputPlace-close", text: "×", onclick: () => {
+                state[name] = state[name].filter(item => item !== address);
+                renderPlaces();
+            }}));
+            return place;
+        }));
+    };
+
+    input.addEventListener("input", () => {
+        const text = input.value.trim().toLowerCase();
+        const matched = text ? CITIES.filter(city => city.toLowerCase().includes(text)) : [];
+        suggestions.replaceChildren(...matched.map(address => el("div", {"data-test": "PlacePickerRow-city", onclick: () => {
+            state[name] = [address];
+            input.value = "";
+            suggestions.hidden = true;
+            renderPlaces();
+        }}, el("div", {class: "PlacePickerstyled__PlacePickerItemName-sc-mock1", text: address}))));
+        suggestions.hidden = matched.length === 0;
+    });
+
+    renderPlaces();
+    return el("div", {"data-test": `SearchFieldItem-${name}`}, places, input, suggestions);
+}
+
+function dateField(state) {
+    const today = new Date();
+    let firstMonth = {year: today.getFullYear(), month: today.getMonth()};
+    const container = el("div", {});
+    const values = {Departure: el("span", {}), Return: el("span", {})};
+
+    const renderValues = () => {
+        values.Departure.textContent = state.dates[0] ? isoDate(state.dates[0]) : "Anytime";
+        values.Return.textContent = state.dates[1] ? isoDate(state.dates[1]) : "No return";
+    };
+
+    const renderMonth = offset => {
+        const date = new Date(firstMonth.year, firstMonth.month + offset, 1);
+        const year = date.getFullYear();
+        const month = date.getMonth();
+        const days = new Date(year, month + 1, 0).getDate();
+        return el("div", {class: "Calendarstyled__Container-sc-mock1"},
+            el("div", {"data-test": "DatepickerMonthButton"},
+                el("div", {class: "ButtonPrimitiveContentChildren-sc-mock1", text: `${MONTHS[month]} ${year}`})),
+            ...Array.from({length: days}, (_, index) => el("div", {"data-test": "CalendarDay", onclick: () => {
+                const selected = {year, month, day: index + 1};
+                state.dates = state.dates.length === 1 && isoDate(selected) > isoDate(state.dates[0]) ?
+                    [state.dates[0], selected] : [selected];
+                renderValues();
+            }}, el("div", {"data-test": "DayDateTypography", text: String(index + 1)}))));
+    };
+
+    const openPicker = () => {
+        if (container.firstChild) {
+            return;
+        }
+        if (state.dates.length) {
+            firstMonth = {year: state.dates[0].year, month: state.dates[0].month};
+        }
+        const months = el("div", {}, renderMonth(0), renderMonth(1));
+        const move = step => {
+            firstMonth = {year: firstMonth.year, month: firstMonth.month + step};
+            months.replaceChildren(renderMonth(0), renderMonth(1));
+        };
+        container.append(el("div", {"data-test": "NewDatePickerOpen"},
+            el("button", {"data-test": "CalendarMovePrevButton", text: "‹", onclick: () => move(-1)}),
+            el("button", {"data-test": "CalendarMoveNextButton", text: "›", onclick: () => move(1)}),
+            months,
+            el("button", {"data-test": "SearchFormDoneButton", text: "Done", onclick: () => container.replaceChildren()})));
+    };
+
+    renderValues();
+    return el("div", {},
+        ...Object.entries(values).map(([label, value]) => el("div", {"data-test": "SearchDateInput"},
+            el("div", {class: "SearchFieldstyled__SearchFieldLabel-sc-mock1", text: label, onclick: openPicker}),
+            value)),
+        container);
+}
+
+function passengersField(state) {
+    const rows = [
+        ["adults", "PassengersRow-adults", "Adults", 1, () => 9],
+        ["children", "PassengersRow-children", "Children", 0, () => 8],
+        ["infants", "PassengersRow-infants", "Infants", 0, () => state.passengers.adults],
+        ["cabin_bags", "BagsPopup-cabin", "Cabin baggage", 0, () => passengersCount() - state.passengers.infants],
+        ["checked_bags", "BagsPopup-checked", "Checked baggage", 0,
+            () => 2 * (passengersCount() - state.passengers.infants)],
+    ];
+    const passengersCount = () => state.passengers.adults + state.passengers.children + state.passengers.infants;
+    const note = el("div", {"data-test": "PassengersField-note-1"});
+    const popoverContainer = el("div", {});
+    const renderNote = () => {
+        note.textContent = `${passengersCount()} passenger${passengersCount() > 1 ? "s" : ""}`;
+    };
+
+    note.addEventListener("click", () => {
+        const renderRow = ([name, testId, label, min, max]) => {
+            const input = el("input", {readonly: true, value: String(state.passengers[name])});
+            const decrement = el("button", {"aria-label": "decrement", text: "-"});
+            const increment = el("button", {"aria-label": "increment", text: "+"});
+            const update = () => {
+                input.value = String(state.passengers[name]);
+                decrement.disabled = state.passengers[name] <= min;
+                increment.disabled = state.passengers[name] >= max();
+            };
+            decrement.addEventListener("click", () => {
+                state.passengers[name] = Math.max(min, state.passengers[name] - 1);
+                // Infants can't outnumber adults, bags over allowance of removed passengers are dropped
+                state.passengers.infants = Math.min(state.passengers.infants, state.passengers.adults);
+                rows.slice(3).forEach(([bagsName, , , , bagsMax]) => {
+                    state.passengers[bagsName] = Math.min(state.passengers[bagsName], bagsMax());
+                });
+                popover.dispatchEvent(new Event("update"));
+            });
+            increment.addEventListener("click", () => {
+                state.passengers[name] = Math.min(max(), state.passengers[name] + 1);
+                popover.dispatchEvent(new Event("update"));
+            });
+            popover.addEventListener("update", update);
+            update();
+            return el("div", {"data-test": testId}, el("span", {text: label}), decrement, input, increment);
+        };
+
+        const popover = el("div", {"data-test": "PassengersPopover"});
+        popover.append(...rows.map(renderRow), el("button", {"data-test": "PassengersFieldFooter-done", text: "Done",
+            onclick: () => {
+                popoverContainer.replaceChildren();
+                renderNote();
+            }}));
+        popoverContainer.replaceChildren(popover);
+    });
+
+    renderNote();
+    return el("div", {"data-test": "PassengersField"},
+        el("div", {class: "ButtonWrapsstyled__ButtonTabletWrap-sc-mock1"}, note), popoverContainer);
+}
+
+// Search results page
+
+function renderResults(app) {
+    const [origin, destination, departure, returnDate] = location.pathname.split("/").slice(4);
+    const query = new URLSearchParams(location.search);
+    const state = {
+        maxStops: query.has("stopNumber") ? Number(query.get("stopNumber").split("~")[0]) : 2,
+        // Url has country codes, filter checkboxes and search API have country names
+        excludedCountries: new Set((query.get("excludeCountries") || "").split(",").filter(Boolean).map(countryName)),
+        flights: [],
+        total: 0,
+        request: 0,
+    };
+
+    const loadingLine = el("div", {"data-test": "LoadingLine", hidden: true});
+    const cards = el("div", {});
+    const moreButton = el("button", {"data-test": "ResultsMoreButton", text: "Load more", hidden: true});
+    const modalContainer = el("div", {});
+
+    const updateUrl = () => {
+        query.set("stopNumber", `${state.maxStops}~true`);
+        if (state.excludedCountries.size) {
+            query.set("excludeCountries", [...state.excludedCountries].map(countryCode).join(","));
+        } else {
+            query.delete("excludeCountries");
+        }
+        history.replaceState(null, "", `${location.pathname}?${query}`);
+    };
+
+    const search = async (append = false) => {
+        const request = ++state.request;
+        loadingLine.hidden = false;
+        const apiQuery = new URLSearchParams({
+            from: origin, to: destination, departure, return: returnDate, maxStops: state.maxStops,
+            excludeCountries: [...state.excludedCountries].join(","),
+            offset: append ? state.flights.length : 0, limit: RESULTS_PAGE_SIZE,
+        });
+        const response = await (await fetch(`/api/search?${apiQuery}`)).json();
+        if (request !== state.request) {
+            // Results of outdated search
+            return;
+        }
+        state.flights = append ? state.flights.concat(response.flights) : response.flights;
+        state.total = response.total;
+        cards.replaceChildren(...state.flights.map(flight => resultCard(flight, () => openFlightDetails(flight))));
+        moreButton.hidden = state.flights.length >= state.total;
+        loadingLine.hidden = true;
+    };
+
+    const openFlightDetails = flight => {
+        const sectorNames = ["Trip from", "Trip to"];
+        modalContainer.replaceChildren(el("div", {"data-test": "ResultCardModal"},
+            modal(null,
+                ...flight.sectors.map((sector, index) => el("div", {"data-test": "TripPopupWrapper"},
+                    el("h4", {text: sectorNames[index]}),
+                    ...sector.map(layover => el("div", {class: "SectorStopstyled__SectorFlightLayover-sc-mock1",
+                        text: `Layover in ${layover.airport}, ${layover.country}`})))),
+                el("button", {"data-test": "ModalCloseButton", text: "Close",
+                    onclick: () => modalContainer.replaceChildren()}),
+                el("button", {"data-test": "DetailBookingButton", text: "Select", onclick: () => {
+                    const loginModal = el("div", {"data-test": "MagicLogin"}, modal(null,
+                        el("p", {text: "Sign in to Kiwi.com"}),
+                        el("a", {"data-test": "MagicLogin-GuestTextLink", href: "#", text: "Continue as a guest",
+                            onclick: event => {
+                                event.preventDefault();
+                                modalContainer.replaceChildren();
+                                const bookingQuery = new URLSearchParams({
+                                    flight: flight.id,
+                                    adults: query.get("adults") || 1,
+                                    children: query.get("children") || 0,
+                                    infants: query.get("infants") || 0,
+                                });
+                                location.href = `/en/booking?${bookingQuery}`;
+                            }})));
+                    modalContainer.replaceChildren(loginModal);
+                }}))));
+    };
+
+    const stopsFilter = filter("stops", "Stops", ...STOPS_FILTER_VALUES.map(([label, maxStops]) => el("label", {},
+        el("input", {type: "radio", name: "stops", checked: maxStops === state.maxStops && label !== "Any", onchange: () => {
+            state.maxStops = maxStops;
+            updateUrl();
+            search();
+        }}),
+        el("span", {text: label}))));
+
+    const countriesList = el("div", {"data-test": "CountriesFilterChoiceGroup-inResults"});
+    const countriesSearch = el("input", {placeholder: "Search countries", hidden: true});
+    const renderCountries = () => {
+        const text = countriesSearch.value.trim().toLowerCase();
+        countriesList.replaceChildren(...LAYOVER_COUNTRIES.filter(country => country.toLowerCase().includes(text))
+            .map(country => el("label", {},
+                el("input", {type: "checkbox", checked: state.excludedCountries.has(country), onchange: event => {
+                    if (event.target.checked) {
+                        state.excludedCountries.add(country);
+                    } else {
+                        state.excludedCountries.delete(country);
+                    }
+                    updateUrl();
+                    search();
+                }}),
+                ` ${country}`)));
+    };
+    countriesSearch.addEventListener("input", renderCountries);
+    renderCountries();
+    const countriesFilter = filter("countries", "Exclude countries",
+        el("button", {"data-test": "Multiselect-SelectSearchButton", text: "Search", onclick: () => {
+            countriesSearch.hidden = false;
+        }}),
+        countriesSearch,
+        countriesList);
+
+    moreButton.addEventListener("click", () => search(true));
+
+    app.append(loadingLine, stopsFilter, countriesFilter,
+        el("div", {"data-test": "ResultList-results"}, el("h2", {text: "Results"}), cards, moreButton),
+        modalContainer);
+    search();
+}
+
+function filter(name, title, ...content) {
+    const slide = el("div", {class: "Slide__StyledSlide-sc-mock1", hidden: true}, ...content);
+    return el("div", {"data-test": `FilterHeader-${name}`},
+        el("button", {text: title, onclick: () => {
+            slide.hidden = !slide.hidden;
+        }}),
+        slide);
+}
+
+function resultCard(flight, onclick) {
+    const layovers = flight.sectors.flat();
+    // Stops and layovers have no hooks, like on live site, and are rendered as text lines only
+    return el("div", {"data-test": "ResultCardWrapper", onclick},
+        el("div", {"data-test": "ResultCardPrice", text: `${flight.price} €`}),
+        el("div", {"data-test": "ResultCardDuration", text: formatDuration(flight.duration)}),
+        el("div", {text: flight.stops ? `${flight.stops} stop${flight.stops > 1 ? "s" : ""}` : "Direct"}),
+        el("div", {"data-test": "ResultCardCarriers"},
+            ...flight.carriers.map(carrier => el("span", {"data-test": "ResultCardCarrier", text: carrier}))),
+        ...layovers.map(layover => el("div", {text: `Layover in ${layover.airport}, ${layover.country}`})));
+}
+
+// Booking page: contacts and passengers details
+
+function renderBooking(app) {
+    const query = new URLSearchParams(location.search);
+    const passengersCount = ["adults", "children", "infants"].reduce((sum, name) => sum + Number(query.get(name) || 0), 0);
+
+    const countryOptions = (placeholder, label) => [el("option", {value: "", text: placeholder}),
+        ...COUNTRIES.map(([code, name, dialCode]) => el("option", {value: code, text: label(name, dialCode)}))];
+
+    const contactForm = el("div", {"data-test": "contact-account-promotion"},
+        el("h3", {text: "Contact details"}),
+        el("input", {"data-test": "contact-email", type: "email", placeholder: "Email"}),
+        el("select", {"data-test": "contact-phone-country"},
+            ...countryOptions("Country", (name, dialCode) => `${name} (${dialCode})`)),
+        el("input", {"data-test": "contact-phone", type: "tel", placeholder: "Phone"}));
+
+    const dateInputs = () => [
+        el("input", {"data-test": "day", placeholder: "DD"}),
+        el("select", {"data-test": "month"}, ...monthOptions()),
+        el("input", {"data-test": "year", placeholder: "YYYY"}),
+    ];
+
+    const passengerForm = number => {
+        const form = el("div", {"data-test": "ReservationPassenger"},
+            el("h3", {text: `Passenger ${number}`}),
+            el("div", {"data-test": "ReservationPassenger-FirstName"},
+                el("label", {text: "Given names"}), el("input", {placeholder: "e.g. Harry James"})),
+            el("div", {"data-test": "ReservationPassenger-LastName"},
+                el("label", {text: "Surnames"}), el("input", {placeholder: "e.g. Brown"})),
+            el("select", {"data-test": "ReservationPassenger-nationality"},
+                ...countryOptions("Nationality", name => name)),
+            el("div", {class: "PassengerForm__GenderWrapper-sc-mock1"},
+                el("select", {}, el("option", {value: "", text: "Gender"}), el("option", {value: "mr", text: "Male"}),
+                    el("option", {value: "ms", text: "Female"}))),
+            el("div", {class: "InputGroup-sc-mock1"}, el("span", {text: "Date of birth"}), ...dateInputs()),
+            el("div", {"data-test": "ReservationPassengerDocument"},
+                el("div", {class: "Document__FieldWrapper-sc-mock1"},
+                    el("input", {name: "idNumber", placeholder: "Passport or ID number"})),
+                el("div", {"data-test": "DatePickerField-switcher-text"},
+                    el("span", {text: "Passport or ID expiry date"}), ...dateInputs())),
+            el("button", {"data-test": "removePassengerButton", text: "Remove", onclick: () => form.remove()}));
+        return form;
+    };
+
+    const continueButton = el("button", {"data-test": "StepControls-passengers-next", text: "Continue", onclick: () => {
+        document.querySelectorAll("[class*='Tooltip__StyledFormFeedbackTooltip']").forEach(tooltip => tooltip.remove());
+        document.querySelectorAll("[data-test='ReservationPassenger']").forEach(form => {
+            const containers = [
+                form.querySelector("[data-test='ReservationPassenger-FirstName']"),
+                form.querySelector("[data-test='ReservationPassenger-LastName']"),
+                form.querySelector("[data-test='ReservationPassenger-nationality']"),
+                form.querySelector("[class*='PassengerForm__GenderWrapper']"),
+                form.querySelector("[class*='InputGroup']"),
+                form.querySelector("[class*='Document__FieldWrapper']"),
+                form.querySelector("[data-test='DatePickerField-switcher-text']"),
+            ];
+            containers.forEach(container => {
+                const fields = container.matches("select") ? [container] : container.querySelectorAll("input, select");
+                if ([...fields].some(field => !field.value.trim())) {
+                    const tooltip = el("div", {class: "Tooltip__StyledFormFeedbackTooltip-sc-mock1", text: "Required field"});
+                    if (container.matches("select")) {
+                        container.after(tooltip);
+                    } else {
+                        container.append(tooltip);
+                    }
+                }
+            });
+        });
+    }});
+
+    app.append(el("div", {"data-test": "LoadingLine", hidden: true}), contactForm,
+        ...Array.from({length: passengersCount || 1}, (_, index) => passengerForm(index + 1)), continueButton);
+}
+
+const renderers = {home: renderHome, results: renderResults, booking: renderBooking};
+renderers[document.body.dataset.page](document.getElementById("app"));
@@ -1,32 +1,72 @@
 import logging
+from typing import Callable
 
 import pytest
 from playwright.sync_api import expect
 
-from utils.constants import BASE_URL
 from actions.MainPageActions import MainPageActions
 from actions.PassengerDetailsActions import PassengerDetailsActions
 from actions.SearchResultsActions import SearchResultsActions
+from utils.constants import StopsFilterValues, ExcludeCountriesFilterValues
 
 logger = logging.getLogger(__name__)
 
+GUEST_CHECKOUT_CHECKPOINT = "guest-checkout-new-york-barcelona-2-adults-1-stop"
+
 
 class BaseTest:
 
-    @classmethod
-    def init_actions(cls, page):
-        cls.main_page_actions = MainPageActions(page)
-        cls.search_results_actions = SearchResultsActions(page)
-        cls.passenger_details_actions = PassengerDetailsActions(page)
+    def init_actions(self, page):
+        # Actions are kept per test instance, so tests never share pages
+        self.main_page_actions = MainPageActions(page)
+        self.search_results_actions = SearchResultsActions(page)
+        self.passenger_details_actions = PassengerDetailsActions(page)
+
+    def start_from_checkpoint(self, name: str, build: Callable[[], None], is_ready: Callable[[], None],
+                              fingerprint: str = "") -> None:
+        """
+        Method provides bringing test page to the state after named navigation prefix, from saved checkpoint if it is
+        fresh, otherwise by passing the prefix
+        :param name: checkpoint name
+        :param build: function passing navigation prefix from the home page
+        :param is_ready: function waiting until page is in the state after prefix
+        :param fingerprint: prefix parameters, checkpoint built with other parameters is not used
+        """
+        self.checkpoint_store.start_from(self.page, name, build, is_ready, fingerprint)
+
+    def open_guest_checkout_new_york_barcelona(self):
+        # Open search results of 2 passengers with filters: 1 stop and exclude UK, search form isn't under test
+        self.search_results_actions.open_search_results(
+            self.app_url, from_address="New York, United States", to_address="Barcelona, Spain",
+            departure_date="1 July 2023", return_date="15 July 2023", adults=2, stops=StopsFilterValues.ONE_STOP,
+            exclude_countries=[ExcludeCountriesFilterValues.UK])
+
+        # Select first flight
+        flight_details_modal = self.search_results_actions.select_first_flight()
+
+        # Check number of transfers is 1 for each part of the trip
+        flight_details_modal.check_number_of_transfers(expected_number=1)
+
+        # Click select button
+        log_in_modal = flight_details_modal.click_select_button()
+
+        # Click continue as guest
+        log_in_modal.continue_as_guest()
 
     @pytest.fixture(autouse=True)
-    def home_page(self, browser):
-        logger.info(f'Launch browser and open: {BASE_URL}')
-        page = browser.new_page()
-        page.goto(BASE_URL)
+    def home_page(self, context, checkpoint_store, app_url, request):
+        page = context.new_page()
+        # Test starting from checkpoint opens checkpoint url or home page itself, home page isn't loaded twice
+        if request.node.get_closest_marker("starts_from_checkpoint") is None:
+            logger.info("Open page in new browser context: %s", app_url)
+            page.goto(app_url)
 
-        expected_title = page.title()
-        expect(page).to_have_title(expected_title)
+            expected_title = page.title()
+            expect(page).to_have_title(expected_title)
+        self.page = page
+        self.app_url = app_url
+        self.checkpoint_store = checkpoint_store
         self.init_actions(page)
 
+        # Page isn't closed here: resource guard closes it with its context after failure artifacts are captured
         yield page
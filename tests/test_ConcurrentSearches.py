@@ -0,0 +1,34 @@
+from actions.AsyncSearchResultsActions import AsyncSearchResultsActions
+from utils.constants import StopsFilterValues
+
+# Routes searched at the same time: (from address, to address, departure date, return date)
+ROUTES = [
+    ("New York, United States", "Barcelona, Spain", "1 July 2023", "15 July 2023"),
+    ("New York, United States", "Madrid, Spain", "3 July 2023", "17 July 2023"),
+    ("New York, United States", "Lisbon, Portugal", "5 July 2023", "19 July 2023"),
+]
+
+
+class TestConcurrentSearches:
+    """Independent search flows are run at once in contexts of one browser"""
+
+    def test_search_results_of_several_routes_are_opened_concurrently(self, flow_runner):
+
+        def search_flow(from_address, to_address, departure_date, return_date):
+            async def flow(page):
+                # Open search results with 1 stop filter and select first flight
+                search_results_actions = AsyncSearchResultsActions(page)
+                await search_results_actions.open_search_results(
+                    flow_runner.app_url, from_address=from_address, to_address=to_address,
+                    departure_date=departure_date, return_date=return_date, stops=StopsFilterValues.ONE_STOP)
+                flight_details_modal = await search_results_actions.select_first_flight()
+
+                # Check number of transfers is 1 for each part of the trip
+                await flight_details_modal.check_number_of_transfers(expected_number=1)
+
+            return flow
+
+        results = flow_runner.run({f"{route[0]} - {route[1]}": search_flow(*route) for route in ROUTES})
+
+        failed = {result.name: repr(result.error) for result in results if not result.passed}
+        assert not failed, f"Flows failed: {failed}"
@@ -0,0 +1,100 @@
+from typing import List
+
+import pytest
+
+from BaseTest import BaseTest, GUEST_CHECKOUT_CHECKPOINT
+from definitions import PASSENGER_MATRIX_FILE
+from utils.passenger_matrix import get_record_offsets, read_record
+
+
+def get_cases(with_error: bool) -> List:
+    """
+    Function provides offsets of matrix records with their case names as test ids
+    :param with_error: True - records with expected passport expiration date error, False - records with valid date,
+                       passengers details page is left after continue for them
+    """
+    cases = []
+    for offset in get_record_offsets(PASSENGER_MATRIX_FILE):
+        record = read_record(PASSENGER_MATRIX_FILE, offset)
+        if ("expected_exp_date_error" in record) == with_error:
+            cases.append(pytest.param(offset, id=record.get("case", f"offset-{offset}")))
+    return cases
+
+
+class PassengerDetailsMatrixTest(BaseTest):
+
+    def open_single_passenger_checkout(self):
+        # Open passengers details page of single transition flight as guest
+        self.start_from_checkpoint(GUEST_CHECKOUT_CHECKPOINT, self.open_guest_checkout_new_york_barcelona,
+                                   self.passenger_details_actions.wait_passenger_forms_opened)
+        self.passenger_details_actions.remove_passenger(passenger_number=2)
+
+    def fill_and_continue(self, record_offset: int) -> str:
+        """
+        Method provides setting passenger data of matrix record and clicking continue
+        :param record_offset: offset of the record in matrix file
+        :return: expected passport expiration date error, None - if date is valid
+        """
+        passenger_info = read_record(PASSENGER_MATRIX_FILE, record_offset)
+        passenger_info.pop("case", None)
+        expected_error = passenger_info.pop("expected_exp_date_error", None)
+        email = passenger_info.pop("email")
+        phone_number = passenger_info.pop("phone_number")
+
+        # Set passenger contact and personal data
+        self.passenger_details_actions.set_passenger_contact_info(email, phone_number)
+        self.passenger_details_actions.set_primary_passenger_info(**passenger_info)
+
+        # Click continue
+        self.passenger_details_actions.continue_next_page()
+        return expected_error
+
+
+class TestPassengerDetailsMatrix(PassengerDetailsMatrixTest):
+    """
+    Cases of passenger matrix file with invalid passport expiration date are checked one by one on the same passengers
+    details page, continue doesn't leave the page for them
+    """
+
+    @pytest.fixture(scope="class")
+    def checkout_page(self, class_context, checkpoint_store, app_url):
+        page = class_context.new_page()
+        self.page = page
+        self.app_url = app_url
+        self.checkpoint_store = checkpoint_store
+        self.init_actions(page)
+
+        # Open passengers details page once for all cases
+        self.open_single_passenger_checkout()
+
+        yield page
+
+    @pytest.fixture(autouse=True)
+    def home_page(self, checkout_page):
+        self.page = checkout_page
+        self.init_actions(checkout_page)
+
+        yield checkout_page
+
+        # Next case starts from empty forms
+        self.passenger_details_actions.reset_passengers_forms()
+
+    @pytest.mark.parametrize("record_offset", get_cases(with_error=True))
+    def test_passport_expiration_date_validation(self, record_offset):
+        expected_error = self.fill_and_continue(record_offset)
+
+        # Check passport expiration date error message
+        self.passenger_details_actions.check_error_message_in_primary_passenger_passport_or_id_exp_date(expected_error)
+
+
+class TestPassengerDetailsMatrixValidDate(PassengerDetailsMatrixTest):
+    """Cases of passenger matrix file with valid passport expiration date, every case opens its own page"""
+
+    @pytest.mark.starts_from_checkpoint
+    @pytest.mark.parametrize("record_offset", get_cases(with_error=False))
+    def test_passport_expiration_date_accepted(self, record_offset):
+        self.open_single_passenger_checkout()
+        self.fill_and_continue(record_offset)
+
+        # Check there is no passport expiration date error message
+        self.passenger_details_actions.check_no_error_message_in_primary_passenger_passport_or_id_exp_date()
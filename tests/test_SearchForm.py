@@ -0,0 +1,35 @@
+from BaseTest import BaseTest
+from utils.constants import StopsFilterValues, ExcludeCountriesFilterValues
+from utils.search_url import build_search_results_url
+
+
+class TestSearchForm(BaseTest):
+
+    def test_search_form_opens_the_same_results_as_direct_url(self):
+
+        # Close cookies modal
+        self.main_page_actions.close_modal()
+
+        # Input from and to
+        self.main_page_actions.set_from_address(from_address="New York, United States")
+        self.main_page_actions.set_to_address(to_address="Barcelona, Spain")
+
+        # Select from-to dates in date picker
+        self.main_page_actions.set_departure_and_return_dates(departure_date="1 July 2023", return_date="15 July 2023")
+
+        # Set 2 adults, 1 child and 1 cabin bag
+        self.main_page_actions.set_passengers(adults=2, children=1, cabin_bags=1)
+
+        # Uncheck booking com container and click search button
+        self.main_page_actions.uncheck_booking_com_checkbox()
+        self.main_page_actions.click_search_button()
+
+        # Select filters: 1 stop and exclude UK
+        self.search_results_actions.set_stops_filter(StopsFilterValues.ONE_STOP)
+        self.search_results_actions.set_exclude_country_filter(ExcludeCountriesFilterValues.UK, with_search=True)
+
+        # Check the form opened the same search that tests open directly by url
+        self.search_results_actions.check_search_results_url(build_search_results_url(
+            self.app_url, from_address="New York, United States", to_address="Barcelona, Spain",
+            departure_date="1 July 2023", return_date="15 July 2023", adults=2, children=1, cabin_bags=1,
+            stops=StopsFilterValues.ONE_STOP, exclude_countries=[ExcludeCountriesFilterValues.UK]))
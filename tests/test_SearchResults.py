@@ -0,0 +1,26 @@
+import pytest
+
+from BaseTest import BaseTest
+from utils.constants import StopsFilterValues, ExcludeCountriesFilterValues
+
+
+# Layover countries are shown in result cards of local mock site only
+@pytest.mark.mock_only
+class TestSearchResults(BaseTest):
+
+    def test_all_results_match_stops_and_exclude_countries_filters(self):
+
+        # Open search results with filters: 1 stop and exclude UK
+        self.search_results_actions.open_search_results(
+            self.app_url, from_address="New York, United States", to_address="Barcelona, Spain",
+            departure_date="1 July 2023", return_date="15 July 2023", stops=StopsFilterValues.ONE_STOP,
+            exclude_countries=[ExcludeCountriesFilterValues.UK])
+
+        # Read all results, loading more results page by page
+        results = self.search_results_actions.get_results()
+        assert results, "There are no search results"
+
+        # Check no result has more than 1 stop or layover in UK
+        self.search_results_actions.check_results_max_stops(results, max_stops=1)
+        self.search_results_actions.check_results_exclude_layover_countries(
+            results, [ExcludeCountriesFilterValues.UK])
@@ -0,0 +1,194 @@
+import logging
+import time
+from typing import Callable, List, Optional
+
+from playwright.sync_api import Browser, BrowserContext, Error
+
+logger = logging.getLogger(__name__)
+
+
+class PooledBrowser:
+    """Class contains running browser and its usage counters"""
+
+    def __init__(self, browser: Browser, launch_time: float):
+        self.browser = browser
+        self.launch_time = launch_time
+        self.active_contexts = 0
+        self.tests_served = 0
+        self.crashed = False
+        browser.on("disconnected", self._on_disconnected)
+
+    def _on_disconnected(self, _browser: Browser) -> None:
+        self.crashed = True
+
+    @property
+    def is_healthy(self) -> bool:
+        """Browser is still connected and can open new contexts"""
+        return not self.crashed and self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    Class contains pool of already running browsers shared by all tests of one pytest process (every xdist worker
+    gets its own pool). Tests do not own a browser - they open an isolated browser context in it, so browser startup
+    is paid once per pool slot instead of once per test.
+    """
+
+    def __init__(self, launcher: Callable[[], Browser], size: int = 1, recycle_after: int = 0,
+                 context_args: dict = None):
+        """
+        :param launcher: function that launches new browser
+        :param size: max number of browsers running at the same time
+        :param recycle_after: number of tests after which browser is relaunched, 0 - never relaunch
+        :param context_args: default arguments of browser.new_context for every opened context
+        """
+        if size < 1:
+            raise ValueError(f"Browser pool size should be positive, got: {size}")
+
+        self.launcher = launcher
+        self.size = size
+        self.recycle_after = recycle_after
+        self.context_args = context_args or {}
+        self.browsers: List[PooledBrowser] = []
+
+        self.launches = 0
+        self.launch_seconds = 0.0
+        self.recycled = 0
+        self.crashes = 0
+        self.acquisitions = 0
+        self.context_seconds = 0.0
+        self._context_browsers = {}
+
+    def _launch(self) -> PooledBrowser:
+        start = time.perf_counter()
+        browser = self.launcher()
+        launch_time = time.perf_counter() - start
+
+        self.launches += 1
+        self.launch_seconds += launch_time
+        logger.info("Browser pool: launched browser #%s in %.2fs", self.launches, launch_time)
+
+        pooled_browser = PooledBrowser(browser, launch_time)
+        self.browsers.append(pooled_browser)
+        return pooled_browser
+
+    def _discard(self, pooled_browser: PooledBrowser) -> None:
+        self.browsers.remove(pooled_browser)
+        try:
+            pooled_browser.browser.close()
+        except Error:
+            # Browser process is already gone
+            pass
+
+    def _find(self, browser: Browser) -> Optional[PooledBrowser]:
+        for pooled_browser in self.browsers:
+            if pooled_browser.browser is browser:
+                return pooled_browser
+        return None
+
+    def acquire(self) -> Browser:
+        """
+        Method provides browser to open test context in. Crashed browsers are dropped, least loaded healthy browser
+        is reused and new one is launched only while pool is not full
+        :return: running browser
+        """
+        for pooled_browser in [item for item in self.browsers if not item.is_healthy]:
+            logger.warning("Browser pool: dropping crashed browser")
+            self.crashes += 1
+            self._discard(pooled_browser)
+
+        idle_browsers = [item for item in self.browsers if item.active_contexts == 0]
+        if idle_browsers:
+            pooled_browser = min(idle_browsers, key=lambda item: item.tests_served)
+        elif len(self.browsers) < self.size:
+            pooled_browser = self._launch()
+        elif self.browsers:
+            pooled_browser = min(self.browsers, key=lambda item: item.active_contexts)
+        else:
+            pooled_browser = self._launch()
+
+        pooled_browser.active_contexts += 1
+        self.acquisitions += 1
+        return pooled_browser.browser
+
+    def release(self, browser: Browser, crashed: bool = False) -> None:
+        """
+        Method returns browser to the pool after test context was closed. Browser is closed if it crashed or served
+        enough tests to be recycled
+        :param browser: browser returned by acquire method
+        :param crashed: True - if test detected that browser is not usable anymore
+        """
+        pooled_browser = self._find(browser)
+        if pooled_browser is None:
+            # Browser was already dropped from the pool as crashed
+            return
+
+        pooled_browser.active_contexts -= 1
+        pooled_browser.tests_served += 1
+
+        if crashed or not pooled_browser.is_healthy:
+            logger.warning("Browser pool: browser crashed, it will be relaunched")
+            self.crashes += 1
+            self._discard(pooled_browser)
+        elif (self.recycle_after and pooled_browser.tests_served >= self.recycle_after
+              and pooled_browser.active_contexts == 0):
+            logger.info("Browser pool: recycling browser after %s tests", pooled_browser.tests_served)
+            self.recycled += 1
+            self._discard(pooled_browser)
+
+    def open_context(self, **context_args) -> BrowserContext:
+        """
+        Method opens new isolated browser context in one of the pool browsers. If browser crashed meanwhile, context
+        is opened once again in relaunched browser
+        :param context_args: arguments passed to browser.new_context, they override default context arguments of
+                             the pool
+        :return: opened browser context
+        """
+        context_args = {**self.context_args, **context_args}
+        start = time.perf_counter()
+        browser = self.acquire()
+        try:
+            context = browser.new_context(**context_args)
+        except Error:
+            self.release(browser, crashed=True)
+            browser = self.acquire()
+            context = browser.new_context(**context_args)
+
+        self.context_seconds += time.perf_counter() - start
+        self._context_browsers[context] = browser
+        return context
+
+    def close_context(self, context: BrowserContext) -> None:
+        """
+        Method closes browser context opened with open_context method and returns its browser to the pool
+        :param context: context to close
+        """
+        browser = self._context_browsers.pop(context)
+        crashed = False
+        try:
+            context.close()
+        except Error:
+            crashed = not browser.is_connected()
+        self.release(browser, crashed=crashed)
+
+    def close(self) -> None:
+        """Method closes all browsers of the pool"""
+        for pooled_browser in list(self.browsers):
+            self._discard(pooled_browser)
+
+    def summary(self) -> str:
+        """
+        Method provides pool statistics: how many launches were done and how much browser startup time was avoided
+        compared with launching browser for every test
+        """
+        if not self.launches:
+            return "Browser pool: no browsers were launched"
+
+        average_launch = self.launch_seconds / self.launches
+        average_context = self.context_seconds / self.acquisitions if self.acquisitions else 0.0
+        avoided_launches = max(self.acquisitions - self.launches, 0)
+        return (f"Browser pool: {self.acquisitions} tests served by {self.launches} browser launch(es) "
+                f"(pool size: {self.size}, recycled: {self.recycled}, crashed: {self.crashes}); "
+                f"average launch: {average_launch:.2f}s; average context setup: {average_context:.3f}s; "
+                f"startup avoided: ~{avoided_launches * average_launch:.2f}s "
+                f"({average_launch:.2f}s per reused test)")
@@ -0,0 +1,139 @@
+import json
+import logging
+import time
+from typing import Callable, Dict
+
+from playwright.sync_api import Page, Error
+
+logger = logging.getLogger(__name__)
+
+# Restores local storage of checkpoint origins once per browser tab, later navigations keep app's own changes
+RESTORE_LOCAL_STORAGE_SCRIPT = """(origins => {
+    if (sessionStorage.getItem("checkpointRestored")) {
+        return;
+    }
+    const origin = origins.find(item => item.origin === location.origin);
+    if (origin) {
+        origin.localStorage.forEach(item => localStorage.setItem(item.name, item.value));
+    }
+    sessionStorage.setItem("checkpointRestored", "1");
+})(%s)"""
+
+
+class Checkpoint:
+    """Class contains browser state saved after named navigation prefix"""
+
+    def __init__(self, name: str, url: str, storage_state: dict, fingerprint: str, base_url: str):
+        self.name = name
+        self.url = url
+        self.storage_state = storage_state
+        self.fingerprint = fingerprint
+        self.base_url = base_url
+        self.created_at = time.time()
+
+    @property
+    def age(self) -> float:
+        """Seconds passed since checkpoint was saved"""
+        return time.time() - self.created_at
+
+
+class CheckpointStore:
+    """
+    Class contains checkpoints of the session. Checkpoint is saved once after its navigation prefix is passed and later
+    tests start directly from it. Checkpoint becomes stale and is built again if:
+        - it is older than max age (app sessions, prices and booking tokens expire)
+        - it was built for another fingerprint (prefix parameters changed) or another base url
+        - page restored from it doesn't pass readiness check
+    """
+
+    def __init__(self, base_url: str, max_age: float, enabled: bool = True):
+        """
+        :param base_url: url of application home page where every prefix starts
+        :param max_age: seconds after which checkpoint is stale
+        :param enabled: False - always pass navigation prefix
+        """
+        self.base_url = base_url
+        self.max_age = max_age
+        self.enabled = enabled
+        self.checkpoints: Dict[str, Checkpoint] = {}
+        self.builds = 0
+        self.restores = 0
+
+    def get_stale_reason(self, checkpoint: Checkpoint, fingerprint: str) -> str:
+        """
+        Method provides reason why checkpoint can't be used
+        :return: reason, empty string if checkpoint is fresh
+        """
+        if checkpoint.age > self.max_age:
+            return f"it is {checkpoint.age:.0f}s old"
+        if checkpoint.fingerprint != fingerprint:
+            return "prefix parameters changed"
+        if checkpoint.base_url != self.base_url:
+            return "base url changed"
+        return ""
+
+    def invalidate(self, name: str) -> None:
+        """Method provides dropping checkpoint, so it is built again by the next test"""
+        self.checkpoints.pop(name, None)
+
+    def save(self, page: Page, name: str, fingerprint: str) -> Checkpoint:
+        """
+        Method provides saving storage state and url of the page as checkpoint
+        """
+        checkpoint = Checkpoint(name, page.url, page.context.storage_state(), fingerprint, self.base_url)
+        self.checkpoints[name] = checkpoint
+        logger.info("Checkpoint '%s' saved at: %s", name, checkpoint.url)
+        return checkpoint
+
+    def restore(self, page: Page, checkpoint: Checkpoint) -> None:
+        """
+        Method provides opening checkpoint in the page: cookies and local storage are restored to page context and
+        checkpoint url is opened
+        """
+        logger.info("Restore checkpoint '%s': %s", checkpoint.name, checkpoint.url)
+        page.context.add_cookies(checkpoint.storage_state["cookies"])
+        page.context.add_init_script(RESTORE_LOCAL_STORAGE_SCRIPT % json.dumps(checkpoint.storage_state["origins"]))
+        page.goto(checkpoint.url)
+
+    def start_from(self, page: Page, name: str, build: Callable[[], None], is_ready: Callable[[], None],
+                   fingerprint: str = "") -> bool:
+        """
+        Method provides bringing page to the state after named navigation prefix: from fresh checkpoint if it exists,
+        otherwise by passing prefix from the home page and saving checkpoint for next tests
+        :param page: page opened at application home page or blank page, home page is opened if prefix is passed
+        :param name: checkpoint name
+        :param build: function passing navigation prefix from the home page
+        :param is_ready: function waiting until page is in expected state, raises error if it is not
+        :param fingerprint: prefix parameters, checkpoint built with other parameters is stale
+        :return: True - if page was restored from checkpoint, False - if prefix was passed
+        """
+        checkpoint = self.checkpoints.get(name) if self.enabled else None
+        if checkpoint is not None:
+            stale_reason = self.get_stale_reason(checkpoint, fingerprint)
+            if not stale_reason:
+                try:
+                    self.restore(page, checkpoint)
+                    is_ready()
+                    self.restores += 1
+                    return True
+                except (Error, AssertionError) as error:
+                    stale_reason = f"restored page isn't ready: {error}"
+                    # Start prefix from scratch
+                    page.context.clear_cookies()
+                    page.goto(self.base_url)
+
+            logger.info("Checkpoint '%s' is stale: %s", name, stale_reason)
+            self.invalidate(name)
+
+        logger.info("Pass navigation prefix of checkpoint '%s'", name)
+        if page.url == "about:blank":
+            page.goto(self.base_url)
+        build()
+        is_ready()
+        self.builds += 1
+        if self.enabled:
+            self.save(page, name, fingerprint)
+        return False
+
+    def summary(self) -> str:
+        return f"Checkpoints: {self.builds} prefixes passed, {self.restores} tests started from checkpoint"
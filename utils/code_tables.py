@@ -0,0 +1,143 @@
+import csv
+import difflib
+import logging
+from typing import Dict, NamedTuple
+
+from definitions import COUNTRIES_FILE, GENDERS_FILE
+
+logger = logging.getLogger(__name__)
+
+
+class CodeRecord(NamedTuple):
+    """Record of code table: value code used in forms, display name, aliases and phone dial code for countries"""
+    code: str
+    name: str
+    aliases: tuple
+    dial_code: str = ""
+
+
+class CodeTable:
+    """
+    Class contains table of codes loaded from CSV file with code, name and aliases columns (countries have dial_code
+    and dial_code_primary columns too). File is read on first lookup, after that every lookup in both directions is a
+    single dict access. Names, aliases and codes are matched case-insensitively. Unknown values raise ValueError at
+    once, so forms are never filled with missing values
+    """
+
+    def __init__(self, title: str, file_path: str):
+        """
+        :param title: name of values in error messages, e.g. "nationality"
+        :param file_path: path to CSV file
+        """
+        self.title = title
+        self.file_path = file_path
+        self._by_code: Dict[str, CodeRecord] = {}
+        self._by_name: Dict[str, CodeRecord] = {}
+        self._by_dial_code: Dict[str, CodeRecord] = {}
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        """Method provides lookup key of the value: lowercase with single spaces"""
+        return " ".join(str(value).split()).casefold()
+
+    def load(self) -> None:
+        """Method provides reading table file and building lookup indexes"""
+        with open(self.file_path, 'r', encoding="utf-8", newline="") as file:
+            for row in csv.DictReader(file):
+                record = CodeRecord(row["code"], row["name"], tuple(filter(None, row["aliases"].split("|"))),
+                                    row.get("dial_code", ""))
+                self._by_code[self.normalize(record.code)] = record
+                for name in (record.name,) + record.aliases:
+                    self._by_name[self.normalize(name)] = record
+                if record.dial_code and row.get("dial_code_primary", "1") == "1":
+                    self._by_dial_code[record.dial_code] = record
+
+        logger.debug("%s table loaded: %s records", self.title.capitalize(), len(self._by_code))
+
+    @property
+    def by_code(self) -> Dict[str, CodeRecord]:
+        if not self._by_code:
+            self.load()
+        return self._by_code
+
+    @property
+    def by_name(self) -> Dict[str, CodeRecord]:
+        if not self._by_code:
+            self.load()
+        return self._by_name
+
+    @property
+    def by_dial_code(self) -> Dict[str, CodeRecord]:
+        if not self._by_code:
+            self.load()
+        return self._by_dial_code
+
+    def unknown_value_error(self, value: str, index: Dict[str, CodeRecord], field: str = "name",
+                            kind: str = "") -> ValueError:
+        """
+        Method provides error about unknown value with the closest known values as hint
+        :param value: unknown value
+        :param index: index value was looked up in
+        :param field: field of records shown in the hint
+        :param kind: kind of value in error message, e.g. "code"
+        """
+        close_keys = difflib.get_close_matches(self.normalize(value), list(index), n=5)
+        suggestions = list(dict.fromkeys(getattr(index[key], field) for key in close_keys))[:3]
+        hint = f", did you mean: {', '.join(suggestions)}?" if suggestions else ""
+        return ValueError(f"Unknown {' '.join(filter(None, [self.title, kind]))}: '{value}'{hint}")
+
+    def find(self, value: str) -> CodeRecord:
+        """
+        Method provides record by its name, alias or code
+        :param value: name, alias or code, case-insensitive
+        """
+        key = self.normalize(value)
+        record = self.by_name.get(key) or self.by_code.get(key)
+        if record is None:
+            raise self.unknown_value_error(value, self.by_name)
+        return record
+
+    def get_code(self, value: str) -> str:
+        """
+        Method provides code of the value, e.g. "ru" for "Russia" or "Russian Federation"
+        :param value: name, alias or code, case-insensitive
+        """
+        return self.find(value).code
+
+    def get_name(self, code: str) -> str:
+        """
+        Method provides display name of the code, e.g. "Russia" for "ru"
+        :param code: code, case-insensitive
+        """
+        record = self.by_code.get(self.normalize(code))
+        if record is None:
+            raise self.unknown_value_error(code, self.by_code, "code", "code")
+        return record.name
+
+    def get_code_by_dial_code(self, dial_code: str) -> str:
+        """
+        Method provides code of the country of the phone dial code. Dial codes shared by several countries (e.g. +1)
+        belong to the main country
+        :param dial_code: dial code with leading plus, e.g. "+7"
+        """
+        record = self.by_dial_code.get(dial_code.strip())
+        if record is None:
+            raise self.unknown_value_error(dial_code, self.by_dial_code, "dial_code", "dial code")
+        return record.code
+
+    def get_dial_code(self, value: str) -> str:
+        """
+        Method provides phone dial code of the country
+        :param value: country name, alias or code, case-insensitive
+        """
+        return self.find(value).dial_code
+
+    def __iter__(self):
+        return iter(self.by_code.values())
+
+    def __len__(self) -> int:
+        return len(self.by_code)
+
+
+COUNTRIES = CodeTable("country", COUNTRIES_FILE)
+GENDERS = CodeTable("gender", GENDERS_FILE)
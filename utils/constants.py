@@ -4,6 +4,97 @@ BASE_URL = "https://www.kiwi.com/"
 
 SEARCH_RESULTS_TIMEOUT = 60000
 
+# Page is settled when loader is hidden, search API requests are finished and results stop changing for quiet window
+SEARCH_API_URL_PATTERNS = ("/api/search", "/umbrella/v2/graphql")
+READINESS_WATCHED_SELECTOR = "[data-test='ResultList-results'], [data-test='LoadingLine']"
+READINESS_LOADER_SELECTOR = "[data-test='LoadingLine']"
+READINESS_QUIET_WINDOW = 150
+# Timeout of waiting page settled is p95 of previous settle durations of the step multiplied by factor, but not less
+# than min timeout and not more than SEARCH_RESULTS_TIMEOUT
+READINESS_MIN_TIMEOUT = 10000
+READINESS_TIMEOUT_FACTOR = 3
+
+# Preferred strategy of logical selector is probed on this number of lookups at most, then union of all strategies is
+# used without probing, see utils/selector_registry.py
+SELECTOR_PROBE_LIMIT = 3
+# Probe waits this number of milliseconds at most for any strategy of the selector to be attached before probing the
+# preferred one, so strategies aren't judged before the element is rendered
+SELECTOR_PROBE_TIMEOUT = 2000
+
+# Execution profile used by default, see utils/execution_profiles.py
+EXECUTION_PROFILE = "ci"
+
+# Failed retryable action step is retried this number of times with backoff doubled before every retry, only timeouts,
+# selector misses and network failures are retried
+STEP_RETRIES = 2
+STEP_RETRY_BACKOFF = 0.5
+
+# JSON-lines log file of every pytest process is rotated after max size, only last backup files are kept
+LOG_MAX_SIZE_MB = 50
+LOG_BACKUP_COUNT = 5
+
+# Test is flagged as leaking if browser memory after its teardown grew by more than threshold, renderer processes of
+# closed contexts are waited to exit for settle timeout seconds
+LEAK_GUARD_RSS_THRESHOLD_MB = 50
+LEAK_GUARD_SETTLE_TIMEOUT = 1.0
+
+# Action benchmark fails if action p50 became slower than baseline by this share and by more than noise floor
+BENCHMARK_ITERATIONS = 10
+BENCHMARK_THRESHOLD = 0.2
+BENCHMARK_NOISE_FLOOR_MS = 5
+
+# Number of browsers kept running by each pytest process
+BROWSER_POOL_SIZE = 1
+
+# Relaunch pooled browser after this number of tests to drop accumulated renderer state, 0 - never relaunch
+BROWSER_RECYCLE_AFTER_TESTS = 50
+
+
+# Max number of async flows run at the same time by flow runner, flows share one browser
+FLOW_CONCURRENCY = 4
+
+# Max number and total size of failed tests artifacts (trace, screenshots, DOM) kept by every pytest process
+FAILURE_ARTIFACTS_MAX_COUNT = 20
+FAILURE_ARTIFACTS_MAX_SIZE_MB = 500
+
+# Checkpoint older than this number of seconds is stale and its navigation prefix is passed again
+CHECKPOINT_MAX_AGE = 600
+
+# Version of recorded network traffic in HAR store, bump it when recorded flows become outdated
+HAR_STORE_VERSION = "v1"
+
+# Network policy applied to every browser context. Allowed domains are never blocked
+BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+ALLOWED_DOMAINS = ("api.skypicker.com", "api.kiwi.com")
+BLOCKED_DOMAINS = (
+    "adnxs.com",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "youtube.com",
+)
+# Third-party trackers are answered with empty 204 response, so page scripts waiting for them are not broken
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "bing.com",
+    "clarity.ms",
+    "tiktok.com",
+    "sentry.io",
+    "optimizely.com",
+)
+
+
+class NetworkMode(Enum):
+    LIVE = "live"
+    RECORD = "record"
+    REPLAY = "replay"
+
 
 class StopsFilterValues(Enum):
     ONE_STOP = "Up to 1 stop"
@@ -13,14 +104,7 @@ class ExcludeCountriesFilterValues(Enum):
     UK = "United Kingdom"
 
 
-PHONE_COUNTRY_CODE_VALUE_MATCH = {
-    "+7": "ru"
-}
-
-NATIONALITY_CODE_VALUE_MATCH = {
-    "Russia": "ru"
-}
-
-GENDER_CODE_VALUE_MATCH = {
-    "Male": "mr"
+# Values of filters in search results url
+STOPS_FILTER_URL_VALUE_MATCH = {
+    StopsFilterValues.ONE_STOP: 1
 }
@@ -0,0 +1,63 @@
+import logging
+from typing import Dict, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Chromium switches of perf profile. Playwright already disables extensions, background networking, background timer
+# throttling and renderer backgrounding by default, so only switches it doesn't pass are listed. --disable-features
+# isn't used, it would replace the features list passed by Playwright
+PERF_LAUNCH_ARGS = (
+    "--disable-gpu",
+    "--disable-software-rasterizer",
+    "--disable-sync",
+    "--disable-notifications",
+    "--disable-site-isolation-trials",
+    "--blink-settings=imagesEnabled=false",
+)
+# Reduced viewport of perf profile, still wide enough for desktop layout with filters sidebar
+PERF_VIEWPORT = {"width": 1024, "height": 768}
+
+
+class ExecutionProfile(NamedTuple):
+    name: str
+    headless: bool
+    launch_args: Tuple[str, ...] = ()
+    slow_mo: int = 0
+    viewport: Optional[Dict[str, int]] = None
+
+    def launch_options(self) -> dict:
+        """Method provides arguments of browser_type.launch"""
+        options = {"headless": self.headless, "args": list(self.launch_args)}
+        if self.slow_mo:
+            options["slow_mo"] = self.slow_mo
+        return options
+
+    def context_options(self) -> dict:
+        """Method provides arguments of browser.new_context, empty for default context"""
+        return {"viewport": self.viewport} if self.viewport is not None else {}
+
+
+EXECUTION_PROFILES = {
+    # Headed browser with slowed down actions to watch the test
+    "debug": ExecutionProfile("debug", headless=False, slow_mo=100),
+    # Headless browser with default settings
+    "ci": ExecutionProfile("ci", headless=True),
+    # Headless browser tuned for startup time and memory
+    "perf": ExecutionProfile("perf", headless=True, launch_args=PERF_LAUNCH_ARGS, viewport=PERF_VIEWPORT),
+}
+
+
+def get_execution_profile(name: str, headless: Optional[bool] = None) -> ExecutionProfile:
+    """
+    Function provides execution profile by its name
+    :param name: one of EXECUTION_PROFILES names
+    :param headless: overrides headless mode of the profile, None - mode of the profile is used
+    """
+    if name not in EXECUTION_PROFILES:
+        raise ValueError(f"Unknown execution profile: {name}, expected one of: {', '.join(EXECUTION_PROFILES)}")
+
+    profile = EXECUTION_PROFILES[name]
+    if headless is not None and headless != profile.headless:
+        logger.info("Execution profile %s: headless mode is overridden to %s", name, headless)
+        profile = profile._replace(headless=headless)
+    return profile
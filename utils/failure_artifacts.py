@@ -0,0 +1,190 @@
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from playwright.sync_api import BrowserContext, Error
+
+logger = logging.getLogger(__name__)
+
+
+class FailureArtifacts:
+    """
+    Class contains capturing of debug artifacts for failed tests. Tracing is started for every context and its
+    recording is dropped if test passes. For failed test trace, screenshot and gzipped DOM of every page are kept.
+    Context shared by several tests is traced in chunks, one chunk per test, so every failure gets its own trace.
+    Only data that needs the browser is taken in the test thread, files are written by background thread. Number and
+    total size of kept failures are capped, the oldest failures are removed first
+    """
+
+    def __init__(self, root_dir: str, enabled: bool = True, max_count: int = 20, max_size_mb: int = 500):
+        """
+        :param root_dir: directory to keep failures artifacts in, every failure gets its own subdirectory
+        :param enabled: False - tracing isn't started and nothing is captured
+        :param max_count: max number of kept failures
+        :param max_size_mb: max total size of kept failures in megabytes
+        """
+        self.root_dir = root_dir
+        self.enabled = enabled
+        self.max_count = max_count
+        self.max_size = max_size_mb * 1024 * 1024
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="failure-artifacts")
+        self.captured = 0
+
+    def start(self, context: BrowserContext) -> None:
+        """Method provides starting tracing of the context"""
+        if self.enabled:
+            context.tracing.start(screenshots=True, snapshots=True)
+
+    def finish(self, context: BrowserContext, name: str, failed: bool, chunk: bool = False) -> Optional[str]:
+        """
+        Method provides stopping tracing of the context and capturing artifacts if test failed
+        :param context: context of the test, it should be still open
+        :param name: test node id
+        :param failed: True - test failed and artifacts are kept
+        :param chunk: True - only trace chunk of the test is stopped, tracing of shared context goes on
+        :return: path to directory with artifacts, None - if nothing is captured
+        """
+        if not self.enabled:
+            return None
+
+        stop_tracing = context.tracing.stop_chunk if chunk else context.tracing.stop
+        if not failed:
+            try:
+                stop_tracing()
+            except Error as error:
+                # Browser or context crashed, there is nothing to drop
+                logger.warning("Tracing of %s isn't stopped: %s", name, error)
+            return None
+
+        failure_dir = self.create_failure_dir(name)
+        pages = []
+        for index, page in enumerate(context.pages):
+            try:
+                pages.append((index, page.url, page.screenshot(), page.content()))
+            except Error as error:
+                logger.warning("Page %s of failed test %s isn't captured: %s", index, name, error)
+        try:
+            stop_tracing(path=os.path.join(failure_dir, "trace.zip"))
+        except Error as error:
+            logger.warning("Trace of failed test %s isn't saved: %s", name, error)
+
+        self.submit(failure_dir, name, pages)
+        return failure_dir
+
+    async def async_start(self, context) -> None:
+        """Method provides starting tracing of async API context"""
+        if self.enabled:
+            await context.tracing.start(screenshots=True, snapshots=True)
+
+    async def async_finish(self, context, name: str, failed: bool) -> Optional[str]:
+        """
+        Method provides stopping tracing of async API context and capturing artifacts if flow failed, see finish
+        :param context: async context of the flow, it should be still open
+        :param name: test node id with flow name
+        :param failed: True - flow failed and artifacts are kept
+        :return: path to directory with artifacts, None - if nothing is captured
+        """
+        if not self.enabled:
+            return None
+
+        if not failed:
+            try:
+                await context.tracing.stop()
+            except Error as error:
+                logger.warning("Tracing of %s isn't stopped: %s", name, error)
+            return None
+
+        failure_dir = self.create_failure_dir(name)
+        pages = []
+        for index, page in enumerate(context.pages):
+            try:
+                pages.append((index, page.url, await page.screenshot(), await page.content()))
+            except Error as error:
+                logger.warning("Page %s of failed flow %s isn't captured: %s", index, name, error)
+        try:
+            await context.tracing.stop(path=os.path.join(failure_dir, "trace.zip"))
+        except Error as error:
+            logger.warning("Trace of failed flow %s isn't saved: %s", name, error)
+
+        self.submit(failure_dir, name, pages)
+        return failure_dir
+
+    def create_failure_dir(self, name: str) -> str:
+        """Method provides creating directory for artifacts of the failed test"""
+        failure_dir = os.path.join(self.root_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.get_slug(name)}")
+        os.makedirs(failure_dir, exist_ok=True)
+        return failure_dir
+
+    def submit(self, failure_dir: str, name: str, pages: List[Tuple[int, str, bytes, str]]) -> None:
+        """Method provides writing captured pages of the failed test in background thread"""
+        self.captured += 1
+        self.executor.submit(self.write, failure_dir, name, pages)
+        logger.info("Artifacts of failed test %s: %s", name, failure_dir)
+
+    def finish_chunk(self, context: BrowserContext, name: str, failed: bool) -> Optional[str]:
+        """
+        Method provides capturing artifacts of one test of shared context and starting trace chunk of the next test
+        :param context: context shared by tests, it should be still open
+        :param name: test node id
+        :param failed: True - test failed and artifacts are kept
+        :return: path to directory with artifacts, None - if nothing is captured
+        """
+        failure_dir = self.finish(context, name, failed, chunk=True)
+        if self.enabled:
+            try:
+                context.tracing.start_chunk()
+            except Error as error:
+                logger.warning("Trace chunk after %s isn't started: %s", name, error)
+        return failure_dir
+
+    @staticmethod
+    def get_slug(name: str) -> str:
+        """Method provides file system safe name of the test"""
+        return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")[-120:]
+
+    def write(self, failure_dir: str, name: str, pages: List[Tuple[int, str, bytes, str]]) -> None:
+        """
+        Method provides writing captured pages to failure directory and applying retention cap. Is run in background
+        thread
+        """
+        try:
+            for index, _, screenshot, content in pages:
+                with open(os.path.join(failure_dir, f"page-{index}.png"), 'wb') as file:
+                    file.write(screenshot)
+                with gzip.open(os.path.join(failure_dir, f"page-{index}.html.gz"), 'wt', encoding="utf-8") as file:
+                    file.write(content)
+
+            with open(os.path.join(failure_dir, "failure.json"), 'w') as file:
+                json.dump({"test": name, "pages": [url for _, url, _, _ in pages]}, file, indent=4)
+
+            self.apply_retention()
+        except Exception:
+            logger.exception("Artifacts of failed test %s aren't written", name)
+
+    @staticmethod
+    def get_dir_size(path: str) -> int:
+        """Method provides total size of files in directory in bytes"""
+        return sum(os.path.getsize(os.path.join(root, file_name))
+                   for root, _, file_names in os.walk(path) for file_name in file_names)
+
+    def apply_retention(self) -> None:
+        """Method provides removing the oldest failures above max count and max total size"""
+        failure_dirs = sorted((os.path.join(self.root_dir, name) for name in os.listdir(self.root_dir)),
+                              key=os.path.getmtime, reverse=True)
+        total_size = 0
+        for index, failure_dir in enumerate(failure_dirs):
+            total_size += self.get_dir_size(failure_dir)
+            # The newest failure is always kept
+            if index and (index >= self.max_count or total_size > self.max_size):
+                logger.info("Remove old failure artifacts: %s", failure_dir)
+                shutil.rmtree(failure_dir, ignore_errors=True)
+
+    def close(self) -> None:
+        """Method provides waiting until all artifacts are written"""
+        self.executor.shutdown(wait=True)
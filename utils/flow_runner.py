@@ -0,0 +1,162 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import threading
+import time
+from typing import AsyncContextManager, Awaitable, Callable, Coroutine, Dict, List, NamedTuple, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+# Flow drives one page opened on application home page, e.g. with AsyncSearchResultsActions
+Flow = Callable[[Page], Awaitable[None]]
+# Opens set up context of the flow in the browser by flow name and closes it on exit, flow exception is raised inside
+ContextFactory = Callable[[Browser, str], AsyncContextManager[BrowserContext]]
+
+
+class FlowResult(NamedTuple):
+    name: str
+    seconds: float
+    error: Optional[BaseException]
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None
+
+
+class FlowBrowser:
+    """
+    Class contains browser of playwright async API shared by all flows of the session. Playwright objects are bound to
+    the event loop they are created in, so one event loop is run in a dedicated thread for the whole session, and runner
+    can be used next to sync playwright of the test session
+    """
+
+    def __init__(self, launch_options: dict = None):
+        """
+        :param launch_options: arguments of browser launch, see ExecutionProfile.launch_options
+        """
+        self.launch_options = launch_options or {"headless": True}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.playwright = None
+        self.browser: Optional[Browser] = None
+
+    def start(self) -> None:
+        """Method provides starting event loop thread and launching the browser in it"""
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="flow-browser", daemon=True)
+        self.thread.start()
+        self.run(self.launch())
+
+    async def launch(self) -> None:
+        """Method provides starting playwright and launching the browser, is run in the event loop of the browser"""
+        self.playwright = await async_playwright().start()
+        self.playwright.selectors.set_test_id_attribute("data-test")
+        self.browser = await self.playwright.chromium.launch(**self.launch_options)
+        logger.info("Flow browser is launched: %s", self.browser.version)
+
+    def run(self, coroutine: Coroutine):
+        """
+        Method provides running coroutine in the event loop of the browser and waiting for its result. Coroutine is run
+        with context variables of the caller, so flows log with correlation id of the test they are run by
+        """
+        future = concurrent.futures.Future()
+
+        def on_done(task: asyncio.Task) -> None:
+            if task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+        def create_task() -> None:
+            self.loop.create_task(coroutine).add_done_callback(on_done)
+
+        self.loop.call_soon_threadsafe(create_task, context=contextvars.copy_context())
+        return future.result()
+
+    async def shutdown(self) -> None:
+        """Method provides closing the browser and stopping playwright, is run in the event loop of the browser"""
+        if self.browser is not None:
+            await self.browser.close()
+        if self.playwright is not None:
+            await self.playwright.stop()
+
+    def close(self) -> None:
+        """Method provides closing the browser and stopping event loop thread"""
+        if self.loop is None:
+            return
+
+        try:
+            self.run(self.shutdown())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+            self.loop = None
+
+
+class FlowRunner:
+    """
+    Class contains running many independent flows at once on playwright async API. All flows share one browser, every
+    flow gets its own browser context and page opened by context factory, so flows are isolated and set up the same
+    way tests are
+    """
+
+    def __init__(self, browser: FlowBrowser, app_url: str, context_factory: ContextFactory, concurrency: int = 4):
+        """
+        :param browser: started browser shared by flows
+        :param app_url: home page url every flow is started from
+        :param context_factory: opens context of every flow, e.g. with HAR store and network policy installed
+        :param concurrency: max number of flows running at the same time
+        """
+        if concurrency < 1:
+            raise ValueError(f"Flows concurrency should be positive, got: {concurrency}")
+
+        self.browser = browser
+        self.app_url = app_url
+        self.context_factory = context_factory
+        self.concurrency = concurrency
+
+    def run(self, flows: Dict[str, Flow]) -> List[FlowResult]:
+        """
+        Method provides running flows concurrently and waiting until all of them are finished. Failure of one flow
+        doesn't stop the others
+        :param flows: flows by their names
+        :return: result of every flow in the same order as flows
+        """
+        results = self.browser.run(self.run_async(flows))
+
+        failed = [result.name for result in results if not result.passed]
+        logger.info("%s of %s flows passed, concurrency: %s%s", len(results) - len(failed), len(results),
+                    self.concurrency, f", failed: {failed}" if failed else "")
+        return results
+
+    async def run_async(self, flows: Dict[str, Flow]) -> List[FlowResult]:
+        """Method provides running flows concurrently inside event loop of the browser, see run"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return list(await asyncio.gather(*(self.run_flow(semaphore, name, flow) for name, flow in flows.items())))
+
+    async def run_flow(self, semaphore: asyncio.Semaphore, name: str, flow: Flow) -> FlowResult:
+        """
+        Method provides running one flow in its own context, exception of the flow is raised inside the context
+        factory, so it can capture failure artifacts, and then returned in the result
+        """
+        async with semaphore:
+            start = time.perf_counter()
+            error = None
+            try:
+                async with self.context_factory(self.browser.browser, name) as context:
+                    page = await context.new_page()
+                    await page.goto(self.app_url)
+                    await flow(page)
+            except Exception as exception:
+                logger.warning("Flow %s failed: %r", name, exception)
+                error = exception
+
+            seconds = time.perf_counter() - start
+            logger.info("Flow %s finished in %.2f s", name, seconds)
+            return FlowResult(name, seconds, error)
@@ -0,0 +1,124 @@
+import json
+import logging
+import os
+import time
+from importlib.metadata import version
+
+from playwright.sync_api import BrowserContext
+from slugify import slugify
+
+from utils.constants import NetworkMode
+
+logger = logging.getLogger(__name__)
+
+
+class HarStore:
+    """
+    Class contains versioned store of recorded network traffic. Every test gets its own HAR archive, so recordings
+    can be refreshed test by test:
+        <root>/<version>/<test_slug>.har.zip - recorded requests and responses
+        <root>/<version>/<test_slug>.json - recording metadata
+    """
+
+    def __init__(self, root_dir: str, version_name: str, mode: NetworkMode):
+        """
+        :param root_dir: directory with all HAR store versions
+        :param version_name: version of recordings to record or replay
+        :param mode: network mode of the session
+        """
+        self.store_dir = os.path.join(root_dir, version_name)
+        self.version_name = version_name
+        self.mode = mode
+
+    def har_path(self, test_id: str) -> str:
+        """
+        Method provides HAR archive path for the test
+        :param test_id: pytest node id of the test
+        """
+        return os.path.join(self.store_dir, f"{slugify(test_id)}.har.zip")
+
+    def metadata_path(self, test_id: str) -> str:
+        """
+        Method provides recording metadata path for the test
+        :param test_id: pytest node id of the test
+        """
+        return os.path.join(self.store_dir, f"{slugify(test_id)}.json")
+
+    def attach(self, context: BrowserContext, test_id: str, base_url: str) -> None:
+        """
+        Method provides routing context network through HAR store according to the session network mode. In record
+        mode traffic is saved when context is closed, in replay mode every request is served from disk and requests
+        missing in recording are aborted, so test never goes to the network
+        :param context: browser context of the test
+        :param test_id: pytest node id of the test
+        :param base_url: application url the test is run against
+        """
+        if self.mode == NetworkMode.RECORD:
+            self.start_recording(context, test_id, base_url)
+        elif self.mode == NetworkMode.REPLAY:
+            self.start_replay(context, test_id, base_url)
+
+    async def async_attach(self, context, test_id: str, base_url: str) -> None:
+        """
+        Method provides routing network of async API context through HAR store, see attach
+        :param context: async browser context of the flow
+        :param test_id: pytest node id of the test with the flow name
+        :param base_url: application url the flow is run against
+        """
+        if self.mode == NetworkMode.RECORD:
+            await context.route_from_har(self.prepare_recording(test_id, base_url), update=True,
+                                         update_content="attach", update_mode="full")
+        elif self.mode == NetworkMode.REPLAY:
+            await context.route_from_har(self.prepare_replay(test_id, base_url), not_found="abort")
+
+    def start_recording(self, context: BrowserContext, test_id: str, base_url: str) -> None:
+        """
+        Method provides recording all requests and responses of the context to the HAR store
+        """
+        context.route_from_har(self.prepare_recording(test_id, base_url), update=True, update_content="attach",
+                               update_mode="full")
+
+    def prepare_recording(self, test_id: str, base_url: str) -> str:
+        """
+        Method provides writing recording metadata of the test
+        :return: path to HAR archive to record to
+        """
+        har_path = self.har_path(test_id)
+        logger.info("Record network traffic to: %s", har_path)
+        os.makedirs(self.store_dir, exist_ok=True)
+
+        metadata = {
+            "version": self.version_name,
+            "test_id": test_id,
+            "base_url": base_url,
+            "playwright": version("playwright"),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        }
+        with open(self.metadata_path(test_id), 'w') as file:
+            json.dump(metadata, file, indent=4)
+        return har_path
+
+    def start_replay(self, context: BrowserContext, test_id: str, base_url: str) -> None:
+        """
+        Method provides serving all requests of the context from the HAR store
+        """
+        context.route_from_har(self.prepare_replay(test_id, base_url), not_found="abort")
+
+    def prepare_replay(self, test_id: str, base_url: str) -> str:
+        """
+        Method provides checking that traffic of the test is recorded
+        :return: path to HAR archive to replay
+        """
+        har_path = self.har_path(test_id)
+        if not os.path.exists(har_path):
+            raise FileNotFoundError(f"There is no recorded traffic for {test_id} in HAR store version "
+                                    f"{self.version_name}: {har_path}. Run test with --network-mode=record first")
+
+        with open(self.metadata_path(test_id), 'r') as file:
+            metadata = json.load(file)
+        if metadata["base_url"] != base_url:
+            logger.warning("Traffic was recorded against %s, but test is run against %s", metadata["base_url"],
+                           base_url)
+
+        logger.info("Replay network traffic recorded at %s from: %s", metadata["recorded_at"], har_path)
+        return har_path
@@ -0,0 +1,174 @@
+import json
+import logging
+import mimetypes
+import os
+import random
+import threading
+import time
+import zlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from utils.code_tables import COUNTRIES
+
+logger = logging.getLogger(__name__)
+
+CARRIERS = ["Iberia", "Vueling", "British Airways", "Lufthansa", "Air France", "KLM", "TAP Air Portugal",
+            "Aer Lingus", "Icelandair", "Swiss", "Delta", "United"]
+LAYOVERS = [("LHR", "United Kingdom"), ("LGW", "United Kingdom"), ("FRA", "Germany"), ("MUC", "Germany"),
+            ("CDG", "France"), ("AMS", "Netherlands"), ("LIS", "Portugal"), ("DUB", "Ireland"), ("KEF", "Iceland"),
+            ("ZRH", "Switzerland")]
+FLIGHTS_PER_SEARCH = 60
+
+
+def generate_flights(search_key: str) -> list:
+    """
+    Function provides deterministic list of flights for the search
+    :param search_key: string identifying the search (origin, destination and dates)
+    :return: list of flights sorted by price
+    """
+    generator = random.Random(zlib.crc32(search_key.encode()))
+    flights = []
+    for index in range(FLIGHTS_PER_SEARCH):
+        # Outbound and inbound trips have the same number of stops
+        stops = generator.choices([0, 1, 2], weights=[1, 5, 3])[0]
+        sectors = [[{"airport": airport, "country": country} for airport, country in generator.sample(LAYOVERS, stops)]
+                   for _ in range(2)]
+        flights.append({
+            "id": f"{zlib.crc32(search_key.encode()):08x}-{index}",
+            "price": generator.randint(250, 1500),
+            "duration": generator.randint(8 * 60, 30 * 60),
+            "stops": max(len(sector) for sector in sectors),
+            "carriers": generator.sample(CARRIERS, generator.randint(1, 3)),
+            "sectors": sectors,
+        })
+
+    return sorted(flights, key=lambda flight: (flight["price"], flight["id"]))
+
+
+def search_flights(query: dict) -> dict:
+    """
+    Function provides search API response: generated flights filtered by max number of stops and excluded layover
+    countries, paginated with offset and limit
+    :param query: parsed query string of search API request
+    """
+    def get(name, default=""):
+        return query.get(name, [default])[0]
+
+    search_key = "/".join([get("from"), get("to"), get("departure"), get("return")])
+    max_stops = int(get("maxStops", "2"))
+    excluded_countries = set(filter(None, get("excludeCountries").split(",")))
+    offset = int(get("offset", "0"))
+    limit = int(get("limit", "10"))
+
+    flights = [flight for flight in generate_flights(search_key)
+               if flight["stops"] <= max_stops
+               and not any(layover["country"] in excluded_countries
+                           for sector in flight["sectors"] for layover in sector)]
+    return {"total": len(flights), "flights": flights[offset:offset + limit]}
+
+
+class MockSiteRequestHandler(BaseHTTPRequestHandler):
+    """Class contains request handler of mock site pages, static files and search API"""
+    server: "MockServer"
+
+    PAGES = {
+        "/": "index.html",
+        "/en/search/results": "results.html",
+        "/en/booking": "booking.html",
+    }
+
+    def log_message(self, format_string, *args) -> None:
+        logger.debug("Mock server: " + format_string, *args)
+
+    def send_body(self, body: bytes, content_type: str, status: int = 200) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        time.sleep(self.server.latency)
+        url = urlparse(self.path)
+
+        if url.path == "/api/search":
+            time.sleep(self.server.api_latency)
+            body = json.dumps(search_flights(parse_qs(url.query))).encode()
+            self.send_body(body, "application/json")
+            return
+
+        if url.path == "/static/countries.js":
+            countries = [[country.code, country.name, country.dial_code] for country in COUNTRIES]
+            self.send_body(f"const COUNTRIES = {json.dumps(countries)};".encode(), "text/javascript")
+            return
+
+        page_name = next((page for prefix, page in self.PAGES.items()
+                          if url.path == prefix or prefix != "/" and url.path.startswith(f"{prefix}/")), None)
+        file_name = page_name or url.path.lstrip("/")
+        file_path = os.path.normpath(os.path.join(self.server.site_dir, file_name))
+        is_inside_site = os.path.commonpath([file_path, self.server.site_dir]) == self.server.site_dir
+        if not is_inside_site or not os.path.isfile(file_path):
+            self.send_body(b"Not found", "text/plain", status=404)
+            return
+
+        with open(file_path, 'rb') as file:
+            body = file.read()
+        self.send_body(body, mimetypes.guess_type(file_path)[0] or "application/octet-stream")
+
+
+class MockServer(ThreadingHTTPServer):
+    """
+    Class contains local stand-in of kiwi.com: pages with the same data-test hooks and styled components class names
+    that actions use, and deterministic search API. Server is run in background thread
+    """
+    daemon_threads = True
+
+    def __init__(self, site_dir: str, latency: float = 0.0, api_latency: float = 0.0, port: int = 0):
+        """
+        :param site_dir: directory with mock site pages and static files
+        :param latency: seconds every response is delayed
+        :param api_latency: additional seconds search API responses are delayed
+        :param port: port to listen on, 0 - any free port
+        """
+        super().__init__(("127.0.0.1", port), MockSiteRequestHandler)
+        self.site_dir = os.path.abspath(site_dir)
+        self.latency = latency
+        self.api_latency = api_latency
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        """Home page url of the mock site"""
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def start(self) -> None:
+        """Method starts serving requests in background thread"""
+        self.thread = threading.Thread(target=self.serve_forever, name="mock-server", daemon=True)
+        self.thread.start()
+        logger.info("Mock server started at %s (latency: %ss, api latency: %ss)", self.url, self.latency,
+                    self.api_latency)
+
+    def stop(self) -> None:
+        """Method stops serving requests and closes server socket"""
+        self.shutdown()
+        self.server_close()
+        self.thread.join()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from definitions import MOCK_SITE_DIR
+
+    parser = argparse.ArgumentParser(description="Local stand-in of kiwi.com for tests and load testing")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=int, default=0, help="Milliseconds every response is delayed")
+    parser.add_argument("--api-latency", type=int, default=0, help="Additional milliseconds of search API delay")
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    mock_server = MockServer(MOCK_SITE_DIR, arguments.latency / 1000, arguments.api_latency / 1000, arguments.port)
+    logger.info("Mock server is serving at %s", mock_server.url)
+    mock_server.serve_forever()
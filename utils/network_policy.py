@@ -0,0 +1,166 @@
+import logging
+from collections import Counter
+from typing import Dict, Iterable
+from urllib.parse import urlparse
+
+from playwright.sync_api import BrowserContext, Response, Route, Request
+
+logger = logging.getLogger(__name__)
+
+
+def matches_domain(host: str, domains: Iterable[str]) -> bool:
+    """
+    Function verifies whether host is one of the domains or their subdomain
+    :param host: request host name
+    :param domains: domain names to match against
+    """
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+class NetworkStats:
+    """Class contains network counters of one test"""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes_received = 0
+        self.blocked = Counter()
+        self.stubbed = Counter()
+        self.bytes_saved = 0
+
+    @property
+    def requests_saved(self) -> int:
+        """Number of requests that never reached the network"""
+        return sum(self.blocked.values()) + sum(self.stubbed.values())
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "requests_saved": self.requests_saved,
+            "blocked": dict(self.blocked),
+            "stubbed": dict(self.stubbed),
+            "bytes_received": self.bytes_received,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def summary(self) -> str:
+        return (f"Network: {self.requests} requests, {self.bytes_received} bytes received; "
+                f"saved {self.requests_saved} requests (blocked: {dict(self.blocked)}, stubbed: {dict(self.stubbed)}), "
+                f"~{self.bytes_saved} bytes")
+
+
+class NetworkPolicy:
+    """
+    Class contains request shaping rules applied to every browser context. Rules are checked in order:
+        1. allowed domains are always passed to the network
+        2. tracker domains are stubbed with empty 204 response
+        3. blocked domains are aborted
+        4. blocked resource types are aborted
+    Bytes saved are estimated from average response sizes per resource type, learned from responses that were
+    let through (run once with policy disabled to learn sizes of blocked resource types)
+    """
+
+    def __init__(self, blocked_resource_types: Iterable[str], blocked_domains: Iterable[str],
+                 allowed_domains: Iterable[str], tracker_domains: Iterable[str], enabled: bool = True,
+                 size_estimates: Dict[str, list] = None):
+        """
+        :param blocked_resource_types: playwright resource types to abort, e.g. "image", "font"
+        :param blocked_domains: domains to abort all requests to
+        :param allowed_domains: domains that are never blocked
+        :param tracker_domains: domains to stub with empty responses
+        :param enabled: False - only collect statistics without blocking anything
+        :param size_estimates: resource type -> [total bytes, number of responses] learned in previous sessions
+        """
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        self.blocked_domains = tuple(blocked_domains)
+        self.allowed_domains = tuple(allowed_domains)
+        self.tracker_domains = tuple(tracker_domains)
+        self.enabled = enabled
+        self.size_estimates = size_estimates if size_estimates is not None else {}
+
+    def install(self, context: BrowserContext, stats: NetworkStats) -> None:
+        """
+        Method provides applying policy to all pages of the context
+        :param context: browser context of the test
+        :param stats: counters to collect test network statistics to
+        """
+        context.on("response", lambda response: self.count_response(response, stats))
+        if self.enabled:
+            context.route("**/*", lambda route: self.handle(route, stats))
+
+    async def async_install(self, context, stats: NetworkStats) -> None:
+        """
+        Method provides applying policy to all pages of async API context, see install
+        :param context: async browser context of the flow
+        :param stats: counters to collect flow network statistics to
+        """
+        context.on("response", lambda response: self.count_response(response, stats))
+        if self.enabled:
+            await context.route("**/*", lambda route: self.async_handle(route, stats))
+
+    def count_response(self, response: Response, stats: NetworkStats) -> None:
+        stats.requests += 1
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdigit():
+            size = int(content_length)
+            stats.bytes_received += size
+            self.learn_size(response.request.resource_type, size)
+
+    def learn_size(self, resource_type: str, size: int) -> None:
+        total, count = self.size_estimates.get(resource_type, (0, 0))
+        self.size_estimates[resource_type] = [total + size, count + 1]
+
+    def estimated_size(self, resource_type: str) -> int:
+        total, count = self.size_estimates.get(resource_type, (0, 0))
+        return total // count if count else 0
+
+    def decide(self, request: Request) -> str:
+        """
+        Method provides policy decision for the request
+        :return: "allow", "stub" or "block"
+        """
+        host = urlparse(request.url).hostname or ""
+        if matches_domain(host, self.allowed_domains):
+            return "allow"
+        if matches_domain(host, self.tracker_domains):
+            return "stub"
+        if matches_domain(host, self.blocked_domains):
+            return "block"
+        if request.resource_type in self.blocked_resource_types:
+            return "block"
+        return "allow"
+
+    def account(self, request: Request, stats: NetworkStats) -> str:
+        """
+        Method provides policy decision for the request and counting saved requests and bytes
+        :return: "allow", "stub" or "block"
+        """
+        decision = self.decide(request)
+        if decision == "allow":
+            return decision
+
+        stats.bytes_saved += self.estimated_size(request.resource_type)
+        if decision == "stub":
+            stats.stubbed[request.resource_type] += 1
+        else:
+            stats.blocked[request.resource_type] += 1
+        return decision
+
+    def handle(self, route: Route, stats: NetworkStats) -> None:
+        decision = self.account(route.request, stats)
+        if decision == "allow":
+            # Let other routes (e.g. HAR replay) handle request
+            route.fallback()
+        elif decision == "stub":
+            route.fulfill(status=204, body="")
+        else:
+            route.abort("blockedbyclient")
+
+    async def async_handle(self, route, stats: NetworkStats) -> None:
+        """Method provides handling request of async API context, see handle"""
+        decision = self.account(route.request, stats)
+        if decision == "allow":
+            await route.fallback()
+        elif decision == "stub":
+            await route.fulfill(status=204, body="")
+        else:
+            await route.abort("blockedbyclient")
@@ -0,0 +1,95 @@
+import csv
+import json
+import logging
+import os
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Max number of parsed records kept per matrix file, the least recently read records are dropped first
+RECORDS_CACHE_LIMIT = 256
+# Parsed records of matrix files: {file_path: (file mtime, {record offset: record})}
+RECORDS_CACHE: Dict[str, Tuple[float, Dict[int, dict]]] = {}
+# Offsets of records in matrix files: {file_path: (file mtime, [record offset])}
+OFFSETS_CACHE: Dict[str, Tuple[float, List[int]]] = {}
+
+
+def is_csv_file(file_path: str) -> bool:
+    """Function verifies whether matrix file is CSV file, otherwise it is JSONL file"""
+    return os.path.splitext(file_path)[1].lower() == ".csv"
+
+
+def parse_record_line(file_path: str, line: str, header: List[str] = None) -> dict:
+    """
+    Function provides record parsed from one line of matrix file. Empty values are dropped, so missing fields are
+    left empty in the form
+    :param file_path: path to JSONL or CSV file
+    :param line: line with the record
+    :param header: CSV column names
+    """
+    if is_csv_file(file_path):
+        values = next(csv.reader([line]))
+        record = dict(zip(header, values))
+    else:
+        record = json.loads(line)
+
+    return {name: value for name, value in record.items() if value not in ("", None)}
+
+
+def read_csv_header(file) -> List[str]:
+    """Function provides column names from the first line of CSV file opened in binary mode"""
+    return next(csv.reader([file.readline().decode()]))
+
+
+def get_record_offsets(file_path: str) -> List[int]:
+    """
+    Function provides byte offsets of all records in matrix file without parsing them. Offsets are cached until file
+    is modified
+    :param file_path: path to JSONL file (one json object per line) or CSV file with header, every record is one line
+    :return: list of offsets of record lines
+    """
+    mtime = os.path.getmtime(file_path)
+    cached = OFFSETS_CACHE.get(file_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    offsets = []
+    with open(file_path, 'rb') as file:
+        if is_csv_file(file_path):
+            file.readline()
+        offset = file.tell()
+        for line in iter(file.readline, b""):
+            if line.strip():
+                offsets.append(offset)
+            offset += len(line)
+
+    OFFSETS_CACHE[file_path] = (mtime, offsets)
+    return offsets
+
+
+def read_record(file_path: str, offset: int) -> dict:
+    """
+    Function provides record of matrix file located at the offset. Parsed records are cached until file is modified,
+    up to RECORDS_CACHE_LIMIT records per file
+    :param file_path: path to JSONL or CSV file
+    :param offset: offset of record line, see get_record_offsets
+    """
+    mtime = os.path.getmtime(file_path)
+    cached_mtime, records = RECORDS_CACHE.get(file_path, (None, {}))
+    if cached_mtime != mtime:
+        records = {}
+        RECORDS_CACHE[file_path] = (mtime, records)
+
+    if offset in records:
+        # Move record to the end, so it is dropped last
+        records[offset] = records.pop(offset)
+    else:
+        with open(file_path, 'rb') as file:
+            header = read_csv_header(file) if is_csv_file(file_path) else None
+            file.seek(offset)
+            records[offset] = parse_record_line(file_path, file.readline().decode(), header)
+        if len(records) > RECORDS_CACHE_LIMIT:
+            records.pop(next(iter(records)))
+
+    return dict(records[offset])
+
@@ -0,0 +1,187 @@
+import json
+import logging
+import math
+import time
+from typing import Dict, List
+
+from playwright.sync_api import BrowserContext, Page, TimeoutError
+
+from utils.constants import (SEARCH_API_URL_PATTERNS, READINESS_WATCHED_SELECTOR, READINESS_LOADER_SELECTOR,
+                             READINESS_QUIET_WINDOW, READINESS_MIN_TIMEOUT, SEARCH_RESULTS_TIMEOUT,
+                             READINESS_TIMEOUT_FACTOR)
+from utils.step_timing import percentile
+
+logger = logging.getLogger(__name__)
+
+# Max number of settle durations of every step kept in history between runs
+HISTORY_SAMPLES_LIMIT = 100
+# Adaptive timeout is used only after this number of settle durations of the step is known
+MIN_HISTORY_SAMPLES = 5
+
+# Tracks in-flight search API requests and DOM mutations of watched elements. Installed in every page before app scripts
+READINESS_INIT_SCRIPT = """(([apiPatterns, watchedSelector]) => {
+    if (window.__readiness) {
+        return;
+    }
+    const state = window.__readiness = {inflight: 0, lastActivity: performance.now()};
+    const touch = () => { state.lastActivity = performance.now(); };
+    const isTracked = url => apiPatterns.some(pattern => String(url).includes(pattern));
+
+    const originalFetch = window.fetch;
+    window.fetch = function (input) {
+        if (!isTracked(input instanceof Request ? input.url : input)) {
+            return originalFetch.apply(this, arguments);
+        }
+        state.inflight++;
+        touch();
+        return originalFetch.apply(this, arguments).finally(() => { state.inflight--; touch(); });
+    };
+
+    const originalOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.readinessTracked = isTracked(url);
+        return originalOpen.apply(this, arguments);
+    };
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        if (this.readinessTracked) {
+            state.inflight++;
+            touch();
+            this.addEventListener("loadend", () => { state.inflight--; touch(); }, {once: true});
+        }
+        return originalSend.apply(this, arguments);
+    };
+
+    const isWatched = node => {
+        const element = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+        return element !== null && (element.closest(watchedSelector) !== null ||
+            node.nodeType === Node.ELEMENT_NODE && element.querySelector(watchedSelector) !== null);
+    };
+    new MutationObserver(mutations => {
+        if (mutations.some(mutation => isWatched(mutation.target) ||
+                [...mutation.addedNodes, ...mutation.removedNodes].some(isWatched))) {
+            touch();
+        }
+    }).observe(document, {childList: true, subtree: true, characterData: true, attributes: true,
+                          attributeFilter: ["hidden", "style"]});
+})(%s)"""
+
+# Page is settled when loader is hidden, no tracked request is in flight and watched elements weren't changed during
+# quiet window counted from the last request or mutation
+SETTLED_SCRIPT = """([quietMs, loaderSelector]) => {
+    const loader = document.querySelector(loaderSelector);
+    if (loader !== null && !loader.hidden && loader.getClientRects().length > 0) {
+        return false;
+    }
+    const state = window.__readiness;
+    if (state === undefined) {
+        return true;
+    }
+    return state.inflight === 0 && performance.now() - state.lastActivity >= quietMs;
+}"""
+
+
+class ReadinessTracker:
+    """
+    Class contains event-driven waiting until page settles: tracked API requests are finished and watched elements
+    (results list, loader) stop changing. Timeout of every step is learned from settle durations of previous runs
+    """
+
+    def __init__(self, api_patterns: tuple, watched_selector: str, loader_selector: str, quiet_window: int,
+                 min_timeout: int, max_timeout: int, timeout_factor: float):
+        """
+        :param api_patterns: substrings of urls of requests page waits for
+        :param watched_selector: css selector of elements which mutations mean that page isn't settled yet
+        :param loader_selector: css selector of loader which is visible while page is loading
+        :param quiet_window: milliseconds without tracked requests and mutations after which page is settled
+        :param min_timeout: lower bound of adaptive timeout in milliseconds
+        :param max_timeout: timeout in milliseconds used while there is no history of the step, upper bound of
+                            adaptive timeout
+        :param timeout_factor: adaptive timeout is p95 of settle durations of the step multiplied by this factor
+        """
+        self.api_patterns = api_patterns
+        self.watched_selector = watched_selector
+        self.loader_selector = loader_selector
+        self.quiet_window = quiet_window
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_factor = timeout_factor
+        self.history: Dict[str, List[float]] = {}
+        self.durations: Dict[str, List[float]] = {}
+
+    def install(self, context: BrowserContext) -> None:
+        """Method provides installing requests and mutations tracking to every page of the context"""
+        context.add_init_script(READINESS_INIT_SCRIPT % json.dumps([list(self.api_patterns), self.watched_selector]))
+
+    def get_timeout(self, step_name: str) -> int:
+        """
+        Method provides timeout in milliseconds of waiting page settled after the step
+        :param step_name: name of the step
+        """
+        durations = self.history.get(step_name, []) + self.durations.get(step_name, [])
+        if len(durations) < MIN_HISTORY_SAMPLES:
+            return self.max_timeout
+
+        timeout = math.ceil(percentile(durations, 95) * self.timeout_factor)
+        return min(max(timeout, self.min_timeout), self.max_timeout)
+
+    def wait_settled(self, page: Page, step_name: str) -> float:
+        """
+        Method provides waiting until page settles after the step
+        :param page: page to wait in
+        :param step_name: name of the step, timeouts are learned per step
+        :return: settle duration in milliseconds
+        """
+        timeout = self.get_timeout(step_name)
+        start = time.perf_counter()
+        try:
+            page.wait_for_function(SETTLED_SCRIPT, arg=[self.quiet_window, self.loader_selector], polling="raf",
+                                   timeout=timeout)
+        except TimeoutError:
+            raise AssertionError(f"Page wasn't loaded after {step_name} in {timeout} ms")
+
+        return self.add_duration(step_name, start, timeout)
+
+    async def async_install(self, context) -> None:
+        """Method provides installing requests and mutations tracking to every page of async API context"""
+        await context.add_init_script(
+            READINESS_INIT_SCRIPT % json.dumps([list(self.api_patterns), self.watched_selector]))
+
+    async def async_wait_settled(self, page, step_name: str) -> float:
+        """
+        Method provides waiting until page of async API settles after the step, see wait_settled
+        :param page: async page to wait in
+        :param step_name: name of the step, timeouts are learned per step
+        :return: settle duration in milliseconds
+        """
+        timeout = self.get_timeout(step_name)
+        start = time.perf_counter()
+        try:
+            await page.wait_for_function(SETTLED_SCRIPT, arg=[self.quiet_window, self.loader_selector],
+                                         polling="raf", timeout=timeout)
+        except TimeoutError:
+            raise AssertionError(f"Page wasn't loaded after {step_name} in {timeout} ms")
+
+        return self.add_duration(step_name, start, timeout)
+
+    def add_duration(self, step_name: str, start: float, timeout: int) -> float:
+        """Method provides recording settle duration of the step started at start perf counter value"""
+        duration = (time.perf_counter() - start) * 1000
+        self.durations.setdefault(step_name, []).append(duration)
+        logger.debug("Page settled after %s in %.0f ms (timeout: %s ms)", step_name, duration, timeout)
+        return duration
+
+    def merge_history(self) -> Dict[str, List[float]]:
+        """
+        Method provides history updated with settle durations of current run, limited by HISTORY_SAMPLES_LIMIT samples
+        per step
+        """
+        merged = {step_name: list(durations) for step_name, durations in self.history.items()}
+        for step_name, durations in self.durations.items():
+            merged[step_name] = (merged.get(step_name, []) + durations)[-HISTORY_SAMPLES_LIMIT:]
+        return merged
+
+
+READINESS = ReadinessTracker(SEARCH_API_URL_PATTERNS, READINESS_WATCHED_SELECTOR, READINESS_LOADER_SELECTOR,
+                             READINESS_QUIET_WINDOW, READINESS_MIN_TIMEOUT, SEARCH_RESULTS_TIMEOUT,
+                             READINESS_TIMEOUT_FACTOR)
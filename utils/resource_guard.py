@@ -0,0 +1,223 @@
+import json
+import logging
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import psutil
+from playwright.sync_api import BrowserContext, Error, Page
+
+logger = logging.getLogger(__name__)
+
+# Names of browser processes which memory is measured: full chromium and headless shell
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+
+class ResourceSample(NamedTuple):
+    # Total resident memory in bytes of browser processes
+    rss: int
+    # Number of renderer processes
+    renderers: int
+    # Pids of main browser processes, they change when browser is launched, recycled or crashed
+    browser_pids: Tuple[int, ...]
+
+
+def sample_browser_processes() -> ResourceSample:
+    """Function provides memory and processes of browsers started by current process"""
+    rss = 0
+    renderers = 0
+    browser_pids = []
+    for process in psutil.Process().children(recursive=True):
+        try:
+            if not any(name in process.name().lower() for name in BROWSER_PROCESS_NAMES):
+                continue
+            rss += process.memory_info().rss
+            process_type = next((argument for argument in process.cmdline() if argument.startswith("--type=")), None)
+        except psutil.Error:
+            # Process exited while being measured
+            continue
+
+        if process_type is None:
+            browser_pids.append(process.pid)
+        elif process_type == "--type=renderer":
+            renderers += 1
+    return ResourceSample(rss, renderers, tuple(sorted(browser_pids)))
+
+
+def get_browser_rss() -> int:
+    """Function provides total resident memory in bytes of browser processes started by current process"""
+    return sample_browser_processes().rss
+
+
+class TrackedContext:
+    """Class contains context opened by the guard owner and pages opened in it"""
+
+    def __init__(self, context: BrowserContext, owner: str):
+        self.context = context
+        self.owner = owner
+        self.pages_opened = 0
+        context.on("page", self._on_page)
+
+    def _on_page(self, _page: Page) -> None:
+        self.pages_opened += 1
+
+
+class ResourceGuard:
+    """
+    Class contains lifecycle tracking of browser contexts and pages opened by tests and leak detection between tests.
+    Every tracked context gets its pages closed before the context itself, so renderer processes are released in the
+    same order whoever opened them. Memory and renderer processes of browsers are sampled before setup and after
+    teardown of every test, test is flagged as leaking if it left its contexts open, left renderer processes running or
+    browser memory grew by more than threshold. Tests which opened a context shared with the next tests (class
+    context) or ran while browser was launched or recycled only get memory recorded, they are not flagged
+    """
+
+    def __init__(self, enabled: bool = True, rss_threshold_mb: float = 50, settle_timeout: float = 1.0):
+        """
+        :param enabled: False - contexts are still closed the same way, but nothing is sampled
+        :param rss_threshold_mb: growth of browser memory in megabytes test is flagged after
+        :param settle_timeout: seconds renderer processes of closed contexts are waited to exit
+        """
+        self.enabled = enabled
+        self.rss_threshold_mb = rss_threshold_mb
+        self.settle_timeout = settle_timeout
+        self.contexts: Dict[BrowserContext, TrackedContext] = {}
+        self.current_test: Optional[str] = None
+        self.before: Optional[ResourceSample] = None
+        self.shared_contexts_opened = False
+        # {node id: leak record} of flagged tests
+        self.leaks: Dict[str, dict] = {}
+        # Browser memory in megabytes after every test, in execution order
+        self.rss_history: List[Tuple[str, float]] = []
+
+    def track(self, context: BrowserContext, owner: str) -> None:
+        """
+        Method provides tracking of the context and pages opened in it
+        :param context: just opened context
+        :param owner: node id of the test or the class context is opened for
+        """
+        self.contexts[context] = TrackedContext(context, owner)
+        if owner != self.current_test:
+            self.shared_contexts_opened = True
+
+    def close_pages(self, context: BrowserContext) -> int:
+        """
+        Method provides closing pages of the context which are still open, the context should be closed after it
+        :param context: tracked context
+        :return: number of closed pages
+        """
+        tracked = self.contexts.pop(context, None)
+        closed = 0
+        for page in reversed(context.pages):
+            try:
+                page.close()
+                closed += 1
+            except Error:
+                # Browser is already gone, the context close will clean up
+                continue
+        if tracked is not None:
+            logger.debug("Context of %s: %s pages opened, %s closed with context", tracked.owner,
+                         tracked.pages_opened, closed)
+        return closed
+
+    async def async_close_pages(self, context) -> int:
+        """
+        Method provides closing pages of async API context which are still open, see close_pages
+        :param context: tracked async context
+        :return: number of closed pages
+        """
+        tracked = self.contexts.pop(context, None)
+        closed = 0
+        for page in reversed(context.pages):
+            try:
+                await page.close()
+                closed += 1
+            except Error:
+                continue
+        if tracked is not None:
+            logger.debug("Context of %s: %s pages opened, %s closed with context", tracked.owner,
+                         tracked.pages_opened, closed)
+        return closed
+
+    def start_test(self, node_id: str) -> None:
+        """Method provides sampling browsers before setup of the test"""
+        self.current_test = node_id
+        self.shared_contexts_opened = False
+        if self.enabled:
+            self.before = sample_browser_processes()
+
+    def wait_renderers(self, expected: int) -> ResourceSample:
+        """
+        Method provides sample of browsers after renderer processes of closed contexts exited, or after settle timeout
+        :param expected: number of renderer processes before the test
+        """
+        deadline = time.perf_counter() + self.settle_timeout
+        after = sample_browser_processes()
+        while after.renderers > expected and time.perf_counter() < deadline:
+            time.sleep(0.05)
+            after = sample_browser_processes()
+        return after
+
+    def finish_test(self, node_id: str) -> List[str]:
+        """
+        Method provides sampling browsers after teardown of the test and checking it for leaks
+        :param node_id: node id of the test
+        :return: descriptions of found leaks, empty if test doesn't leak
+        """
+        self.current_test = None
+        left_open = [tracked for tracked in self.contexts.values() if tracked.owner == node_id]
+        reasons = []
+        if left_open:
+            reasons.append(f"{len(left_open)} contexts left open")
+        leak = {}
+        if self.enabled and self.before is not None:
+            before = self.before
+            after = self.wait_renderers(before.renderers)
+            growth_mb = (after.rss - before.rss) / 1024 / 1024
+            self.rss_history.append((node_id, round(after.rss / 1024 / 1024, 1)))
+
+            # Shared context or relaunched browser legally keeps more processes and memory after the test
+            if not self.shared_contexts_opened and after.browser_pids == before.browser_pids:
+                if after.renderers > before.renderers:
+                    reasons.append(f"{after.renderers - before.renderers} renderer processes left running")
+                if growth_mb > self.rss_threshold_mb:
+                    reasons.append(f"browser memory grew by {growth_mb:.0f} MB")
+            leak = {"rss_before_mb": round(before.rss / 1024 / 1024, 1),
+                    "rss_after_mb": round(after.rss / 1024 / 1024, 1),
+                    "renderers_before": before.renderers, "renderers_after": after.renderers}
+
+        if reasons:
+            logger.warning("Test %s leaks resources: %s", node_id, "; ".join(reasons))
+            self.leaks[node_id] = {"reasons": reasons, **leak}
+        return reasons
+
+    def report(self) -> dict:
+        """
+        Method provides leaking tests and browser memory of the session: at the first and the last test, max and the
+        tests after which memory grew the most
+        """
+        if not self.rss_history:
+            return {"leaks": self.leaks}
+
+        memory = [rss for _, rss in self.rss_history]
+        growths = sorted(((round(rss - previous_rss, 1), node_id) for (_, previous_rss), (node_id, rss)
+                          in zip(self.rss_history, self.rss_history[1:])), reverse=True)
+        return {
+            "leaks": self.leaks,
+            "rss_mb": {"first": memory[0], "last": memory[-1], "max": max(memory), "samples": len(memory)},
+            "top_growth_mb": [{"test": node_id, "growth_mb": growth} for growth, node_id in growths[:10] if growth > 0],
+        }
+
+    def write_report(self, artifacts_dir: str) -> str:
+        """
+        Method provides writing leaks report to resource_guard.json in artifacts directory
+        :return: path to the report
+        """
+        os.makedirs(artifacts_dir, exist_ok=True)
+        report_path = os.path.join(artifacts_dir, "resource_guard.json")
+        with open(report_path, "w") as file:
+            json.dump(self.report(), file, indent=4)
+        return report_path
+
+
+RESOURCE_GUARD = ResourceGuard()
@@ -0,0 +1,78 @@
+import json
+import os
+from statistics import median
+from typing import Dict, List, Tuple
+
+import pytest
+
+# Duration assumed for tests which were never timed and there are no timed tests at all
+DEFAULT_TEST_DURATION = 1.0
+
+
+def load_durations(file_path: str) -> Dict[str, float]:
+    """
+    Function provides loading stored test durations
+    :param file_path: path to json file with {node_id: seconds} content
+    :return: dict with durations, empty if there is no file yet
+    """
+    if not os.path.exists(file_path):
+        return {}
+
+    with open(file_path, 'r') as file:
+        return json.load(file)
+
+
+def store_durations(file_path: str, durations: Dict[str, float]) -> None:
+    """
+    Function provides storing test durations merged with already stored ones
+    :param file_path: path to json file with {node_id: seconds} content
+    :param durations: new durations of executed tests
+    """
+    stored_durations = load_durations(file_path)
+    stored_durations.update({node_id: round(duration, 3) for node_id, duration in durations.items()})
+    with open(file_path, 'w') as file:
+        json.dump(stored_durations, file, indent=4, sort_keys=True)
+
+
+def get_weights(items: List[pytest.Item], durations: Dict[str, float]) -> Dict[str, float]:
+    """
+    Function provides expected duration of every test. Tests without stored duration are expected to take
+    median duration of the known ones
+    """
+    known = [durations[item.nodeid] for item in items if item.nodeid in durations]
+    default_duration = median(known) if known else DEFAULT_TEST_DURATION
+    return {item.nodeid: durations.get(item.nodeid, default_duration) for item in items}
+
+
+def order_by_duration(items: List[pytest.Item], weights: Dict[str, float]) -> List[pytest.Item]:
+    """
+    Function provides ordering tests from the longest to the shortest, so parallel workers pick long tests first and
+    finish at about the same time. Tests of one class (or module) are kept together in their original order, so
+    class and module scoped fixtures are set up once. Ties are ordered by node id to keep order deterministic
+    """
+    groups = {}
+    for item in items:
+        groups.setdefault(item.parent.nodeid, []).append(item)
+
+    ordered_groups = sorted(groups.items(),
+                            key=lambda group: (-sum(weights[item.nodeid] for item in group[1]), group[0]))
+    return [item for _, group in ordered_groups for item in group]
+
+
+def split_to_shards(items: List[pytest.Item], weights: Dict[str, float],
+                    shard_count: int) -> Tuple[List[List[pytest.Item]], List[float]]:
+    """
+    Function provides deterministic splitting of tests to shards with about equal total duration: every test, from
+    the longest to the shortest, goes to the currently least loaded shard
+    :return: tests of every shard ordered by duration and expected duration of every shard
+    """
+    positions = {item.nodeid: position for position, item in enumerate(items)}
+    shards = [[] for _ in range(shard_count)]
+    loads = [0.0] * shard_count
+    for item in sorted(items, key=lambda item: (-weights[item.nodeid], item.nodeid)):
+        shard_index = min(range(shard_count), key=lambda index: (loads[index], index))
+        shards[shard_index].append(item)
+        loads[shard_index] += weights[item.nodeid]
+
+    shards = [order_by_duration(sorted(shard, key=lambda item: positions[item.nodeid]), weights) for shard in shards]
+    return shards, loads
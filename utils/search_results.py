@@ -0,0 +1,117 @@
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+# Reads result cards of search results container starting from the offset, returns compact rows:
+# [flight id, price text, duration text, [carriers], card text] and whether more results can be loaded. Flight id is
+# the position of the card. Live site has no hooks for stops and layovers of a card, so on both live and mock site they
+# are parsed from the card text (see to_search_results). Live site cards show no layover countries, so tests checking
+# them are marked with mock_only
+EXTRACT_RESULTS_SCRIPT = """(container, offset) => {
+    const texts = (card, testId) => Array.from(card.querySelectorAll(`[data-test="${testId}"]`))
+        .map(element => element.textContent.trim());
+    const text = (card, testId) => texts(card, testId)[0] || "";
+    const cards = Array.from(container.querySelectorAll('[data-test="ResultCardWrapper"]')).slice(offset);
+    const moreButton = container.querySelector('[data-test="ResultsMoreButton"]');
+    return {
+        rows: cards.map((card, index) => [
+            String(offset + index),
+            text(card, "ResultCardPrice"),
+            text(card, "ResultCardDuration"),
+            texts(card, "ResultCardCarrier"),
+            card.innerText,
+        ]),
+        hasMore: moreButton !== null && !moreButton.hidden && moreButton.offsetParent !== null,
+    };
+}"""
+
+# Waits until search results container shows more cards than already read or "Load more" button disappears
+MORE_RESULTS_SCRIPT = """loaded => {
+    const container = document.querySelector('[data-test="ResultList-results"]');
+    if (container === null) {
+        return false;
+    }
+    const moreButton = container.querySelector('[data-test="ResultsMoreButton"]');
+    return container.querySelectorAll('[data-test="ResultCardWrapper"]').length > loaded
+        || moreButton === null || moreButton.hidden || moreButton.offsetParent === null;
+}"""
+
+STOPS_PATTERN = re.compile(r"^\s*(?:direct|(\d+)\s+stops?)\s*$", re.IGNORECASE | re.MULTILINE)
+LAYOVER_PATTERN = re.compile(r"^\s*layover in [^,\n]+,\s*(.+?)\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+class SearchResult(NamedTuple):
+    flight_id: str
+    price: Optional[int]
+    duration: Optional[int]
+    stops: Optional[int]
+    carriers: Tuple[str, ...]
+    layover_countries: Tuple[str, ...]
+
+
+def parse_price(text: str) -> Optional[int]:
+    """
+    Function provides price in whole currency units from price text, e.g. "1 234 €" -> 1234
+    :return: None - if there is no number in the text
+    """
+    match = re.search(r"\d[\d\s.,]*", text)
+    if match is None:
+        return None
+
+    # Cents are dropped, other separators are thousands separators
+    number = re.sub(r"[.,]\d{2}$", "", match.group().strip())
+    return int(re.sub(r"\D", "", number))
+
+
+def parse_duration(text: str) -> Optional[int]:
+    """
+    Function provides duration in minutes from duration text, e.g. "12h 05m" -> 725
+    :return: None - if text has neither hours nor minutes
+    """
+    match = re.fullmatch(r"\s*(?:(\d+)\s*h)?\s*(?:(\d+)\s*m(?:in)?)?\s*", text)
+    if match is None or not any(match.groups()):
+        return None
+
+    hours, minutes = match.groups()
+    return int(hours or 0) * 60 + int(minutes or 0)
+
+
+def parse_stops(text: str) -> Optional[int]:
+    """
+    Function provides number of stops from stops text, e.g. "Direct" -> 0, "2 stops" -> 2
+    :return: None - if text isn't recognized
+    """
+    if text.strip().lower() == "direct":
+        return 0
+
+    match = re.search(r"\d+", text)
+    return int(match.group()) if match else None
+
+
+def parse_card_stops(card_text: str) -> Optional[int]:
+    """
+    Function provides number of stops from result card text, taken from the line "Direct" or "N stop(s)"
+    :return: None - if the card has no such line
+    """
+    match = STOPS_PATTERN.search(card_text)
+    if match is None:
+        return None
+
+    return parse_stops(match.group())
+
+
+def parse_card_layover_countries(card_text: str) -> Tuple[str, ...]:
+    """
+    Function provides layover countries from result card text, taken from the lines "Layover in <airport>, <country>"
+    :return: empty tuple - if the card has no such lines
+    """
+    return tuple(LAYOVER_PATTERN.findall(card_text))
+
+
+def to_search_results(rows: List[list]) -> List[SearchResult]:
+    """
+    Function provides typed search results from compact rows read by EXTRACT_RESULTS_SCRIPT
+    :param rows: list of [flight id, price text, duration text, [carriers], card text]
+    """
+    return [SearchResult(flight_id, parse_price(price), parse_duration(duration), parse_card_stops(card_text),
+                         tuple(carriers), parse_card_layover_countries(card_text))
+            for flight_id, price, duration, carriers, card_text in rows]
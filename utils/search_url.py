@@ -0,0 +1,50 @@
+from typing import Iterable
+from urllib.parse import urlencode, urljoin
+
+from slugify import slugify
+
+from utils.code_tables import COUNTRIES
+from utils.constants import StopsFilterValues, ExcludeCountriesFilterValues, STOPS_FILTER_URL_VALUE_MATCH
+from utils.utils import to_iso_date
+
+SEARCH_RESULTS_PATH = "en/search/results"
+
+
+def build_search_results_url(base_url: str, from_address: str, to_address: str, departure_date: str,
+                             return_date: str = None, adults: int = 1, children: int = 0, infants: int = 0,
+                             cabin_bags: int = 0, checked_bags: int = 0, stops: StopsFilterValues = None,
+                             exclude_countries: Iterable[ExcludeCountriesFilterValues] = (),
+                             booking_com: bool = False) -> str:
+    """
+    Function provides url of search results page with the same search that is done through search flight form
+    :param base_url: url of application home page
+    :param from_address: string with address. Should be in the following format "city_name, country_name"
+    :param to_address: string with address. Should be in the following format "city_name, country_name"
+    :param departure_date: string with departure date. Should be in the following format "day month year"
+    :param return_date: string with return date in the same format, None - for one-way search
+    :param adults: number of adult passengers
+    :param children: number of children
+    :param infants: number of infants
+    :param cabin_bags: number of cabin bags
+    :param checked_bags: number of checked bags
+    :param stops: stops filter value, None - any number of stops
+    :param exclude_countries: countries excluded from transfers, they are passed by country codes
+    :param booking_com: False - "Check accommodation with booking.com" checkbox is unchecked
+    :return: string with absolute url
+    """
+    path = "/".join([SEARCH_RESULTS_PATH, slugify(from_address), slugify(to_address), to_iso_date(departure_date),
+                     to_iso_date(return_date) if return_date is not None else "no-return"])
+    query = {
+        "adults": adults,
+        "children": children,
+        "infants": infants,
+        "bags": f"{cabin_bags}.{checked_bags}",
+        "bookingcom": str(booking_com).lower(),
+    }
+    if stops is not None:
+        query["stopNumber"] = f"{STOPS_FILTER_URL_VALUE_MATCH[stops]}~true"
+    excluded = [COUNTRIES.get_code(country.value) for country in exclude_countries]
+    if excluded:
+        query["excludeCountries"] = ",".join(excluded)
+
+    return f"{urljoin(base_url, path)}?{urlencode(query)}"
@@ -0,0 +1,341 @@
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Union
+
+from playwright.sync_api import Locator, Page, TimeoutError
+
+from utils.constants import SELECTOR_PROBE_LIMIT, SELECTOR_PROBE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class SelectorStrategy:
+    """
+    Class contains one way to find element: by test id, aria role, css or xpath. Value can have {} placeholders filled
+    with arguments of the lookup
+    """
+    # Strategies are preferred from the most stable hooks to class substrings and xpath fallback
+    KINDS = ("test_id", "role", "css", "xpath")
+    # Hooks describing the element itself rather than its styling or position
+    SEMANTIC_KINDS = ("test_id", "role")
+
+    def __init__(self, kind: str, value: str, verified: bool = True, **options):
+        """
+        :param kind: one of KINDS
+        :param value: test id, aria role, css selector or xpath
+        :param verified: False - strategy isn't checked against the live site yet, it is never preferred and is only
+        a part of the union
+        :param options: additional get_by_role options, e.g. name
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown selector strategy: {kind}, expected one of: {self.KINDS}")
+
+        self.kind = kind
+        self.value = value
+        self.verified = verified
+        self.options = options
+
+    @property
+    def semantic(self) -> bool:
+        """Whether the strategy is a hook describing the element, see SEMANTIC_KINDS"""
+        return self.kind in self.SEMANTIC_KINDS
+
+    def resolve(self, scope: Union[Page, Locator], *args) -> Locator:
+        """
+        Method provides locator of the strategy inside the scope
+        :param scope: page or container locator to search element in
+        :param args: values for placeholders of the strategy
+        """
+        value = self.value.format(*args)
+        if self.kind == "test_id":
+            return scope.get_by_test_id(value)
+        if self.kind == "css":
+            return scope.locator(f"css={value}")
+        if self.kind == "role":
+            return scope.get_by_role(value, **self.options)
+        return scope.locator(f"xpath={value}")
+
+
+class LogicalSelector:
+    """Class contains named element with its strategies and resolution statistics"""
+
+    def __init__(self, name: str, strategies: List[SelectorStrategy]):
+        self.name = name
+        self.strategies = sorted(strategies, key=lambda strategy: SelectorStrategy.KINDS.index(strategy.kind))
+        self.compiled: Optional[List[SelectorStrategy]] = None
+        self.resolutions = 0
+        self.probes = 0
+        self.unresolved = 0
+        self.resolve_seconds = 0.0
+
+    @property
+    def preferred(self) -> SelectorStrategy:
+        """The most stable verified strategy of the selector, the only one which is probed"""
+        return next(strategy for strategy in self.strategies if strategy.verified)
+
+    @property
+    def unverified(self) -> List[SelectorStrategy]:
+        """Strategies of the selector which aren't checked against the live site yet"""
+        return [strategy for strategy in self.strategies if not strategy.verified]
+
+
+class SelectorRegistry:
+    """
+    Class contains all logical selectors of the framework. While selector is not compiled, its lookup waits for any
+    strategy to be attached and then probes only the preferred strategy with one count(), union of all strategies is
+    returned if it doesn't match. Selector is compiled once the preferred strategy matches: to the strategy itself, or
+    to union without xpath fallback if it is a semantic hook. After probe limit lookups without match union is used
+    without probing
+    """
+
+    def __init__(self, probe_limit: int = SELECTOR_PROBE_LIMIT, probe_timeout: int = SELECTOR_PROBE_TIMEOUT):
+        """
+        :param probe_limit: max number of lookups the preferred strategy of a selector is probed on
+        :param probe_timeout: max milliseconds to wait for the element before probing
+        """
+        self.probe_limit = probe_limit
+        self.probe_timeout = probe_timeout
+        self.selectors: Dict[str, LogicalSelector] = {}
+
+    def register(self, name: str, *strategies: SelectorStrategy) -> str:
+        """
+        Method provides registering logical selector
+        :param name: unique selector name
+        :param strategies: ways to find element, at least one of them should be verified
+        :return: selector name to use in lookups
+        """
+        if name in self.selectors:
+            raise ValueError(f"Selector {name} is already registered")
+        if not any(strategy.verified for strategy in strategies):
+            raise ValueError(f"Selector {name} has no verified strategy")
+
+        self.selectors[name] = LogicalSelector(name, list(strategies))
+        return name
+
+    def locator(self, scope: Union[Page, Locator], name: str, *args) -> Locator:
+        """
+        Method provides locator of logical selector inside the scope
+        :param scope: page or container locator to search element in
+        :param name: registered selector name
+        :param args: values for placeholders of selector strategies
+        """
+        selector = self.selectors[name]
+        selector.resolutions += 1
+        if selector.compiled is not None:
+            return self.get_union(selector.compiled, scope, *args)
+
+        start = time.perf_counter()
+        try:
+            union = self.get_union(selector.strategies, scope, *args)
+            if selector.probes < self.probe_limit:
+                selector.probes += 1
+                try:
+                    union.first.wait_for(state="attached", timeout=self.probe_timeout)
+                except TimeoutError:
+                    logger.debug("Selector %s isn't probed, element isn't attached", name)
+                else:
+                    if selector.preferred.resolve(scope, *args).count() > 0:
+                        self.compile(selector)
+                        return self.get_union(selector.compiled, scope, *args)
+
+            selector.unresolved += 1
+            return union
+        finally:
+            selector.resolve_seconds += time.perf_counter() - start
+
+    async def async_locator(self, scope, name: str, *args):
+        """
+        Method provides locator of logical selector inside the scope for playwright async API, see locator
+        :param scope: async page or container locator to search element in
+        :param name: registered selector name
+        :param args: values for placeholders of selector strategies
+        """
+        selector = self.selectors[name]
+        selector.resolutions += 1
+        if selector.compiled is not None:
+            return self.get_union(selector.compiled, scope, *args)
+
+        start = time.perf_counter()
+        try:
+            union = self.get_union(selector.strategies, scope, *args)
+            if selector.probes < self.probe_limit:
+                selector.probes += 1
+                try:
+                    await union.first.wait_for(state="attached", timeout=self.probe_timeout)
+                except TimeoutError:
+                    logger.debug("Selector %s isn't probed, element isn't attached", name)
+                else:
+                    if await selector.preferred.resolve(scope, *args).count() > 0:
+                        self.compile(selector)
+                        return self.get_union(selector.compiled, scope, *args)
+
+            selector.unresolved += 1
+            return union
+        finally:
+            selector.resolve_seconds += time.perf_counter() - start
+
+    def unprobed_locator(self, scope, name: str, *args):
+        """
+        Method provides locator of logical selector without probing strategies: compiled strategies if selector is
+        already compiled, otherwise union of all strategies. Is used where page can't be queried, e.g. in constructors
+        of async actions, and where element is expected to be absent, so the probe would only wait for its timeout
+        """
+        selector = self.selectors[name]
+        selector.resolutions += 1
+        if selector.compiled is not None:
+            return self.get_union(selector.compiled, scope, *args)
+
+        selector.unresolved += 1
+        return self.get_union(selector.strategies, scope, *args)
+
+    def css(self, name: str, *args) -> str:
+        """
+        Method provides plain css selector of logical selector for scripts run in the page, e.g. batched form filling
+        :param name: registered selector name, it should have css strategy
+        :param args: values for placeholders of the css strategy
+        """
+        selector = self.selectors[name]
+        strategy = next((strategy for strategy in selector.strategies if strategy.kind == "css"), None)
+        if strategy is None:
+            raise ValueError(f"Selector {name} has no css strategy")
+        return strategy.value.format(*args)
+
+    @staticmethod
+    def compile(selector: LogicalSelector) -> None:
+        """
+        Method provides using matched preferred strategy for all later lookups of the selector. Semantic hook keeps
+        other non-xpath strategies as fallback for pages where the hook is missing, xpath is dropped from the union
+        """
+        preferred = selector.preferred
+        if preferred.semantic:
+            selector.compiled = [strategy for strategy in selector.strategies if strategy.kind != "xpath"]
+        else:
+            selector.compiled = [preferred]
+        logger.debug("Selector %s is compiled to %s: %s", selector.name, preferred.kind, preferred.value)
+
+    @staticmethod
+    def get_union(strategies: List[SelectorStrategy], scope, *args) -> Locator:
+        """Method provides locator matching elements of any of the strategies"""
+        union = None
+        for strategy in strategies:
+            candidate = strategy.resolve(scope, *args)
+            union = candidate if union is None else union.or_(candidate)
+        return union
+
+    def report(self) -> Dict[str, dict]:
+        """
+        Method provides statistics of every selector: matched strategy, number of lookups and probes, time spent on
+        resolution, and strategies which aren't verified against the live site
+        """
+        return {name: {
+            "strategy": selector.preferred.kind if selector.compiled else None,
+            "value": selector.preferred.value if selector.compiled else None,
+            "resolutions": selector.resolutions,
+            "probes": selector.probes,
+            "unresolved": selector.unresolved,
+            "resolve_seconds": round(selector.resolve_seconds, 4),
+            "unverified": [f"{strategy.kind}: {strategy.value}" for strategy in selector.unverified],
+        } for name, selector in sorted(self.selectors.items()) if selector.resolutions}
+
+    def write_report(self, report_dir: str) -> str:
+        """
+        Method provides writing selectors statistics to selectors.json file and warning about fragile selectors: their
+        preferred strategy never matched, so they are found by union of fallback strategies
+        :param report_dir: directory to write report to
+        :return: path to report
+        """
+        report = self.report()
+        for name, stats in report.items():
+            if stats["strategy"] is None and stats["probes"] >= self.probe_limit:
+                logger.warning("Selector %s isn't matched by preferred strategy: %s", name,
+                               self.selectors[name].preferred.value)
+
+        os.makedirs(report_dir, exist_ok=True)
+        report_path = os.path.join(report_dir, "selectors.json")
+        with open(report_path, 'w') as file:
+            json.dump(report, file, indent=4)
+        return report_path
+
+
+SELECTORS = SelectorRegistry()
+
+# Role strategies below are guessed from the live site markup and aren't checked against it yet, so they are marked
+# unverified: they are never preferred or probed, they only widen the union of fallback strategies
+
+MODAL_WINDOW = SELECTORS.register(
+    "modal_window",
+    SelectorStrategy("role", "dialog", verified=False),
+    SelectorStrategy("css", "[class*='Modal__ModalWrapperContent']"),
+    SelectorStrategy("xpath", "//div[contains(@class, 'Modal__ModalWrapperContent')]"))
+
+SUGGESTION_ITEM_ADDRESS = SELECTORS.register(
+    "suggestion_item_address",
+    SelectorStrategy("css", "[class*='PlacePickerstyled__PlacePickerItemName']:has-text('{}')"),
+    SelectorStrategy("xpath", "//div[contains(@class, 'PlacePickerstyled__PlacePickerItemName') and "
+                              "contains(text(), '{}')]"))
+
+DATE_INPUT = SELECTORS.register(
+    "date_input",
+    SelectorStrategy("css", "[data-test='SearchDateInput'] [class*='SearchFieldstyled__SearchFieldLabel']"
+                            ":text-is('{}')"),
+    SelectorStrategy("xpath", "//div[@data-test='SearchDateInput']//div[contains(@class, "
+                              "'SearchFieldstyled__SearchFieldLabel') and text()='{}']"))
+
+CALENDAR_MONTH_PICKER = SELECTORS.register(
+    "calendar_month_picker",
+    SelectorStrategy("css", "[class*='Calendarstyled__Container']:has([class*='ButtonPrimitiveContentChildren']"
+                            ":has-text('{}'))"),
+    SelectorStrategy("xpath", "//div[contains(@class, 'Calendarstyled__Container') and .//div[contains(@class,"
+                              "'ButtonPrimitiveContentChildren') and contains(text(),'{}')]]"))
+
+FLIGHT_MODIFICATIONS = SELECTORS.register(
+    "flight_modifications",
+    SelectorStrategy("css", "[class*='ButtonWrapsstyled__ButtonTabletWrap']"),
+    SelectorStrategy("xpath", "//div[contains(@class, 'ButtonWrapsstyled__ButtonTabletWrap')]"))
+
+BOOKING_COM_CONTAINER = SELECTORS.register(
+    "booking_com_container",
+    SelectorStrategy("css", "[class*='BookingcomSwitchstyled__StyledBookingcomSwitch']"),
+    SelectorStrategy("xpath", "//div[contains(@class, 'BookingcomSwitchstyled__StyledBookingcomSwitch')]"))
+
+FILTER_TITLE = SELECTORS.register(
+    "filter_title",
+    SelectorStrategy("css", "[class*='Slide__StyledSlide']"),
+    SelectorStrategy("xpath", "//div[contains(@class, 'Slide__StyledSlide')]"))
+
+LAYOVER_DETAILS_CONTAINER = SELECTORS.register(
+    "layover_details_container",
+    SelectorStrategy("css", "[class*='SectorStopstyled__SectorFlightLayover']"),
+    SelectorStrategy("xpath", "//div[contains(@class, 'SectorStopstyled__SectorFlightLayover')]"))
+
+GENDER_FORM_INPUT = SELECTORS.register(
+    "gender_form_input",
+    SelectorStrategy("role", "combobox", name="Gender", exact=True, verified=False),
+    SelectorStrategy("css", "[class*='PassengerForm__GenderWrapper'] select"),
+    SelectorStrategy("xpath", "//div[contains(@class, 'PassengerForm__GenderWrapper')]//select"))
+
+# Container of day, month and year inputs, batched form filling matches it by text of its span
+DATE_INPUT_GROUP = SELECTORS.register(
+    "date_input_group",
+    SelectorStrategy("css", "[class*='InputGroup']"),
+    SelectorStrategy("xpath", "//div[contains(@class,'InputGroup')]"))
+
+DATE_OF_BIRTH_FORM_INPUT = SELECTORS.register(
+    "date_of_birth_form_input",
+    SelectorStrategy("role", "group", name="Date of birth", exact=True, verified=False),
+    SelectorStrategy("css", "[class*='InputGroup']:has(span:text-is('Date of birth'))"),
+    SelectorStrategy("xpath", "//div[contains(@class,'InputGroup') and .//span[text()='Date of birth']]"))
+
+PASSPORT_OR_ID_FORM_INPUT = SELECTORS.register(
+    "passport_or_id_form_input",
+    SelectorStrategy("role", "textbox", name="Passport or ID number", exact=True, verified=False),
+    SelectorStrategy("css", "[class*='Document__FieldWrapper'] input[name='idNumber']"),
+    SelectorStrategy("xpath", "//div[contains(@class, 'Document__FieldWrapper')]//input[@name='idNumber']"))
+
+ERROR_TOOLTIP = SELECTORS.register(
+    "error_tooltip",
+    SelectorStrategy("role", "tooltip", verified=False),
+    SelectorStrategy("css", "[class*='Tooltip__StyledFormFeedbackTooltip']"),
+    SelectorStrategy("xpath", "//div[contains(@class, 'Tooltip__StyledFormFeedbackTooltip')]"))
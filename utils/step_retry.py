@@ -0,0 +1,215 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from enum import Enum
+from typing import Callable, Dict, Iterable, Optional
+
+from playwright.sync_api import Error, TimeoutError
+
+from utils.constants import STEP_RETRIES, STEP_RETRY_BACKOFF
+
+logger = logging.getLogger(__name__)
+
+# Messages of playwright errors caused by network failures
+NETWORK_ERROR_MARKERS = ("net::ERR_", "NS_ERROR_", "ECONNREFUSED", "ECONNRESET")
+
+
+class FailureKind(Enum):
+    TIMEOUT = "timeout"
+    SELECTOR = "selector"
+    NETWORK = "network"
+    ASSERTION = "assertion"
+    OTHER = "other"
+
+
+def is_selector_miss(message: str) -> bool:
+    """Function verifies whether call log of playwright error shows that waited element was never found"""
+    return "waiting for" in message and "resolved to" not in message
+
+
+def classify_failure(error: BaseException) -> FailureKind:
+    """
+    Function provides kind of step failure:
+        network - request or navigation failed on network level
+        selector - element waited by action or expect was never found
+        timeout - element was found but action or wait didn't finish in time, or page didn't settle
+        assertion - page state doesn't match expected one
+    :param error: exception raised by the step
+    """
+    message = str(error)
+    if isinstance(error, Error):
+        if any(marker in message for marker in NETWORK_ERROR_MARKERS):
+            return FailureKind.NETWORK
+        if isinstance(error, TimeoutError):
+            return FailureKind.SELECTOR if is_selector_miss(message) else FailureKind.TIMEOUT
+        if "strict mode violation" in message:
+            return FailureKind.SELECTOR
+        return FailureKind.OTHER
+
+    if isinstance(error, AssertionError):
+        # Waits that time out are re-raised as assertions, e.g. page readiness
+        if isinstance(error.__context__, TimeoutError):
+            return FailureKind.TIMEOUT
+        # Failed expect has call log of the waited locator
+        if "Call log" in message and is_selector_miss(message):
+            return FailureKind.SELECTOR
+        return FailureKind.ASSERTION
+
+    return FailureKind.OTHER
+
+
+def retryable(function: Callable) -> Callable:
+    """
+    Decorator provides marking action step as safe to repeat after failure: it doesn't change page state irreversibly
+    (no clicks that navigate, submit or remove something) and doesn't wait for page loading. Only marked steps are
+    retried
+    """
+    function.is_retryable = True
+    return function
+
+
+class StepRetry:
+    """
+    Class contains retrying of failed action steps with exponential backoff. Only steps registered as retryable (see
+    retryable decorator) are retried. Failure is retried by the nearest retryable step, which is the failed step itself
+    or the one that called it, steps above it get its final exception as is, so one failure is never retried on several
+    levels. Failures are classified in the step they were raised by and the time retries cost (failed attempts and
+    backoff) is recorded per step
+    """
+
+    def __init__(self, max_retries: int = 2, backoff: float = 0.5,
+                 retried_kinds: Iterable[FailureKind] = (FailureKind.TIMEOUT, FailureKind.SELECTOR,
+                                                         FailureKind.NETWORK)):
+        """
+        :param max_retries: max number of retries of one step call, 0 - steps aren't retried
+        :param backoff: seconds to wait before the first retry, doubled before every next one
+        :param retried_kinds: kinds of failures which are retried, other failures are only classified
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.retried_kinds = set(retried_kinds)
+        # Names of steps which are safe to repeat
+        self.retryable_steps = set()
+        self.stats: Dict[str, dict] = {}
+
+    def get_step_stats(self, step_name: str) -> dict:
+        """Method provides retry statistics of the step"""
+        return self.stats.setdefault(step_name, {
+            "calls": 0, "retries": 0, "recovered": 0, "exhausted": 0, "retry_seconds": 0.0,
+            "failures": {kind.value: 0 for kind in FailureKind},
+        })
+
+    def is_retried(self, step_name: str, kind: FailureKind) -> bool:
+        """Method verifies whether step failed with this kind of failure can be retried"""
+        return step_name in self.retryable_steps and kind in self.retried_kinds
+
+    def handle_failure(self, step_name: str, error: BaseException, attempt: int,
+                       attempt_start: float) -> Optional[float]:
+        """
+        Method provides recording failed attempt of the step and deciding whether it is retried. Retry cost of the step
+        is time of failed attempts which were retried and backoff waits
+        :param step_name: name of the step
+        :param error: exception of the attempt
+        :param attempt: number of the attempt, 0 - the first call
+        :param attempt_start: perf counter value at the start of the attempt
+        :return: seconds to wait before the retry, None - exception should be raised
+        """
+        if getattr(error, "is_step_failure_handled", False):
+            # Failure of nested step was already handled on its own level
+            return None
+
+        stats = self.get_step_stats(step_name)
+        kind = classify_failure(error)
+        if not getattr(error, "is_step_failure_classified", False):
+            stats["failures"][kind.value] += 1
+            error.is_step_failure_classified = True
+        if step_name not in self.retryable_steps:
+            # Failure is left to the nearest retryable step which called this one
+            return None
+
+        if attempt >= self.max_retries or not self.is_retried(step_name, kind):
+            if attempt:
+                stats["exhausted"] += 1
+            error.is_step_failure_handled = True
+            return None
+
+        delay = self.backoff * 2 ** attempt
+        stats["retries"] += 1
+        stats["retry_seconds"] += time.perf_counter() - attempt_start + delay
+        message = str(error).splitlines()[0] if str(error) else repr(error)
+        logger.warning("Step %s failed (%s), retry %s/%s in %.1fs: %s", step_name, kind.value, attempt + 1,
+                       self.max_retries, delay, message)
+        return delay
+
+    def call(self, step_name: str, function: Callable, *args, **kwargs):
+        """
+        Method provides calling step function and retrying it if it fails
+        :param step_name: name of the step in report
+        :param function: step function
+        """
+        self.get_step_stats(step_name)["calls"] += 1
+        attempt = 0
+        while True:
+            attempt_start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except Exception as error:
+                delay = self.handle_failure(step_name, error, attempt, attempt_start)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if attempt:
+                self.get_step_stats(step_name)["recovered"] += 1
+            return result
+
+    async def call_async(self, step_name: str, function: Callable, *args, **kwargs):
+        """
+        Method provides awaiting async step function and retrying it if it fails, see call
+        :param step_name: name of the step in report
+        :param function: async step function
+        """
+        self.get_step_stats(step_name)["calls"] += 1
+        attempt = 0
+        while True:
+            attempt_start = time.perf_counter()
+            try:
+                result = await function(*args, **kwargs)
+            except Exception as error:
+                delay = self.handle_failure(step_name, error, attempt, attempt_start)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if attempt:
+                self.get_step_stats(step_name)["recovered"] += 1
+            return result
+
+    def report(self) -> Dict[str, dict]:
+        """Method provides retry statistics of steps which failed or were retried at least once"""
+        return {step_name: {**stats, "retry_seconds": round(stats["retry_seconds"], 3)}
+                for step_name, stats in sorted(self.stats.items())
+                if any(stats["failures"].values()) or stats["retries"]}
+
+    def write_report(self, report_dir: str) -> str:
+        """
+        Method provides writing retry statistics to step_retries.json file, steps are sorted by retry cost
+        :param report_dir: directory to write report to
+        :return: path to report
+        """
+        report = dict(sorted(self.report().items(), key=lambda item: item[1]["retry_seconds"], reverse=True))
+        os.makedirs(report_dir, exist_ok=True)
+        report_path = os.path.join(report_dir, "step_retries.json")
+        with open(report_path, 'w') as file:
+            json.dump({"retry_seconds": round(sum(stats["retry_seconds"] for stats in report.values()), 3),
+                       "steps": report}, file, indent=4)
+        return report_path
+
+
+STEP_RETRY = StepRetry(STEP_RETRIES, STEP_RETRY_BACKOFF)
@@ -0,0 +1,259 @@
+import contextvars
+import functools
+import html
+import inspect
+import json
+import logging
+import math
+import os
+import time
+from typing import Callable, Dict, List, Tuple
+
+from utils.step_retry import STEP_RETRY
+
+logger = logging.getLogger(__name__)
+
+# Max number of samples of every step kept in history between runs
+HISTORY_SAMPLES_LIMIT = 200
+
+
+def percentile(values: List[float], percent: int) -> float:
+    """
+    Function provides nearest-rank percentile of the values
+    :param values: list of numbers
+    :param percent: percentile to calculate, from 0 to 100
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+class StepTimer:
+    """
+    Class contains timings of action steps. Every sample has wall time of the step, number of messages sent to
+    playwright driver (round trips) and time spent waiting in expect assertions. Steps stack is kept per asyncio task,
+    round trips and expect time of async steps running concurrently include each other's traffic
+    """
+
+    def __init__(self):
+        self.samples: Dict[str, List[dict]] = {}
+        self.round_trips = 0
+        self.expect_seconds = 0.0
+        self._stack = contextvars.ContextVar("step_timer_stack", default=())
+
+    @property
+    def stack(self) -> Tuple[str, ...]:
+        """Names of steps running in current thread or asyncio task, the innermost step is the last one"""
+        return self._stack.get()
+
+    def start_sample(self, step_name: str) -> dict:
+        """Method provides pushing step to the stack and remembering counters at the start of the step"""
+        stack = self._stack.get()
+        sample = {"parent": stack[-1] if stack else None, "round_trips": self.round_trips,
+                  "expect": self.expect_seconds, "start": time.perf_counter(), "failed": True,
+                  "token": self._stack.set(stack + (step_name,))}
+        return sample
+
+    def finish_sample(self, step_name: str, sample: dict) -> None:
+        """Method provides popping step from the stack and recording its timing sample"""
+        self._stack.reset(sample.pop("token"))
+        self.samples.setdefault(step_name, []).append({
+            "wall": time.perf_counter() - sample["start"],
+            "round_trips": self.round_trips - sample["round_trips"],
+            "expect": self.expect_seconds - sample["expect"],
+            "parent": sample["parent"],
+            "failed": sample["failed"],
+        })
+
+    def measure(self, step_name: str, function: Callable, *args, **kwargs):
+        """
+        Method provides calling step function and recording its timing sample
+        :param step_name: name of the step in report
+        :param function: step function
+        """
+        sample = self.start_sample(step_name)
+        try:
+            result = function(*args, **kwargs)
+            sample["failed"] = False
+            return result
+        finally:
+            self.finish_sample(step_name, sample)
+
+    async def measure_async(self, step_name: str, function: Callable, *args, **kwargs):
+        """
+        Method provides awaiting async step function and recording its timing sample
+        :param step_name: name of the step in report
+        :param function: async step function
+        """
+        sample = self.start_sample(step_name)
+        try:
+            result = await function(*args, **kwargs)
+            sample["failed"] = False
+            return result
+        finally:
+            self.finish_sample(step_name, sample)
+
+    def summary(self, history: Dict[str, List[float]] = None) -> Dict[str, dict]:
+        """
+        Method provides per step statistics of current run
+        :param history: wall times of previous runs {step_name: [seconds]}
+        """
+        history = history or {}
+        steps = {}
+        for step_name, samples in sorted(self.samples.items()):
+            wall = [sample["wall"] for sample in samples]
+            round_trips = [sample["round_trips"] for sample in samples]
+            expect_wait = [sample["expect"] for sample in samples]
+            previous_wall = history.get(step_name, [])
+            steps[step_name] = {
+                "count": len(samples),
+                "failed": sum(sample["failed"] for sample in samples),
+                "wall_p50": percentile(wall, 50),
+                "wall_p95": percentile(wall, 95),
+                "round_trips_p50": percentile(round_trips, 50),
+                "round_trips_p95": percentile(round_trips, 95),
+                "expect_p50": percentile(expect_wait, 50),
+                "expect_p95": percentile(expect_wait, 95),
+                "history_count": len(previous_wall),
+                "history_wall_p50": percentile(previous_wall, 50),
+                "history_wall_p95": percentile(previous_wall, 95),
+            }
+        return steps
+
+    def merge_history(self, history: Dict[str, List[float]]) -> Dict[str, List[float]]:
+        """
+        Method provides history updated with wall times of current run, limited by HISTORY_SAMPLES_LIMIT samples per
+        step
+        :param history: wall times of previous runs {step_name: [seconds]}
+        """
+        merged = {step_name: list(samples) for step_name, samples in history.items()}
+        for step_name, samples in self.samples.items():
+            step_history = merged.setdefault(step_name, [])
+            step_history.extend(sample["wall"] for sample in samples if not sample["failed"])
+            merged[step_name] = step_history[-HISTORY_SAMPLES_LIMIT:]
+        return merged
+
+    def write_report(self, report_dir: str, history: Dict[str, List[float]] = None) -> str:
+        """
+        Method provides writing step timings report to step_timings.json and step_timings.html files
+        :param report_dir: directory to write report to
+        :param history: wall times of previous runs {step_name: [seconds]}
+        :return: path to json report
+        """
+        steps = self.summary(history)
+        os.makedirs(report_dir, exist_ok=True)
+        json_path = os.path.join(report_dir, "step_timings.json")
+        with open(json_path, 'w') as file:
+            json.dump({"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "steps": steps}, file, indent=4)
+
+        columns = ["count", "failed", "wall_p50", "wall_p95", "history_wall_p50", "history_wall_p95",
+                   "round_trips_p50", "round_trips_p95", "expect_p50", "expect_p95"]
+        rows = []
+        for step_name, stats in steps.items():
+            # Highlight steps that became slower than in previous runs
+            is_regression = stats["history_count"] and stats["wall_p95"] > 1.2 * stats["history_wall_p95"]
+            cells = "".join(f"<td>{stats[column]:.3f}</td>" if isinstance(stats[column], float)
+                            else f"<td>{stats[column]}</td>" for column in columns)
+            style = ' style="background: #fdd"' if is_regression else ""
+            rows.append(f"<tr{style}><td>{html.escape(step_name)}</td>{cells}</tr>")
+
+        header = "".join(f"<th>{column}</th>" for column in ["step"] + columns)
+        with open(os.path.join(report_dir, "step_timings.html"), 'w') as file:
+            file.write(f"<html><head><title>Step timings</title></head><body>"
+                       f"<table border=\"1\"><tr>{header}</tr>{''.join(rows)}</table></body></html>")
+
+        return json_path
+
+
+STEP_TIMER = StepTimer()
+
+
+def timed_step(step_name: str):
+    """
+    Decorator provides recording timing sample of every call of the function and retrying the call if it fails and
+    function is marked as retryable, every attempt is a separate timing sample
+    :param step_name: name of the step in report
+    """
+    def decorator(function):
+        if getattr(function, "is_retryable", False):
+            STEP_RETRY.retryable_steps.add(step_name)
+
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                return await STEP_RETRY.call_async(step_name, STEP_TIMER.measure_async, step_name, function, *args,
+                                                   **kwargs)
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                return STEP_RETRY.call(step_name, STEP_TIMER.measure, step_name, function, *args, **kwargs)
+
+        wrapper.is_timed_step = True
+        return wrapper
+
+    return decorator
+
+
+def instrument_actions(actions_class: type) -> None:
+    """
+    Function provides wrapping every public method defined in actions class with timed_step decorator. Properties
+    and already wrapped methods are left as is
+    :param actions_class: class with page or modal actions
+    """
+    for name, attribute in list(vars(actions_class).items()):
+        if name.startswith("_"):
+            continue
+
+        if isinstance(attribute, (staticmethod, classmethod)):
+            function = attribute.__func__
+        elif callable(attribute):
+            function = attribute
+        else:
+            continue
+
+        if getattr(function, "is_timed_step", False):
+            continue
+
+        wrapped = timed_step(f"{actions_class.__name__}.{name}")(function)
+        if isinstance(attribute, (staticmethod, classmethod)):
+            wrapped = type(attribute)(wrapped)
+        setattr(actions_class, name, wrapped)
+
+
+def install_playwright_probes() -> None:
+    """
+    Function provides counting messages sent to playwright driver and time spent in expect assertions. Probes patch
+    playwright internals, so they are skipped with a warning if internals are changed
+    """
+    try:
+        from playwright._impl._assertions import AssertionsBase
+        from playwright._impl._connection import Connection
+    except ImportError:
+        logger.warning("Playwright internals changed, round trips and expect time are not measured")
+        return
+
+    if getattr(Connection._send_message_to_server, "is_probe", False):
+        return
+
+    send_message_to_server = Connection._send_message_to_server
+    expect_impl = AssertionsBase._expect_impl
+
+    @functools.wraps(send_message_to_server)
+    def counted_send_message_to_server(self, *args, **kwargs):
+        STEP_TIMER.round_trips += 1
+        return send_message_to_server(self, *args, **kwargs)
+
+    @functools.wraps(expect_impl)
+    async def timed_expect_impl(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await expect_impl(self, *args, **kwargs)
+        finally:
+            STEP_TIMER.expect_seconds += time.perf_counter() - start
+
+    counted_send_message_to_server.is_probe = True
+    Connection._send_message_to_server = counted_send_message_to_server
+    AssertionsBase._expect_impl = timed_expect_impl
@@ -0,0 +1,159 @@
+import contextlib
+import contextvars
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import uuid
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Id shared by all records of one test, so records of the test can be filtered out of the whole session log
+CORRELATION_ID = contextvars.ContextVar("correlation_id", default="-")
+# Node id of the test the record is logged in
+TEST_NAME = contextvars.ContextVar("test_name", default=None)
+
+# Passenger personal data fields, their values are masked when they are logged as key-value pairs: quoted values, e.g.
+# first_name='Pavel', unquoted dates, e.g. date_of_birth=1 May 1990, and other unquoted values up to a separator, e.g.
+# {'passport_or_id': 1234567890} or passport_or_id=1234567890
+PII_FIELDS = ("first_name", "last_name", "date_of_birth", "passport_or_id", "passport_or_id_exp_date")
+PII_FIELD_PATTERN = re.compile(r"""(['"]?)\b(%s)\1(\s*[:=]\s*)""" % "|".join(PII_FIELDS)
+                               + r"""(?:(['"])(.*?)\4|\d{1,2} [A-Za-z]+ \d{4}|[^\s,;'"(){}\[\]]+)""")
+EMAIL_PATTERN = re.compile(r"\b([\w.+-])[\w.+-]*@([\w-]+(?:\.[\w-]+)+)")
+PHONE_PATTERN = re.compile(r"\+\d{1,3}[ -]?\d{2,}(\d{4})\b")
+
+
+def mask_pii(text: str) -> str:
+    """
+    Function provides text with passenger personal data masked: values of personal info fields, emails and phone
+    numbers (only last 4 digits are kept). Other numbers, e.g. durations and counts, are kept as they are
+    :param text: formatted log message
+    """
+    text = PII_FIELD_PATTERN.sub(
+        lambda match: f"{match[1]}{match[2]}{match[1]}{match[3]}{match[4] or ''}***{match[4] or ''}", text)
+    text = EMAIL_PATTERN.sub(r"\1***@\2", text)
+    return PHONE_PATTERN.sub(r"+***\1", text)
+
+
+@contextlib.contextmanager
+def correlation_scope(test_name: str) -> Iterator[str]:
+    """
+    Function provides new correlation id for all records logged inside the scope
+    :param test_name: node id of the test the scope is opened for
+    :return: context manager yielding correlation id
+    """
+    correlation_id = uuid.uuid4().hex[:12]
+    correlation_token = CORRELATION_ID.set(correlation_id)
+    test_token = TEST_NAME.set(test_name)
+    try:
+        yield correlation_id
+    finally:
+        TEST_NAME.reset(test_token)
+        CORRELATION_ID.reset(correlation_token)
+
+
+class StructuredLogRecord(logging.LogRecord):
+    """
+    Log record with correlation id and test name of the scope it is created in. Message is still formatted lazily,
+    only when some handler emits the record, and personal data is masked in it
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.correlation_id = CORRELATION_ID.get()
+        self.test = TEST_NAME.get()
+
+    def getMessage(self) -> str:
+        return mask_pii(super().getMessage())
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formatter of record to one line JSON object"""
+
+    def __init__(self, worker_id: str = "main"):
+        super().__init__()
+        self.worker_id = worker_id
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(
+                timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "correlation_id": getattr(record, "correlation_id", "-"),
+            "test": getattr(record, "test", None),
+            "worker": self.worker_id,
+            "source": f"{record.filename}:{record.lineno}",
+        }
+        if record.exc_info:
+            entry["exc"] = mask_pii(self.formatException(record.exc_info))
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class InProcessQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler which puts records to the queue as they are. Queue is read in the same process, so unlike base
+    QueueHandler records aren't formatted by the logging thread, background writer formats them
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonLinesLog:
+    """
+    Class contains JSON-lines log of the process. Records are put to in-memory queue by the logging thread, they are
+    formatted and written to rotated file by background listener thread, so logging doesn't wait for disk
+    """
+
+    def __init__(self, file_path: str, worker_id: str = "main", level: int = logging.INFO, max_size_mb: int = 50,
+                 backup_count: int = 5):
+        """
+        :param file_path: path to log file, rotated files get .1, .2, ... suffixes
+        :param worker_id: xdist worker id written to every record
+        :param level: min level of written records
+        :param max_size_mb: size in megabytes log file is rotated after, 0 - never rotate
+        :param backup_count: number of rotated files kept
+        """
+        self.file_path = file_path
+        self.worker_id = worker_id
+        self.level = level
+        self.max_size_mb = max_size_mb
+        self.backup_count = backup_count
+        self.queue_handler: Optional[InProcessQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def start(self) -> None:
+        """Method provides attaching queue handler to root logger and starting background writer"""
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(self.file_path, maxBytes=self.max_size_mb * 1024 * 1024,
+                                                            backupCount=self.backup_count, encoding="utf-8")
+        file_handler.setFormatter(JsonLinesFormatter(self.worker_id))
+
+        log_queue = queue.SimpleQueue()
+        self.queue_handler = InProcessQueueHandler(log_queue)
+        self.queue_handler.setLevel(self.level)
+        self.listener = logging.handlers.QueueListener(log_queue, file_handler)
+        self.listener.start()
+
+        root_logger = logging.getLogger()
+        root_logger.addHandler(self.queue_handler)
+        if root_logger.getEffectiveLevel() > self.level:
+            root_logger.setLevel(self.level)
+        logger.info("JSON-lines log: %s", self.file_path)
+
+    def stop(self) -> None:
+        """Method provides detaching queue handler and writing all queued records"""
+        if self.listener is None:
+            return
+
+        logging.getLogger().removeHandler(self.queue_handler)
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        self.listener = None
@@ -1,4 +1,5 @@
 import json
+from datetime import datetime
 
 
 def get_json_file_content(file_path: str) -> dict:
@@ -11,3 +12,24 @@ def get_json_file_content(file_path: str) -> dict:
         result_json = json.load(file)
 
     return result_json
+
+
+def to_iso_date(date: str) -> str:
+    """
+    Function provides converting date to ISO format
+    :param date: string with date. Should be in the following format "day month year"
+    :return: string with date in "YYYY-MM-DD" format
+    """
+    return datetime.strptime(date.strip(), "%d %B %Y").strftime("%Y-%m-%d")
+
+
+def months_between(from_month: str, to_month: str) -> int:
+    """
+    Function provides number of months between two calendar months
+    :param from_month: string with month. Should be in the following format "month_name year"
+    :param to_month: string with month. Should be in the following format "month_name year"
+    :return: positive number if to_month is later than from_month, negative - if earlier
+    """
+    from_date = datetime.strptime(from_month.strip(), "%B %Y")
+    to_date = datetime.strptime(to_month.strip(), "%B %Y")
+    return (to_date.year - from_date.year) * 12 + to_date.month - from_date.month